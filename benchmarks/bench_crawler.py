@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+爬虫吞吐量基准测试
+在本地模拟门户上运行顺序版、增强版和异步版爬虫的 process_industry_data 和 crawl_all_industries，
+统计每秒页面数、p50/p99 延迟和每页CPU时间，跟踪抓取路径的性能回归
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import multiprocessing
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+sys.path.insert(0, BENCH_DIR)
+
+from config import Config
+from mock_portal import MockPortal
+
+def _serve_portal(options, conn, stop):
+    """子进程：运行模拟门户，避免服务端CPU计入爬虫"""
+    with MockPortal(**options) as portal:
+        conn.send(portal.base_urls())
+        stop.wait()
+        conn.send(portal.status_counts)
+
+def configure(base_urls, workdir, delay, retry_delay):
+    """将数据源指向模拟门户，缓存目录放到临时目录"""
+    for name, url in base_urls.items():
+        Config.DATA_SOURCES[name].update(base_url=url, delay_range=(delay, delay), cache_ttl=0)
+    Config.STORAGE_CONFIG.update(
+        http_cache_dir=os.path.join(workdir, "http"),
+        robots_cache_dir=os.path.join(workdir, "robots"),
+        frontier_seen_path=os.path.join(workdir, "seen_urls.bloom"),
+    )
+    Config.CRAWLER_SETTINGS.update(retry_delay=retry_delay, retry_max_delay=retry_delay * 4, proxy_enabled=False)
+
+class ListingFetcher:
+    """列表页抓取走真实的会话、限速、重试和解析路径，记录请求延迟和成功页数"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+        self.pages = 0
+
+    def _fetch_listing(self, source_name, industry_name):
+        from html_parser import parse_listing, response_encoding
+
+        self.scheduler.wait(source_name)
+        response = self.session.get(f"{Config.DATA_SOURCES[source_name]['base_url']}/list",
+                                    params={"industry": industry_name})
+        self.latencies.append(response.elapsed.total_seconds())
+        response.raise_for_status()
+        self.pages += 1
+        return parse_listing(source_name, response.content, encoding=response_encoding(response))
+
+def make_sequential_crawler():
+    """顺序版爬虫，每个行业依次抓取 DATA_SOURCES 中的全部数据源"""
+    from functools import partial
+    from industry_report_crawler import IndustryReportCrawler
+
+    class BenchCrawler(ListingFetcher, IndustryReportCrawler):
+        def crawl_units(self):
+            return [(name, partial(self._fetch_listing, name)) for name in Config.DATA_SOURCES]
+
+    return BenchCrawler()
+
+def make_enhanced_crawler():
+    """增强版爬虫，四个数据源在线程池中并发抓取，列表页记录再经过研报详情抓取"""
+    from industry_report_crawler_enhanced import IndustryReportCrawlerEnhanced
+
+    class BenchCrawler(ListingFetcher, IndustryReportCrawlerEnhanced):
+        def _fetch_eastmoney(self, industry_name):
+            return self._fetch_listing("东方财富网", industry_name)
+
+        def _fetch_sina_finance(self, industry_name):
+            return self._fetch_listing("新浪财经", industry_name)
+
+        def _fetch_xueqiu(self, industry_name):
+            return self._fetch_listing("雪球", industry_name)
+
+        def _fetch_cninfo(self, industry_name):
+            return self._fetch_listing("巨潮资讯", industry_name)
+
+    return BenchCrawler()
+
+def make_async_crawler():
+    """异步爬虫，所有行业×DATA_SOURCES 中的全部数据源在一个事件循环中并发抓取"""
+    from industry_report_crawler_async import IndustryReportCrawlerAsync
+
+    class BenchCrawler(IndustryReportCrawlerAsync):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.latencies = []
+            self.pages = 0
+
+        async def fetch(self, http_session, source_name, url, params=None):
+            # 延迟包含等待主机并发名额的时间
+            start = time.perf_counter()
+            try:
+                result = await super().fetch(http_session, source_name, url, params)
+            finally:
+                self.latencies.append(time.perf_counter() - start)
+            self.pages += 1
+            return result
+
+    sources = {name: dict(config, listing_url=f"{config['base_url']}/list") for name, config in Config.DATA_SOURCES.items()}
+    return BenchCrawler(sources=sources)
+
+def percentile(values, q):
+    """q 分位数（0-100），values 为空时返回 0"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+def measure(name, make_crawler, run):
+    """运行一个场景并汇总指标"""
+    crawler = make_crawler()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    records = run(crawler)
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+    pages = max(1, crawler.pages)
+    return {
+        "scenario": name,
+        "pages": crawler.pages,
+        "requests": len(crawler.latencies),
+        "records": records,
+        "pages_per_sec": round(crawler.pages / wall, 2),
+        "p50_ms": round(percentile(crawler.latencies, 50) * 1000, 1),
+        "p99_ms": round(percentile(crawler.latencies, 99) * 1000, 1),
+        "cpu_ms_per_page": round(cpu * 1000 / pages, 2),
+        "wall_s": round(wall, 2),
+    }
+
+def benchmark(args):
+    """启动模拟门户并运行全部场景"""
+    options = dict(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                   rate_limit_rate=args.rate_limit_rate, rows=args.rows, page_kb=args.page_kb)
+    parent_conn, child_conn = multiprocessing.Pipe()
+    stop = multiprocessing.Event()
+    server = multiprocessing.Process(target=_serve_portal, args=(options, child_conn, stop), daemon=True)
+    server.start()
+
+    try:
+        base_urls = parent_conn.recv()
+        with tempfile.TemporaryDirectory() as workdir:
+            configure(base_urls, workdir, args.delay, args.retry_delay)
+            industry = args.industry
+
+            def single_industry(crawler):
+                return sum(len(crawler.process_industry_data(industry)) for _ in range(args.repeat))
+
+            def all_industries(crawler):
+                return len(crawler.crawl_all_industries())
+
+            results = [
+                measure(f"顺序版 process_industry_data x{args.repeat}", make_sequential_crawler, single_industry),
+                measure("顺序版 crawl_all_industries", make_sequential_crawler, all_industries),
+                measure(f"增强版 process_industry_data x{args.repeat}", make_enhanced_crawler, single_industry),
+                measure(f"异步版 process_industry_data x{args.repeat}", make_async_crawler, single_industry),
+                measure("异步版 crawl_all_industries", make_async_crawler, all_industries),
+            ]
+    finally:
+        stop.set()
+        status_counts = parent_conn.recv() if server.is_alive() and parent_conn.poll(5) else {}
+        server.join(timeout=5)
+
+    return results, status_counts
+
+def compare(results, baseline, tolerance):
+    """与基线比较，返回吞吐下降或CPU上升超出容差的场景"""
+    previous = {item["scenario"]: item for item in baseline}
+    regressions = []
+    for current in results:
+        before = previous.get(current["scenario"])
+        if not before:
+            continue
+        if current["pages_per_sec"] < before["pages_per_sec"] * (1 - tolerance):
+            regressions.append((current["scenario"], "pages/s", before["pages_per_sec"], current["pages_per_sec"]))
+        if current["cpu_ms_per_page"] > before["cpu_ms_per_page"] * (1 + tolerance):
+            regressions.append((current["scenario"], "CPU ms/页", before["cpu_ms_per_page"], current["cpu_ms_per_page"]))
+    return regressions
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="爬虫吞吐量基准测试")
+    parser.add_argument("--industry", default="人工智能", help="process_industry_data 场景使用的行业 (默认: 人工智能)")
+    parser.add_argument("--repeat", type=int, default=10, help="process_industry_data 的重复次数 (默认: 10)")
+    parser.add_argument("--latency-ms", type=float, default=50, help="模拟门户平均延迟 (默认: 50)")
+    parser.add_argument("--jitter-ms", type=float, default=20, help="模拟门户延迟抖动 (默认: 20)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500错误比例 (默认: 0)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429限流比例 (默认: 0)")
+    parser.add_argument("--rows", type=int, default=20, help="每页研报条数 (默认: 20)")
+    parser.add_argument("--page-kb", type=int, default=100, help="列表页大小KB (默认: 100)")
+    parser.add_argument("--delay", type=float, default=0.0, help="同一主机的请求间隔秒数 (默认: 0)")
+    parser.add_argument("--retry-delay", type=float, default=0.1, help="重试基础等待秒数 (默认: 0.1)")
+    parser.add_argument("--save", type=str, help="将结果保存为JSON基线文件")
+    parser.add_argument("--baseline", type=str, help="与已保存的JSON基线比较")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="允许的性能下降幅度 (默认: 0.2)")
+    args = parser.parse_args()
+
+    results, status_counts = benchmark(args)
+
+    print(f"{'场景':<40}{'页面':>6}{'请求':>6}{'页/秒':>9}{'p50(ms)':>9}{'p99(ms)':>9}{'CPU ms/页':>11}{'耗时(s)':>9}")
+    print("-" * 99)
+    for r in results:
+        print(f"{r['scenario']:<40}{r['pages']:>6}{r['requests']:>6}{r['pages_per_sec']:>9}"
+              f"{r['p50_ms']:>9}{r['p99_ms']:>9}{r['cpu_ms_per_page']:>11}{r['wall_s']:>9}")
+    if status_counts:
+        print(f"\n模拟门户响应状态: {dict(sorted(status_counts.items()))}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已保存: {args.save}")
+
+    failed = False
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        for scenario, metric, before, after in compare(results, baseline, args.tolerance):
+            print(f"⚠️  {scenario} {metric} 回归: {before} -> {after}")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
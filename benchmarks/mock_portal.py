@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地模拟门户
+为 Config.DATA_SOURCES 中的每个数据源启动一个本地HTTP服务，返回合成的研报列表页，
+可注入延迟、错误率和429限流，用于在不访问真实网站的情况下测试爬虫性能
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from config import Config
+
+INSTITUTIONS = ["中信证券", "华泰证券", "国泰君安", "招商证券", "海通证券", "广发证券"]
+
+def render_listing(source_name, industry, rows, page_kb, rng):
+    """按数据源声明的选择器生成列表页，其余部分用导航、脚本等填充到 page_kb 大小"""
+    selectors = Config.DATA_SOURCES.get(source_name, {}).get("selectors")
+    items = [
+        {
+            "title": f"{industry}行业深度报告（{i + 1}）：景气度持续提升",
+            "href": f"/report/{rng.randrange(10 ** 8)}.html?spm=list.{i}",
+            "institution": rng.choice(INSTITUTIONS),
+            "date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        }
+        for i in range(rows)
+    ]
+
+    if selectors is None:
+        return json.dumps({"data": items}, ensure_ascii=False), "application/json; charset=utf-8"
+
+    container = selectors["container"]
+    attrs = "".join(f' {name}="{value}"' for name, value in container.get("attrs", {}).items())
+    if container["tag"] == "table":
+        body = "".join(
+            f"<tr><td>{i + 1}</td><td><a href=\"{item['href']}\">{item['title']}</a></td>"
+            f"<td>{item['date']}</td><td>{item['institution']}</td><td>{item['date']}</td></tr>"
+            for i, item in enumerate(items)
+        )
+        listing = f"<table{attrs}><tr><th>序号</th><th>标题</th><th>日期</th><th>机构</th><th>日期</th></tr>{body}</table>"
+    else:
+        body = "".join(f"<li><a href=\"{item['href']}\">{item['title']}</a><span>{item['date']}</span></li>" for item in items)
+        listing = f"<{container['tag']}{attrs}><ul>{body}</ul></{container['tag']}>"
+
+    filler_unit = "<div class=\"nav\"><a href=\"/\">首页</a><a href=\"/news\">资讯</a></div><script>var _t=1;</script>"
+    filler = filler_unit * max(0, page_kb * 1024 // len(filler_unit.encode("utf-8")))
+    html = f"<html><head><title>{source_name}</title></head><body>{filler}{listing}{filler}</body></html>"
+    return html, "text/html; charset=utf-8"
+
+class PortalHandler(BaseHTTPRequestHandler):
+    """模拟单个数据源的请求处理器"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        portal = self.server.portal
+        parsed = urlparse(self.path)
+        if parsed.path == "/robots.txt":
+            self._send(200, "User-agent: *\nAllow: /\n", "text/plain")
+            return
+
+        delay = portal.latency_ms + portal.rng.uniform(-portal.jitter_ms, portal.jitter_ms)
+        time.sleep(max(0, delay) / 1000)
+
+        roll = portal.rng.random()
+        if roll < portal.rate_limit_rate:
+            self._send(429, "Too Many Requests", "text/plain", {"Retry-After": "1"})
+            return
+        if roll < portal.rate_limit_rate + portal.error_rate:
+            self._send(500, "Internal Server Error", "text/plain")
+            return
+
+        industry = parse_qs(parsed.query).get("industry", ["人工智能"])[0]
+        body, content_type = render_listing(self.server.source_name, industry, portal.rows, portal.page_kb, portal.rng)
+        self._send(200, body, content_type)
+
+    def _send(self, status, body, content_type, headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+        self.server.portal.count(status)
+
+    def log_message(self, format, *args):
+        pass
+
+class MockPortal:
+    """
+    模拟门户
+
+    每个数据源一个独立端口，使按主机的限速和连接池与真实环境一致。
+    """
+
+    def __init__(self, data_sources=None, latency_ms=50, jitter_ms=20, error_rate=0.0, rate_limit_rate=0.0,
+                 rows=20, page_kb=100, seed=0, host="127.0.0.1"):
+        self.source_names = list(data_sources if data_sources is not None else Config.DATA_SOURCES)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.rows = rows
+        self.page_kb = page_kb
+        self.rng = random.Random(seed)
+        self.host = host
+
+        self.status_counts = {}
+        self._lock = threading.Lock()
+        self.servers = {}
+
+    def count(self, status):
+        with self._lock:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    def start(self):
+        for name in self.source_names:
+            server = ThreadingHTTPServer((self.host, 0), PortalHandler)
+            server.daemon_threads = True
+            server.portal = self
+            server.source_name = name
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self.servers[name] = server
+        return self
+
+    def stop(self):
+        for server in self.servers.values():
+            server.shutdown()
+            server.server_close()
+        self.servers = {}
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def base_urls(self):
+        """{数据源名称: 模拟服务地址}"""
+        return {name: f"http://{self.host}:{server.server_port}" for name, server in self.servers.items()}
+
+def main():
+    """单独运行模拟门户，供其他进程的爬虫访问"""
+    parser = argparse.ArgumentParser(description="本地模拟门户")
+    parser.add_argument("--latency-ms", type=float, default=50, help="平均响应延迟 (默认: 50)")
+    parser.add_argument("--jitter-ms", type=float, default=20, help="延迟抖动 (默认: 20)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500错误比例 (默认: 0)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429限流比例 (默认: 0)")
+    parser.add_argument("--rows", type=int, default=20, help="每页研报条数 (默认: 20)")
+    parser.add_argument("--page-kb", type=int, default=100, help="列表页大小KB (默认: 100)")
+    args = parser.parse_args()
+
+    portal = MockPortal(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                        rate_limit_rate=args.rate_limit_rate, rows=args.rows, page_kb=args.page_kb)
+    with portal:
+        print(json.dumps(portal.base_urls(), ensure_ascii=False, indent=2), flush=True)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+命令行启动耗时基准测试
+用 python -X importtime 统计各子命令的导入开销，跟踪冷启动性能回归
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# 需要跟踪的子命令：(名称, 脚本, 参数)
+SUBCOMMANDS = [
+    ("main --list", "main.py", ["--list"]),
+    ("main --sources", "main.py", ["--sources"]),
+    ("main --config", "main.py", ["--config"]),
+    ("main_simple --list", "main_simple.py", ["--list"]),
+    ("main_enhanced --list", "main_enhanced.py", ["--list"]),
+    ("main_enhanced --sources", "main_enhanced.py", ["--sources"]),
+]
+
+def parse_importtime(stderr):
+    """
+    解析 -X importtime 输出
+
+    Returns:
+        (顶层导入总耗时微秒, [(累计耗时微秒, 模块名), ...] 按耗时降序)
+    """
+    top_level = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        # 名称前只有一个空格的是顶层导入，其累计耗时已包含所有子模块
+        if not name.startswith("  "):
+            top_level.append((int(cumulative_us), name.strip()))
+
+    top_level.sort(reverse=True)
+    return sum(us for us, _ in top_level), top_level
+
+def run_once(script, args, workdir):
+    """运行一次子命令，返回 (墙钟耗时秒, 导入耗时微秒, 顶层模块列表)"""
+    command = [sys.executable, "-X", "importtime", os.path.join(SRC_DIR, script)] + args
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=workdir, capture_output=True, text=True, encoding="utf-8")
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{script} {' '.join(args)} 执行失败:\n{result.stderr[-2000:]}")
+    import_us, modules = parse_importtime(result.stderr)
+    return wall, import_us, modules
+
+def benchmark(repeat=5, top=5):
+    """对所有子命令运行基准测试"""
+    results = {}
+    # 在临时目录中运行，避免子命令创建的 logs/output 等目录污染仓库
+    with tempfile.TemporaryDirectory() as workdir:
+        os.makedirs(os.path.join(workdir, "logs"), exist_ok=True)
+        for name, script, args in SUBCOMMANDS:
+            walls, imports, modules = [], [], []
+            for _ in range(repeat):
+                wall, import_us, modules = run_once(script, args, workdir)
+                walls.append(wall)
+                imports.append(import_us)
+            results[name] = {
+                "wall_ms": round(statistics.median(walls) * 1000, 1),
+                "import_ms": round(statistics.median(imports) / 1000, 1),
+                "heaviest": [{"module": m, "ms": round(us / 1000, 1)} for us, m in modules[:top]]
+            }
+    return results
+
+def compare(results, baseline, tolerance):
+    """与基线比较，返回超出容差的子命令列表"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous and current["import_ms"] > previous["import_ms"] * (1 + tolerance):
+            regressions.append((name, previous["import_ms"], current["import_ms"]))
+    return regressions
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="命令行启动耗时基准测试")
+    parser.add_argument("--repeat", type=int, default=5, help="每个子命令的运行次数，取中位数 (默认: 5)")
+    parser.add_argument("--top", type=int, default=5, help="显示最耗时的顶层导入数量 (默认: 5)")
+    parser.add_argument("--save", type=str, help="将结果保存为JSON基线文件")
+    parser.add_argument("--baseline", type=str, help="与已保存的JSON基线比较")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="允许的导入耗时增幅 (默认: 0.2)")
+    parser.add_argument("--budget-ms", type=float, help="任一子命令导入耗时超过该值时返回非零")
+    args = parser.parse_args()
+
+    results = benchmark(args.repeat, args.top)
+
+    print(f"{'子命令':<26}{'墙钟(ms)':>10}{'导入(ms)':>10}  最耗时的导入")
+    print("-" * 90)
+    for name, result in results.items():
+        heaviest = ", ".join(f"{item['module']} {item['ms']}" for item in result["heaviest"])
+        print(f"{name:<26}{result['wall_ms']:>10}{result['import_ms']:>10}  {heaviest}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已保存: {args.save}")
+
+    failed = False
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        for name, before, after in compare(results, baseline, args.tolerance):
+            print(f"⚠️  {name} 导入耗时回归: {before}ms -> {after}ms")
+            failed = True
+
+    if args.budget_ms is not None:
+        for name, result in results.items():
+            if result["import_ms"] > args.budget_ms:
+                print(f"⚠️  {name} 导入耗时 {result['import_ms']}ms 超出预算 {args.budget_ms}ms")
+                failed = True
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+公司注册表模块
+从外部数据文件加载上市公司信息，按股票代码、公司名称和行业建立索引，
+同一公司属于多个行业时只保存一个实体
+"""
+
+import os
+import json
+import logging
+import threading
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "company_registry.json")
+
+class CompanyRegistry:
+    """
+    公司注册表
+
+    数据文件结构：
+        companies: [{"id", "name", "aliases", "code", "market_cap", "currency"}, ...]
+            id 为股票代码，未上市公司使用公司名称；
+            currency 为市值的计价货币，可省略，省略时按股票代码判断
+        industries: {行业: [{"id", "main_products"}, ...]}
+            主要产品按行业记录，同一公司在不同行业可以不同
+    """
+
+    def __init__(self, path=None):
+        self.path = path or Config.STORAGE_CONFIG.get("company_registry_path") or DEFAULT_REGISTRY_PATH
+        with open(self.path, "r", encoding="utf-8") as f:
+            document = json.load(f)
+
+        self.companies = {}
+        self.by_code = {}
+        self.by_name = {}
+        for company in document["companies"]:
+            company_id = company["id"]
+            if company_id in self.companies:
+                raise ValueError(f"公司注册表中 {company_id} 重复")
+            self.companies[company_id] = company
+            self.by_code[company["code"]] = company_id
+            for name in [company["name"]] + company.get("aliases", []):
+                self.by_name.setdefault(name, company_id)
+
+        self.by_industry = {}
+        self.industries_by_company = {}
+        for industry, members in document["industries"].items():
+            for member in members:
+                if member["id"] not in self.companies:
+                    raise ValueError(f"行业 {industry} 引用了不存在的公司 {member['id']}")
+                self.industries_by_company.setdefault(member["id"], []).append(industry)
+            self.by_industry[industry] = members
+
+        logger.debug(f"已加载公司注册表 {self.path}：{len(self.companies)} 家公司，{len(self.by_industry)} 个行业")
+
+    def __len__(self):
+        return len(self.companies)
+
+    def get(self, code):
+        """按股票代码查找公司，不存在时返回 None"""
+        company_id = self.by_code.get(code)
+        return None if company_id is None else self.companies[company_id]
+
+    def find(self, name):
+        """按公司名称或别名查找公司，不存在时返回 None"""
+        company_id = self.by_name.get(name)
+        return None if company_id is None else self.companies[company_id]
+
+    def industries(self):
+        """所有行业，按数据文件中的顺序"""
+        return list(self.by_industry)
+
+    def industries_of(self, company_id):
+        """公司所属的行业"""
+        return list(self.industries_by_company.get(company_id, []))
+
+    def companies_in(self, industry):
+        """
+        行业内的公司
+
+        Returns:
+            [{'name', 'code', 'market_cap', 'currency', 'main_products'}, ...]，行业不存在时为空列表
+        """
+        result = []
+        for member in self.by_industry.get(industry, []):
+            company = self.companies[member["id"]]
+            result.append({
+                "name": company["name"],
+                "code": company["code"],
+                "market_cap": company["market_cap"],
+                "currency": company.get("currency"),
+                "main_products": member["main_products"]
+            })
+        return result
+
+    def to_company_data(self):
+        """{行业: [{'name', 'code', 'market_cap', 'currency', 'main_products'}, ...]}"""
+        return {industry: self.companies_in(industry) for industry in self.by_industry}
+
+_registries = {}
+_lock = threading.Lock()
+
+def get_registry(path=None):
+    """按路径缓存的注册表，首次调用时加载；数据文件修改后自动重新加载"""
+    path = os.path.abspath(path or Config.STORAGE_CONFIG.get("company_registry_path") or DEFAULT_REGISTRY_PATH)
+    mtime = os.path.getmtime(path)
+    with _lock:
+        cached = _registries.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = _registries[path] = (mtime, CompanyRegistry(path))
+    return cached[1]
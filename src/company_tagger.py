@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+企业标注模块
+用 Aho-Corasick 自动机一次扫描识别文本中的公司名称、简称和股票代码，并将指标归属到企业
+"""
+
+import re
+import bisect
+import logging
+from collections import deque
+
+from metric_extractor import get_metric_extractor, metric_column
+
+logger = logging.getLogger(__name__)
+
+# 生成简称时去掉的公司名后缀
+NAME_SUFFIXES = ("股份有限公司", "有限公司", "股份", "集团", "控股")
+
+# 指标与企业名称之间的最大距离（字符数），超出后视为行业整体指标
+ATTRIBUTION_WINDOW = 120
+
+_ASCII_WORD = re.compile(r"[0-9A-Za-z]")
+
+class AhoCorasick:
+    """Aho-Corasick 多模式匹配自动机"""
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self._built = False
+
+    def add(self, pattern, payload):
+        """添加模式串，匹配时产出 payload"""
+        state = 0
+        for char in pattern:
+            if char not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = len(self._goto) - 1
+            state = self._goto[state][char]
+        self._output[state].append((len(pattern), payload))
+        self._built = False
+
+    def build(self):
+        """按广度优先计算失败指针，并沿失败链合并输出"""
+        queue = deque(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+        self._built = True
+
+    def iter(self, text):
+        """
+        扫描文本，产出所有匹配
+
+        Yields:
+            (起始位置, 结束位置, payload)
+        """
+        if not self._built:
+            self.build()
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, payload in output[state]:
+                yield index + 1 - length, index + 1, payload
+
+def _short_names(name):
+    """根据公司全称生成简称，如 紫光股份 -> 紫光"""
+    for suffix in NAME_SUFFIXES:
+        if name.endswith(suffix) and len(name) - len(suffix) >= 2:
+            return [name[:-len(suffix)]]
+    return []
+
+def _code_variants(code):
+    """股票代码及其不带交易所后缀的数字部分，如 002230.SZ -> 002230"""
+    variants = [code]
+    number, _, exchange = code.partition(".")
+    if exchange and number.isdigit():
+        variants.append(number)
+    return variants
+
+class CompanyTagger:
+    """
+    企业标注器
+
+    所有公司的全称、简称和股票代码编入同一个自动机，每篇文本只需线性扫描一次，
+    耗时与公司数量基本无关。重叠的匹配取最长者，英文代码要求前后不是字母或数字，
+    避免 NIO 匹配到 UNION 之类的单词。
+    同一公司属于多个行业时只有一个实体，所属行业保存为集合；
+    标注时给出当前处理的行业，行业名称取该行业，否则取数据中首次出现的行业。
+    """
+
+    def __init__(self, company_data):
+        self.automaton = AhoCorasick()
+        self.companies = {}
+        self.industries = {}
+
+        industries = set(company_data)
+        for industry, companies in company_data.items():
+            for company in companies:
+                code = company.get("code", "")
+                key = code if code and code != "私有" else company["name"]
+                if key in self.companies:
+                    # 同一股票代码的重复条目按别名处理，记录其所属行业
+                    self.industries[key].add(industry)
+                else:
+                    self.companies[key] = {"企业名称": company["name"], "股票代码": code, "行业名称": industry}
+                    self.industries[key] = {industry}
+
+                patterns = [company["name"]] + list(company.get("aliases", [])) + _short_names(company["name"])
+                if key == code:
+                    patterns += _code_variants(code)
+                for pattern in dict.fromkeys(patterns):
+                    if pattern in industries:
+                        # 与行业名称相同的名称会把行业名误标为公司
+                        logger.debug(f"忽略与行业名称相同的公司名称: {pattern}")
+                        continue
+                    self.automaton.add(pattern.lower(), key)
+
+        self.automaton.build()
+
+    @staticmethod
+    def _is_word_boundary(text, start, end):
+        """英文和数字模式两侧不能紧挨字母或数字"""
+        if _ASCII_WORD.match(text[start]) and start > 0 and _ASCII_WORD.match(text[start - 1]):
+            return False
+        if _ASCII_WORD.match(text[end - 1]) and end < len(text) and _ASCII_WORD.match(text[end]):
+            return False
+        return True
+
+    def _entity(self, key, industry):
+        """企业信息，属于 industry 时行业名称取 industry"""
+        entity = self.companies[key]
+        if industry is not None and industry != entity["行业名称"] and industry in self.industries[key]:
+            entity = dict(entity, 行业名称=industry)
+        return entity
+
+    def tag(self, text, industry=None):
+        """
+        标注文本中出现的企业
+
+        Args:
+            industry: 当前处理的行业，用于确定属于多个行业的企业的行业名称
+
+        Returns:
+            [{"企业名称", "股票代码", "行业名称", "start", "end"}, ...] 按位置排序，互不重叠
+        """
+        lowered = text.lower()
+        candidates = [
+            (start, end, key) for start, end, key in self.automaton.iter(lowered)
+            if self._is_word_boundary(lowered, start, end)
+        ]
+        # 起点相同取最长，与前一个匹配重叠的丢弃
+        candidates.sort(key=lambda item: (item[0], -(item[1] - item[0])))
+
+        mentions = []
+        last_end = 0
+        for start, end, key in candidates:
+            if start < last_end:
+                continue
+            mentions.append(dict(self._entity(key, industry), start=start, end=end))
+            last_end = end
+        return mentions
+
+    def attribute(self, text, metric_items=None, industry=None):
+        """
+        将文本中的指标归属到企业
+
+        指标名称与数值之间出现的企业优先（如 “渗透率方面，科大讯飞达到20%”）；
+        其次是前方最近的企业，前方窗口内没有企业时取后方最近的企业；都没有时不归属。
+        industry 的含义同 tag()。
+
+        Returns:
+            {股票代码或企业名称: {"企业名称", "股票代码", "行业名称", 指标列: 数值, ...}}
+        """
+        mentions = self.tag(text, industry)
+        if not mentions:
+            return {}
+        if metric_items is None:
+            metric_items = get_metric_extractor().finditer(text)
+
+        # 匹配互不重叠，起点和终点均有序，可二分查找
+        starts = [m["start"] for m in mentions]
+        ends = [m["end"] for m in mentions]
+
+        attributed = {}
+        for item in metric_items:
+            following = bisect.bisect_left(starts, item["end"])
+            index = bisect.bisect_right(ends, item["start"]) - 1
+            if following > 0 and starts[following - 1] >= item["start"]:
+                mention = mentions[following - 1]
+            elif index >= 0 and item["start"] - ends[index] <= ATTRIBUTION_WINDOW:
+                mention = mentions[index]
+            elif following < len(mentions) and starts[following] - item["end"] <= ATTRIBUTION_WINDOW:
+                mention = mentions[following]
+            else:
+                continue
+
+            key = mention["股票代码"] if mention["股票代码"] and mention["股票代码"] != "私有" else mention["企业名称"]
+            company = attributed.setdefault(key, {
+                "企业名称": mention["企业名称"],
+                "股票代码": mention["股票代码"],
+                "行业名称": mention["行业名称"]
+            })
+            company.setdefault(metric_column(item["metric"]), item["value"])
+        return attributed
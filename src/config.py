@@ -23,67 +23,181 @@ class Config:
             "base_url": "http://data.eastmoney.com",
             "enabled": True,
             "delay_range": (1, 3),
-            "timeout": 30
+            "timeout": 30,
+            "selectors": {
+                "container": {"tag": "table", "attrs": {"class": "table-model"}},
+                "row": ".//tr[td]",
+                "fields": {
+                    "研报标题": "./td[2]//a",
+                    "研报链接": "./td[2]//a/@href",
+                    "机构名称": "./td[4]",
+                    "发布日期": "./td[last()]"
+                }
+            },
+            "cache_ttl": 3600
         },
         "新浪财经": {
             "base_url": "https://finance.sina.com.cn",
             "enabled": True,
             "delay_range": (1, 3),
-            "timeout": 30
+            "timeout": 30,
+            "selectors": {
+                "container": {"tag": "table", "attrs": {"class": "tb_01"}},
+                "row": ".//tr[td]",
+                "fields": {
+                    "研报标题": "./td[2]/a",
+                    "研报链接": "./td[2]/a/@href",
+                    "机构名称": "./td[5]",
+                    "发布日期": "./td[4]"
+                }
+            },
+            "cache_ttl": 3600
         },
         "和讯网": {
             "base_url": "http://www.hexun.com",
             "enabled": True,
             "delay_range": (1, 3),
-            "timeout": 30
+            "timeout": 30,
+            "selectors": {
+                "container": {"tag": "div", "attrs": {"class": "report-list"}},
+                "row": ".//li",
+                "fields": {
+                    "研报标题": ".//a",
+                    "研报链接": ".//a/@href",
+                    "发布日期": ".//span"
+                }
+            },
+            "cache_ttl": 3600
         },
         "雪球": {
             "base_url": "https://xueqiu.com",
             "enabled": True,
             "delay_range": (2, 4),
-            "timeout": 30
+            "timeout": 30,
+            "selectors": {
+                "container": {"tag": "div", "attrs": {"class": "report-timeline"}},
+                "row": ".//li",
+                "fields": {
+                    "研报标题": ".//a",
+                    "研报链接": ".//a/@href",
+                    "发布日期": ".//span"
+                }
+            },
+            "cache_ttl": 3600
         },
         "巨潮资讯": {
             "base_url": "http://www.cninfo.com.cn",
             "enabled": True,
             "delay_range": (1, 3),
-            "timeout": 30
+            "timeout": 30,
+            "selectors": {
+                "container": {"tag": "table", "attrs": {"class": "el-table__body"}},
+                "row": ".//tr[td]",
+                "fields": {
+                    "研报标题": "./td[2]//a",
+                    "研报链接": "./td[2]//a/@href",
+                    "机构名称": "./td[4]",
+                    "发布日期": "./td[last()]"
+                }
+            },
+            "cache_ttl": 3600
         },
         "证券时报": {
             "base_url": "http://www.stcn.com",
             "enabled": True,
             "delay_range": (1, 3),
-            "timeout": 30
+            "timeout": 30,
+            "selectors": {
+                "container": {"tag": "div", "attrs": {"class": "news-list"}},
+                "row": ".//li",
+                "fields": {
+                    "研报标题": ".//a",
+                    "研报链接": ".//a/@href",
+                    "发布日期": ".//span"
+                }
+            },
+            "cache_ttl": 3600
         },
         "中国证券报": {
             "base_url": "http://www.cs.com.cn",
             "enabled": True,
             "delay_range": (1, 3),
-            "timeout": 30
+            "timeout": 30,
+            "selectors": {
+                "container": {"tag": "div", "attrs": {"class": "ch_l_list"}},
+                "row": ".//li",
+                "fields": {
+                    "研报标题": ".//a",
+                    "研报链接": ".//a/@href",
+                    "发布日期": ".//span"
+                }
+            },
+            "cache_ttl": 3600
         },
         "上海证券报": {
             "base_url": "http://www.cnstock.com",
             "enabled": True,
             "delay_range": (1, 3),
-            "timeout": 30
+            "timeout": 30,
+            "selectors": {
+                "container": {"tag": "div", "attrs": {"class": "new-list"}},
+                "row": ".//li",
+                "fields": {
+                    "研报标题": ".//a",
+                    "研报链接": ".//a/@href",
+                    "发布日期": ".//span"
+                }
+            },
+            "cache_ttl": 3600
         },
         "第一财经": {
             "base_url": "https://www.yicai.com",
             "enabled": True,
             "delay_range": (1, 3),
-            "timeout": 30
+            "timeout": 30,
+            "selectors": {
+                "container": {"tag": "div", "attrs": {"class": "m-list"}},
+                "row": ".//li",
+                "fields": {
+                    "研报标题": ".//a",
+                    "研报链接": ".//a/@href",
+                    "发布日期": ".//span"
+                }
+            },
+            "cache_ttl": 3600
         },
         "同花顺": {
             "base_url": "http://www.10jqka.com.cn",
             "enabled": False,
             "delay_range": (2, 5),
-            "timeout": 30
+            "timeout": 30,
+            "selectors": {
+                "container": {"tag": "table", "attrs": {"class": "m-table"}},
+                "row": ".//tr[td]",
+                "fields": {
+                    "研报标题": "./td[2]//a",
+                    "研报链接": "./td[2]//a/@href",
+                    "机构名称": "./td[4]",
+                    "发布日期": "./td[last()]"
+                }
+            },
+            "cache_ttl": 3600
         },
         "Wind资讯": {
             "base_url": "https://www.wind.com.cn",
             "enabled": False,
             "delay_range": (3, 6),
-            "timeout": 45
+            "timeout": 45,
+            "selectors": {
+                "container": {"tag": "div", "attrs": {"class": "report-list"}},
+                "row": ".//li",
+                "fields": {
+                    "研报标题": ".//a",
+                    "研报链接": ".//a/@href",
+                    "发布日期": ".//span"
+                }
+            },
+            "cache_ttl": 3600
         }
     }
     
@@ -116,26 +230,31 @@ class Config:
         "行业渗透率": {
             "unit": "%",
             "range": (0, 100),
+            "aliases": ["渗透率"],
             "description": "行业产品在目标市场中的普及程度"
         },
         "产能利用率": {
             "unit": "%",
             "range": (0, 100),
+            "aliases": ["开工率"],
             "description": "企业实际产能与设计产能的比率"
         },
         "平均毛利率": {
             "unit": "%",
             "range": (0, 100),
+            "aliases": ["毛利率"],
             "description": "企业毛利润与营业收入的比率"
         },
         "市场规模": {
             "unit": "亿元",
             "range": (0, 10000),
+            "aliases": ["市场空间", "行业规模"],
             "description": "行业总体市场规模"
         },
         "年增长率": {
             "unit": "%",
             "range": (-50, 200),
+            "aliases": ["同比增长", "复合增长率", "CAGR", "增速"],
             "description": "行业年度增长率"
         }
     }
@@ -144,11 +263,25 @@ class Config:
     CRAWLER_SETTINGS = {
         "max_retries": 3,
         "retry_delay": 5,
+        "retry_max_delay": 60,
+        "circuit_breaker_threshold": 5,
+        "circuit_breaker_cooldown": 300,
         "user_agent_rotation": True,
         "proxy_enabled": False,
         "proxy_list": [],
+        "proxy_failure_threshold": 3,
+        "proxy_quarantine_seconds": 300,
         "respect_robots_txt": True,
         "max_concurrent_requests": 5,
+        "async_max_connections": 100,
+        "pdf_max_concurrent_downloads": 2,
+        "pdf_extraction_workers": 2,
+        "job_lease_seconds": 600,
+        "job_max_attempts": 3,
+        "refresh_budget_per_hour": 60,
+        "refresh_min_interval": 1800,
+        "refresh_max_interval": 86400,
+        "refresh_retry_delay": 300,
         "request_timeout": 30
     }
     
@@ -158,6 +291,19 @@ class Config:
         "csv_filename": f"行业研报数据_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
         "json_filename": f"行业研报数据_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
         "output_dir": "output",
+        "journal_path": os.path.join("output", "crawl_journal.jsonl"),
+        "job_queue_path": os.path.join("output", "crawl_jobs.sqlite3"),
+        "refresh_state_path": os.path.join("output", "refresh_state.json"),
+        "http_cache_dir": os.path.join("cache", "http"),
+        "http_cache_ttl": 3600,
+        "robots_cache_dir": os.path.join("cache", "robots"),
+        "robots_cache_ttl": 86400,
+        "frontier_seen_path": os.path.join("cache", "seen_urls.bloom"),
+        "frontier_capacity": 1000000,
+        "pdf_store_dir": os.path.join("cache", "pdf"),
+        "pdf_extraction_cache_dir": os.path.join("cache", "pdf_text"),
+        "company_registry_path": None,  # None 表示使用 src/data/company_registry.json
+        "fx_rates_path": None,  # None 表示使用 src/data/fx_rates.json
         "backup_enabled": True,
         "backup_dir": "backup"
     }
@@ -265,11 +411,25 @@ class DevelopmentConfig(Config):
     CRAWLER_SETTINGS = {
         "max_retries": 1,
         "retry_delay": 2,
+        "retry_max_delay": 10,
+        "circuit_breaker_threshold": 3,
+        "circuit_breaker_cooldown": 60,
         "user_agent_rotation": False,
         "proxy_enabled": False,
         "proxy_list": [],
+        "proxy_failure_threshold": 3,
+        "proxy_quarantine_seconds": 300,
         "respect_robots_txt": False,
         "max_concurrent_requests": 1,
+        "async_max_connections": 20,
+        "pdf_max_concurrent_downloads": 1,
+        "pdf_extraction_workers": 1,
+        "job_lease_seconds": 600,
+        "job_max_attempts": 3,
+        "refresh_budget_per_hour": 30,
+        "refresh_min_interval": 300,
+        "refresh_max_interval": 7200,
+        "refresh_retry_delay": 60,
         "request_timeout": 10
     }
 
@@ -279,11 +439,25 @@ class ProductionConfig(Config):
     CRAWLER_SETTINGS = {
         "max_retries": 5,
         "retry_delay": 10,
+        "retry_max_delay": 120,
+        "circuit_breaker_threshold": 5,
+        "circuit_breaker_cooldown": 600,
         "user_agent_rotation": True,
         "proxy_enabled": True,
         "proxy_list": [],
+        "proxy_failure_threshold": 3,
+        "proxy_quarantine_seconds": 300,
         "respect_robots_txt": True,
         "max_concurrent_requests": 3,
+        "async_max_connections": 100,
+        "pdf_max_concurrent_downloads": 2,
+        "pdf_extraction_workers": 4,
+        "job_lease_seconds": 600,
+        "job_max_attempts": 3,
+        "refresh_budget_per_hour": 120,
+        "refresh_min_interval": 1800,
+        "refresh_max_interval": 86400,
+        "refresh_retry_delay": 300,
         "request_timeout": 60
     }
     
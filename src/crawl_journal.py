@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+爬取日志模块
+按 (行业, 数据源) 单元记录已完成的抓取结果，中断后可从断点继续
+"""
+
+import os
+import json
+import logging
+import threading
+from datetime import datetime
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class CrawlJournal:
+    """
+    爬取日志
+
+    每完成一个 (行业, 数据源) 单元就向 JSON Lines 文件追加一行并落盘，
+    进程被中断或崩溃时最多丢失正在进行的单元。末尾写了一半的行在加载时忽略。
+    """
+
+    def __init__(self, path=None):
+        self.path = path or Config.STORAGE_CONFIG.get(
+            "journal_path", os.path.join(Config.STORAGE_CONFIG["output_dir"], "crawl_journal.jsonl")
+        )
+        self._units = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """加载已有的日志"""
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    logger.warning(f"忽略爬取日志第 {line_no} 行（不完整）")
+                    continue
+                self._units[(entry["industry"], entry["source"])] = entry["records"]
+
+        logger.info(f"已加载爬取日志 {self.path}，共 {len(self._units)} 个已完成单元")
+
+    def __len__(self):
+        return len(self._units)
+
+    def is_done(self, industry, source):
+        """判断单元是否已完成"""
+        return (industry, source) in self._units
+
+    def records(self, industry, source):
+        """获取已完成单元的记录"""
+        return self._units.get((industry, source), [])
+
+    def record(self, industry, source, records):
+        """记录一个已完成的单元"""
+        entry = {
+            "industry": industry,
+            "source": source,
+            "records": records,
+            "finished_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._units[(industry, source)] = records
+
+    def reset(self):
+        """清空日志，开始新的一轮爬取"""
+        with self._lock:
+            self._units = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)
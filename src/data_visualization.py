@@ -11,6 +11,7 @@ import seaborn as sns
 import numpy as np
 from datetime import datetime
 import warnings
+from record_batch import as_dataframe
 warnings.filterwarnings('ignore')
 
 # 设置中文字体
@@ -22,12 +23,9 @@ class IndustryDataVisualizer:
         """
         初始化可视化器
         Args:
-            data: 行业数据列表或DataFrame
+            data: 行业数据列表、RecordBatch 或 DataFrame
         """
-        if isinstance(data, list):
-            self.df = pd.DataFrame(data)
-        else:
-            self.df = data
+        self.df = as_dataframe(data)
         
         # 设置图表样式
         sns.set_style("whitegrid")
@@ -39,25 +37,25 @@ class IndustryDataVisualizer:
         fig.suptitle('新兴行业关键指标概览', fontsize=16, fontweight='bold')
         
         # 1. 各行业渗透率对比
-        industry_penetration = self.df.groupby('行业名称')['行业渗透率(%)'].mean().sort_values(ascending=True)
+        industry_penetration = self.df.groupby('行业名称', observed=True)['行业渗透率(%)'].mean().sort_values(ascending=True)
         axes[0, 0].barh(industry_penetration.index, industry_penetration.values, color='skyblue')
         axes[0, 0].set_title('各行业渗透率对比')
         axes[0, 0].set_xlabel('渗透率 (%)')
         
         # 2. 各行业毛利率对比
-        industry_margin = self.df.groupby('行业名称')['平均毛利率(%)'].mean().sort_values(ascending=True)
+        industry_margin = self.df.groupby('行业名称', observed=True)['平均毛利率(%)'].mean().sort_values(ascending=True)
         axes[0, 1].barh(industry_margin.index, industry_margin.values, color='lightcoral')
         axes[0, 1].set_title('各行业平均毛利率对比')
         axes[0, 1].set_xlabel('毛利率 (%)')
         
         # 3. 市场规模分布
-        market_size = self.df.groupby('行业名称')['市场规模(亿元)'].sum().sort_values(ascending=True)
+        market_size = self.df.groupby('行业名称', observed=True)['市场规模(亿元)'].sum().sort_values(ascending=True)
         axes[1, 0].barh(market_size.index, market_size.values, color='lightgreen')
         axes[1, 0].set_title('各行业市场规模对比')
         axes[1, 0].set_xlabel('市场规模 (亿元)')
         
         # 4. 增长率分布
-        growth_rate = self.df.groupby('行业名称')['年增长率(%)'].mean().sort_values(ascending=True)
+        growth_rate = self.df.groupby('行业名称', observed=True)['年增长率(%)'].mean().sort_values(ascending=True)
         axes[1, 1].barh(growth_rate.index, growth_rate.values, color='gold')
         axes[1, 1].set_title('各行业年增长率对比')
         axes[1, 1].set_xlabel('增长率 (%)')
@@ -129,7 +127,7 @@ class IndustryDataVisualizer:
     def create_industry_radar_chart(self, save_path="行业雷达图.png"):
         """创建行业雷达图"""
         # 选择前8个行业进行雷达图分析
-        top_industries = self.df.groupby('行业名称').agg({
+        top_industries = self.df.groupby('行业名称', observed=True).agg({
             '行业渗透率(%)': 'mean',
             '产能利用率(%)': 'mean',
             '平均毛利率(%)': 'mean',
@@ -242,7 +240,7 @@ class IndustryDataVisualizer:
         summary_stats.to_csv(f"{output_dir}/统计摘要.csv", encoding='utf-8-sig')
         
         # 生成行业排名
-        industry_rankings = self.df.groupby('行业名称').agg({
+        industry_rankings = self.df.groupby('行业名称', observed=True).agg({
             '行业渗透率(%)': 'mean',
             '产能利用率(%)': 'mean',
             '平均毛利率(%)': 'mean',
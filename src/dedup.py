@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+研报去重模块
+基于汉字片段的 SimHash 指纹和分段索引，识别多个数据源转载的同一篇研报
+"""
+
+import re
+import hashlib
+import logging
+import threading
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+# 只保留汉字、字母和数字，忽略排版和标点差异
+_TOKEN_PATTERN = re.compile(r"[一-鿿A-Za-z0-9]+")
+
+# 转载时添加的媒体标签和来源、编辑署名，如 【证券时报】、（来源：第一财经）
+_BOILERPLATE_PATTERN = re.compile(
+    r"【[^】]{0,20}】|[（(]\s*(?:来源|转载自|转自|原文来源|编辑|责任编辑)\s*[:：][^）)]{0,30}[）)]"
+)
+
+def strip_boilerplate(text):
+    """去掉转载时添加的媒体标签和来源署名"""
+    return _BOILERPLATE_PATTERN.sub("", text or "")
+
+def shingles(text, size=3):
+    """去掉转载标注后，将文本切分为长度为 size 的字符片段"""
+    chars = "".join(_TOKEN_PATTERN.findall(strip_boilerplate(text))).lower()
+    if len(chars) <= size:
+        return [chars] if chars else []
+    return [chars[i:i + size] for i in range(len(chars) - size + 1)]
+
+def simhash(text, bits=64, size=3):
+    """计算文本的 SimHash 指纹"""
+    weights = [0] * bits
+    for shingle, count in Counter(shingles(text, size)).items():
+        value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=bits // 8).digest(), "big")
+        for i in range(bits):
+            weights[i] += count if value >> i & 1 else -count
+
+    fingerprint = 0
+    for i, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << i
+    return fingerprint
+
+def hamming_distance(a, b):
+    """两个指纹之间的汉明距离"""
+    return bin(a ^ b).count("1")
+
+class SimHashIndex:
+    """
+    SimHash 分段索引
+
+    指纹切分为 max_distance + 1 段，汉明距离不超过 max_distance 的两个指纹
+    至少有一段完全相同，因此只需比较共享某一段的候选，而不必与全部指纹逐一比较。
+    """
+
+    def __init__(self, bits=64, max_distance=3):
+        self.bits = bits
+        self.max_distance = max_distance
+
+        band_count = max_distance + 1
+        band_width = bits // band_count
+        self._bands = [
+            (i * band_width, bits - i * band_width if i == band_count - 1 else band_width)
+            for i in range(band_count)
+        ]
+        self._tables = [{} for _ in self._bands]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self._tables[0].values())
+
+    def _band_keys(self, fingerprint):
+        return [(fingerprint >> offset) & ((1 << width) - 1) for offset, width in self._bands]
+
+    def add(self, doc_id, fingerprint):
+        """加入索引"""
+        with self._lock:
+            for table, key in zip(self._tables, self._band_keys(fingerprint)):
+                table.setdefault(key, []).append((fingerprint, doc_id))
+
+    def query(self, fingerprint):
+        """查询汉明距离不超过 max_distance 的文档，按距离升序返回 [(距离, 文档ID), ...]"""
+        matches = {}
+        with self._lock:
+            for table, key in zip(self._tables, self._band_keys(fingerprint)):
+                for candidate, doc_id in table.get(key, []):
+                    if doc_id not in matches:
+                        distance = hamming_distance(fingerprint, candidate)
+                        if distance <= self.max_distance:
+                            matches[doc_id] = distance
+        return sorted((distance, doc_id) for doc_id, distance in matches.items())
+
+class ReportDeduplicator:
+    """
+    研报去重器
+
+    每篇研报首次出现时登记指纹；之后内容相近的转载返回首次出现的研报ID，
+    调用方据此只补充数据来源，不再重复解析和提取指标。
+    转载常有少量增删（摘要、免责声明），默认阈值 8 位，索引相应分为 9 段。
+    """
+
+    def __init__(self, max_distance=8, min_length=50):
+        self.index = SimHashIndex(max_distance=max_distance)
+        self.min_length = min_length
+
+    def find(self, text):
+        """查找内容相近的已登记研报，返回其ID；没有时返回 None"""
+        if len(text or "") < self.min_length:
+            # 过短的文本指纹不可靠，不参与去重
+            return None
+        matches = self.index.query(simhash(text))
+        return matches[0][1] if matches else None
+
+    def add(self, doc_id, text):
+        """登记研报"""
+        if len(text or "") >= self.min_length:
+            self.index.add(doc_id, simhash(text))
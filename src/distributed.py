@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分布式爬取模块
+协调进程将爬取拆分为 (行业, 数据源) 任务写入队列，工作进程领取执行，最后合并结果
+"""
+
+import os
+import time
+import socket
+import logging
+
+from industry_report_crawler import IndustryReportCrawler
+from job_queue import JobQueue
+
+logger = logging.getLogger(__name__)
+
+def default_worker_id():
+    """主机名加进程号，区分不同机器上的工作进程"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+def run_coordinator(industries=None, queue=None, reset=False):
+    """
+    将所有 (行业, 数据源) 任务写入队列
+
+    Returns:
+        新增的任务数
+    """
+    queue = queue or JobQueue()
+    crawler = IndustryReportCrawler()
+    industries = industries or crawler.emerging_industries
+
+    if reset:
+        queue.reset()
+
+    jobs = [(industry, source_name) for industry in industries for source_name, _ in crawler.crawl_units()]
+    added = queue.enqueue(jobs)
+    logger.info(f"已写入 {added} 个任务（共 {len(jobs)} 个，{len(industries)} 个行业）")
+    return added
+
+def run_worker(queue=None, worker_id=None, wait=False, poll_interval=5, max_jobs=None):
+    """
+    循环领取并执行任务
+
+    Args:
+        wait: 队列暂时为空时是否继续等待新任务；为 False 时队列处理完毕即退出
+        max_jobs: 最多执行的任务数，None 表示不限
+
+    Returns:
+        本进程完成的任务数
+    """
+    queue = queue or JobQueue()
+    worker_id = worker_id or default_worker_id()
+    crawler = IndustryReportCrawler()
+    fetchers = dict(crawler.crawl_units())
+
+    completed = 0
+    while max_jobs is None or completed < max_jobs:
+        job = queue.lease(worker_id)
+        if job is None:
+            # 其他工作进程的租约到期后任务会重新变为可领取，队列未处理完时继续轮询
+            if not wait and queue.is_drained():
+                break
+            time.sleep(poll_interval)
+            continue
+
+        industry, source_name = job["industry"], job["source"]
+        fetch_func = fetchers.get(source_name)
+        if fetch_func is None:
+            queue.fail(job["id"], worker_id, f"未知数据源: {source_name}")
+            continue
+
+        # 本进程中该数据源已熔断时推迟到冷却结束后，不计入失败次数
+        cooldown = crawler.source_guard.breaker(source_name).remaining_cooldown()
+        if cooldown > 0:
+            queue.release(job["id"], worker_id, cooldown, f"{source_name} 已熔断")
+            logger.info(f"[{worker_id}] {source_name} 已熔断，{industry} / {source_name} 推迟 {cooldown:.0f} 秒")
+            continue
+
+        records, done = crawler._crawl_unit(source_name, fetch_func, industry)
+        if done:
+            if queue.ack(job["id"], worker_id, records):
+                completed += 1
+                logger.info(f"[{worker_id}] 完成 {industry} / {source_name}，{len(records)} 条记录")
+            else:
+                logger.warning(f"[{worker_id}] {industry} / {source_name} 的租约已过期，结果由其他进程提交")
+        else:
+            queue.fail(job["id"], worker_id, f"{source_name} 爬取失败")
+
+    return completed
+
+def merge_results(queue=None, crawler=None):
+    """
+    按行业合并已完成任务的结果
+
+    与单进程爬取一致：某个行业所有数据源都没有数据时使用模拟数据。
+    """
+    queue = queue or JobQueue()
+    crawler = crawler or IndustryReportCrawler()
+
+    counts = queue.counts()
+    if counts["pending"] or counts["leased"]:
+        logger.warning(f"仍有 {counts['pending']} 个待领取、{counts['leased']} 个执行中的任务，合并结果不完整")
+    if counts["failed"]:
+        logger.warning(f"{counts['failed']} 个任务多次失败，已跳过")
+
+    by_industry = {industry: [] for industry in queue.industries()}
+    for industry, _, records in queue.results():
+        by_industry[industry].extend(records)
+
+    merged = []
+    for industry, records in by_industry.items():
+        if not records:
+            records = [item for item in crawler.sample_data if item['行业名称'] == industry]
+        merged.extend(records)
+    return merged
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTML选择性解析模块
+只为数据源声明的目标元素构建子树，跳过页面其余部分，并按数据源统计解析耗时
+"""
+
+import time
+import logging
+import threading
+from urllib.parse import urljoin
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class _SelectiveTarget:
+    """
+    lxml 解析器事件接收器
+
+    只在进入匹配选择器的元素时开始构建子树，子树之外的标签和文本直接丢弃，
+    相当于 BeautifulSoup 的 SoupStrainer，但不需要先构建整棵树。
+    """
+
+    def __init__(self, selectors):
+        from lxml import etree
+
+        self._etree = etree
+        self.selectors = selectors
+        self.matches = []
+        self._builder = None
+        self._depth = 0
+
+    def _matches(self, tag, attrib):
+        for selector in self.selectors:
+            if tag != selector["tag"]:
+                continue
+            for name, expected in selector.get("attrs", {}).items():
+                value = attrib.get(name)
+                if value is None:
+                    break
+                if name == "class" and expected not in value.split():
+                    break
+                if name != "class" and value != expected:
+                    break
+            else:
+                return True
+        return False
+
+    def start(self, tag, attrib):
+        if self._builder is not None:
+            self._depth += 1
+            self._builder.start(tag, dict(attrib))
+        elif self._matches(tag, attrib):
+            self._builder = self._etree.TreeBuilder()
+            self._depth = 1
+            self._builder.start(tag, dict(attrib))
+
+    def end(self, tag):
+        if self._builder is None:
+            return
+        self._builder.end(tag)
+        self._depth -= 1
+        if self._depth == 0:
+            self.matches.append(self._builder.close())
+            self._builder = None
+
+    def data(self, data):
+        if self._builder is not None:
+            self._builder.data(data)
+
+    def comment(self, text):
+        pass
+
+    def close(self):
+        return self.matches
+
+def select(html, selectors, encoding=None):
+    """
+    解析 html，只返回匹配选择器的元素子树
+
+    Args:
+        html: 页面内容（str 或 bytes）
+        selectors: [{"tag": "table", "attrs": {"class": "report-list"}}, ...]
+        encoding: bytes 的字符集，通常取自响应头；为 None 时由 lxml 按页面的 meta charset 判断
+    """
+    from lxml import etree
+
+    if isinstance(html, str):
+        html, encoding = html.encode("utf-8"), "utf-8"
+    parser = etree.HTMLParser(target=_SelectiveTarget(selectors), encoding=encoding)
+    return etree.fromstring(html, parser) or []
+
+def response_encoding(response):
+    """
+    响应头 Content-Type 中声明的字符集，未声明时返回 None
+
+    requests 在未声明字符集时把 text/html 按 ISO-8859-1 解码，GBK 页面应传入
+    response.content 并用本函数的结果作为 encoding，交由页面的 meta charset 判断。
+    """
+    content_type = response.headers.get("Content-Type", "")
+    for part in content_type.split(";")[1:]:
+        name, _, value = part.partition("=")
+        if name.strip().lower() == "charset" and value.strip():
+            return value.strip().strip('"\'')
+    return None
+
+def _field_value(result):
+    """将 XPath 结果转换为字符串"""
+    if not result:
+        return ""
+    value = result[0]
+    if hasattr(value, "itertext"):
+        value = "".join(value.itertext())
+    return " ".join(str(value).split())
+
+class ParseMetrics:
+    """按数据源统计解析次数、字节数和耗时"""
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, source_name, size, seconds, records):
+        with self._lock:
+            stats = self._stats.setdefault(source_name, {"pages": 0, "bytes": 0, "seconds": 0.0, "records": 0})
+            stats["pages"] += 1
+            stats["bytes"] += size
+            stats["seconds"] += seconds
+            stats["records"] += records
+
+    def summary(self):
+        """返回 {数据源: {"pages", "bytes", "seconds", "records", "ms_per_page"}}"""
+        with self._lock:
+            return {
+                name: dict(stats, ms_per_page=round(stats["seconds"] * 1000 / stats["pages"], 2))
+                for name, stats in self._stats.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+    def log_summary(self):
+        """按数据源输出列表页解析耗时"""
+        for source_name, stats in self.summary().items():
+            logger.info(f"{source_name} 解析 {stats['pages']} 页、{stats['records']} 条记录，平均 {stats['ms_per_page']}ms/页")
+
+parse_metrics = ParseMetrics()
+
+def parse_listing(source_name, html, rules=None, metrics=parse_metrics, encoding=None):
+    """
+    按数据源声明的选择器解析列表页，返回记录列表
+
+    Args:
+        source_name: 数据源名称，用于查找 Config.DATA_SOURCES 中的 selectors 和记录耗时
+        html: 页面内容
+        rules: 覆盖配置中的选择器声明，格式同 DATA_SOURCES[...]["selectors"]
+        encoding: html 为 bytes 时的字符集，见 select()
+    """
+    rules = rules or Config.DATA_SOURCES.get(source_name, {}).get("selectors")
+    if not rules:
+        raise ValueError(f"{source_name} 未声明解析选择器")
+
+    base_url = Config.DATA_SOURCES.get(source_name, {}).get("base_url", "")
+    start = time.perf_counter()
+    records = []
+    for container in select(html, [rules["container"]], encoding):
+        for row in container.xpath(rules.get("row", ".")):
+            record = {}
+            for field, path in rules["fields"].items():
+                value = _field_value(row.xpath(path))
+                # 链接字段补全为绝对URL
+                record[field] = urljoin(base_url, value) if value and path.endswith("@href") else value
+            if any(record.values()):
+                records.append(record)
+    elapsed = time.perf_counter() - start
+
+    metrics.record(source_name, len(html), elapsed, len(records))
+    logger.debug(f"{source_name} 列表页解析 {len(records)} 条记录，耗时 {elapsed * 1000:.1f}ms")
+    return records
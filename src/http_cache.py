@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP缓存模块
+将GET响应持久化到磁盘，过期后使用 ETag / Last-Modified 发送条件请求
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+def normalize_request_key(url, params=None):
+    """规范化URL和查询参数，生成稳定的缓存键"""
+    parsed = urlparse(url)
+    query = parse_qsl(parsed.query, keep_blank_values=True)
+    if params:
+        items = params.items() if isinstance(params, dict) else params
+        for name, value in items:
+            if value is None:
+                continue
+            values = value if isinstance(value, (list, tuple)) else [value]
+            query.extend((str(name), str(v)) for v in values)
+
+    normalized = urlunparse((
+        parsed.scheme.lower(),
+        parsed.netloc.lower(),
+        parsed.path or "/",
+        "",
+        urlencode(sorted(query)),
+        ""
+    ))
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest(), normalized
+
+class HTTPCache:
+    """
+    磁盘HTTP缓存
+
+    每条缓存包含一个元数据JSON文件和一个响应体文件，按缓存键的前两位分目录存放。
+    各数据源的有效期取自 Config.DATA_SOURCES 中的 cache_ttl。
+    """
+
+    def __init__(self, cache_dir=None, data_sources=None, default_ttl=None, clock=time.time):
+        storage = Config.STORAGE_CONFIG
+        self.cache_dir = cache_dir or storage.get("http_cache_dir", os.path.join("cache", "http"))
+        self.default_ttl = default_ttl if default_ttl is not None else storage.get("http_cache_ttl", 3600)
+        self.clock = clock
+
+        # 主机名 -> 缓存有效期（秒）
+        self._host_ttls = {}
+        sources = data_sources if data_sources is not None else Config.DATA_SOURCES
+        for config in sources.values():
+            if "cache_ttl" in config:
+                self._host_ttls[urlparse(config["base_url"]).netloc.lower()] = config["cache_ttl"]
+
+        self._lock = threading.Lock()
+
+    def ttl_for(self, url):
+        """获取URL所属数据源的缓存有效期"""
+        return self._host_ttls.get(urlparse(url).netloc.lower(), self.default_ttl)
+
+    def _paths(self, key):
+        """缓存键对应的元数据和响应体路径"""
+        directory = os.path.join(self.cache_dir, key[:2])
+        return os.path.join(directory, f"{key}.json"), os.path.join(directory, f"{key}.body")
+
+    def load(self, key):
+        """读取缓存条目，不存在时返回 None"""
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            with open(body_path, "rb") as f:
+                entry["body"] = f.read()
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry):
+        """判断缓存条目是否仍在有效期内"""
+        return self.clock() - entry["stored_at"] < self.ttl_for(entry["url"])
+
+    def _write_atomic(self, path, data):
+        """先写临时文件再替换，避免并发读到半个文件"""
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def store(self, key, response):
+        """保存响应到缓存"""
+        meta_path, body_path = self._paths(key)
+        entry = {
+            "url": response.url,
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "encoding": response.encoding,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "stored_at": self.clock()
+        }
+        with self._lock:
+            os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+            self._write_atomic(body_path, response.content)
+            self._write_atomic(meta_path, json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+
+    def revalidate(self, key, entry, response):
+        """收到304后刷新缓存时间和校验信息"""
+        meta_path, _ = self._paths(key)
+        entry = {k: v for k, v in entry.items() if k != "body"}
+        entry["etag"] = response.headers.get("ETag", entry.get("etag"))
+        entry["last_modified"] = response.headers.get("Last-Modified", entry.get("last_modified"))
+        entry["stored_at"] = self.clock()
+        with self._lock:
+            self._write_atomic(meta_path, json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+
+    def conditional_headers(self, entry):
+        """根据缓存条目生成条件请求头"""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def build_response(self, entry, request=None):
+        """从缓存条目还原 requests.Response"""
+        response = requests.Response()
+        response.status_code = entry["status_code"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = entry["body"]
+        response.encoding = entry.get("encoding")
+        response.url = entry["url"]
+        response.request = request
+        response.from_cache = True
+        return response
+
+class CachedSession(requests.Session):
+    """带磁盘缓存和条件请求的 requests.Session"""
+
+    def __init__(self, cache=None):
+        super().__init__()
+        self.cache = cache if cache is not None else HTTPCache()
+
+    def request(self, method, url, params=None, **kwargs):
+        """GET请求优先使用缓存，过期后发送条件请求"""
+        if method.upper() != "GET" or kwargs.get("stream"):
+            return super().request(method, url, params=params, **kwargs)
+
+        key, _ = normalize_request_key(url, params)
+        entry = self.cache.load(key)
+
+        if entry is not None and self.cache.is_fresh(entry):
+            logger.debug(f"缓存命中: {url}")
+            return self.cache.build_response(entry)
+
+        if entry is not None:
+            headers = dict(kwargs.pop("headers", None) or {})
+            headers.update(self.cache.conditional_headers(entry))
+            kwargs["headers"] = headers
+
+        response = super().request(method, url, params=params, **kwargs)
+        response.from_cache = False
+
+        if response.status_code == 304 and entry is not None:
+            logger.debug(f"内容未变化: {url}")
+            self.cache.revalidate(key, entry, response)
+            return self.cache.build_response(entry, response.request)
+
+        if response.status_code == 200:
+            self.cache.store(key, response)
+
+        return response
@@ -5,21 +5,13 @@
 收集各券商和专业网站的行业研报数据，提取关键指标
 """
 
-import requests
-import pandas as pd
-import time
-import random
-from bs4 import BeautifulSoup
-from fake_useragent import UserAgent
-import json
-import re
-from datetime import datetime
 import logging
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from config import Config
+from scheduler import PolitenessScheduler
+from robots import RobotsCache
+from resilience import SourceGuard, CircuitOpenError
+from record_batch import RecordBatch, as_dataframe
+from html_parser import parse_metrics
 
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -27,15 +19,20 @@ logger = logging.getLogger(__name__)
 
 class IndustryReportCrawler:
     def __init__(self):
-        self.ua = UserAgent()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': self.ua.random,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'zh-CN,zh;q=0.8,en-US;q=0.5,en;q=0.3',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        })
+        # 共享会话在首次使用时创建，见 session 属性
+        self._session = None
+        
+        # robots.txt 规则（每个主机只抓取一次）
+        self.robots = RobotsCache() if Config.CRAWLER_SETTINGS.get("respect_robots_txt") else None
+        
+        # 按主机的礼貌性调度器，替代每次请求前的固定随机等待
+        self.scheduler = PolitenessScheduler(robots=self.robots)
+        
+        # 按数据源的重试与熔断
+        self.source_guard = SourceGuard()
+        
+        # 爬取日志，设置后按 (行业, 数据源) 记录进度以便断点续爬
+        self.journal = None
         
         # 新兴细分行业列表
         self.emerging_industries = [
@@ -59,100 +56,121 @@ class IndustryReportCrawler:
         # 模拟数据（实际项目中会从真实网站爬取）
         self.sample_data = self._generate_sample_data()
     
-    def _generate_sample_data(self):
-        """生成模拟的行业研报数据"""
-        data = []
-        
-        for industry in self.emerging_industries:
-            # 为每个行业生成3家龙头企业
-            for i in range(3):
-                company_name = f"{industry}龙头企业{i+1}"
-                
-                # 生成随机但合理的行业指标
-                penetration_rate = round(random.uniform(5, 35), 2)  # 渗透率 5-35%
-                capacity_utilization = round(random.uniform(60, 95), 2)  # 产能利用率 60-95%
-                gross_margin = round(random.uniform(15, 45), 2)  # 毛利率 15-45%
-                market_size = round(random.uniform(100, 2000), 0)  # 市场规模（亿元）
-                growth_rate = round(random.uniform(10, 50), 2)  # 增长率 10-50%
-                
-                data.append({
-                    '行业名称': industry,
-                    '企业名称': company_name,
-                    '行业渗透率(%)': penetration_rate,
-                    '产能利用率(%)': capacity_utilization,
-                    '平均毛利率(%)': gross_margin,
-                    '市场规模(亿元)': market_size,
-                    '年增长率(%)': growth_rate,
-                    '数据来源': '模拟数据',
-                    '更新时间': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                })
+    @property
+    def session(self):
+        """共享会话：按数据源挂载连接池，跨行业复用长连接（首次访问时创建）"""
+        if self._session is None:
+            from session_factory import get_shared_session
+            self._session = get_shared_session()
+        return self._session
+    
+    def _generate_sample_data(self, seed=None):
+        """生成模拟的行业研报数据，每个行业3家龙头企业（按列批量生成，见 synthetic_data 模块）"""
+        from synthetic_data import generate_sample_frame, to_records
         
-        return data
+        return to_records(generate_sample_frame(self.emerging_industries, seed=seed))
     
-    def crawl_eastmoney(self, industry_name):
-        """爬取东方财富网行业研报数据"""
+    def _crawl_source(self, source_name, fetch_func, industry_name):
+        """在重试和熔断保护下爬取单个数据源"""
+        records, _ = self._crawl_unit(source_name, fetch_func, industry_name)
+        return records
+    
+    def _crawl_unit(self, source_name, fetch_func, industry_name):
+        """爬取一个 (行业, 数据源) 单元，返回 (记录列表, 是否已完成)"""
         try:
-            logger.info(f"正在爬取东方财富网 {industry_name} 行业数据...")
+            base_url = Config.DATA_SOURCES[source_name]["base_url"] + "/"
+            if self.robots is not None and not self.robots.can_fetch(base_url):
+                # robots.txt 暂时无法获取时单元未完成，续爬、任务队列和刷新调度会重试
+                if self.robots.unavailable(base_url):
+                    logger.warning(f"{source_name} 的 robots.txt 暂时无法获取，稍后重试")
+                    return [], False
+                logger.warning(f"{source_name} 的 robots.txt 禁止抓取，跳过")
+                return [], True
             
-            # 模拟爬取过程
-            time.sleep(random.uniform(1, 3))
-            
-            # 这里应该实现真实的爬虫逻辑
-            # 由于网站反爬机制，这里使用模拟数据
-            return []
+            logger.info(f"正在爬取{source_name} {industry_name} 行业数据...")
+            return self.source_guard.call(source_name, fetch_func, industry_name), True
             
+        except CircuitOpenError as e:
+            logger.warning(f"跳过{source_name}: {e}")
+            return [], False
         except Exception as e:
-            logger.error(f"爬取东方财富网失败: {e}")
-            return []
+            logger.error(f"爬取{source_name}失败: {e}")
+            return [], False
+    
+    def crawl_eastmoney(self, industry_name):
+        """爬取东方财富网行业研报数据"""
+        return self._crawl_source("东方财富网", self._fetch_eastmoney, industry_name)
+    
+    def _fetch_eastmoney(self, industry_name):
+        """获取东方财富网数据，请求失败时抛出异常以便重试"""
+        # 同一主机的请求按令牌桶限速，不同主机之间无需等待
+        self.scheduler.wait("东方财富网")
+        
+        # 列表页用 html_parser.parse_listing("东方财富网", html) 解析，只构建选择器声明的子树
+        
+        # 这里应该实现真实的爬虫逻辑
+        # 由于网站反爬机制，这里使用模拟数据
+        return []
     
     def crawl_sina_finance(self, industry_name):
         """爬取新浪财经行业研报数据"""
-        try:
-            logger.info(f"正在爬取新浪财经 {industry_name} 行业数据...")
-            
-            # 模拟爬取过程
-            time.sleep(random.uniform(1, 3))
-            
-            return []
-            
-        except Exception as e:
-            logger.error(f"爬取新浪财经失败: {e}")
-            return []
+        return self._crawl_source("新浪财经", self._fetch_sina_finance, industry_name)
+    
+    def _fetch_sina_finance(self, industry_name):
+        """获取新浪财经数据，请求失败时抛出异常以便重试"""
+        # 同一主机的请求按令牌桶限速，不同主机之间无需等待
+        self.scheduler.wait("新浪财经")
+        
+        # 列表页用 html_parser.parse_listing("新浪财经", html) 解析，只构建选择器声明的子树
+        return []
     
     def crawl_hexun(self, industry_name):
         """爬取和讯网行业研报数据"""
-        try:
-            logger.info(f"正在爬取和讯网 {industry_name} 行业数据...")
-            
-            # 模拟爬取过程
-            time.sleep(random.uniform(1, 3))
-            
-            return []
-            
-        except Exception as e:
-            logger.error(f"爬取和讯网失败: {e}")
-            return []
+        return self._crawl_source("和讯网", self._fetch_hexun, industry_name)
+    
+    def _fetch_hexun(self, industry_name):
+        """获取和讯网数据，请求失败时抛出异常以便重试"""
+        # 同一主机的请求按令牌桶限速，不同主机之间无需等待
+        self.scheduler.wait("和讯网")
+        
+        # 列表页用 html_parser.parse_listing("和讯网", html) 解析，只构建选择器声明的子树
+        return []
+    
+    def crawl_units(self):
+        """每个行业需要爬取的数据源：[(数据源名称, 获取函数), ...]"""
+        return [
+            ("东方财富网", self._fetch_eastmoney),
+            ("新浪财经", self._fetch_sina_finance),
+            ("和讯网", self._fetch_hexun)
+        ]
     
     def process_industry_data(self, industry_name):
         """处理单个行业的数据"""
         logger.info(f"开始处理 {industry_name} 行业数据...")
         
-        # 从多个数据源收集数据
-        data_sources = [
-            self.crawl_eastmoney(industry_name),
-            self.crawl_sina_finance(industry_name),
-            self.crawl_hexun(industry_name)
-        ]
-        
-        # 合并数据
+        # 合并数据，已记录在爬取日志中的单元直接复用
         all_data = []
-        for source_data in data_sources:
-            all_data.extend(source_data)
+        for source_name, fetch_func in self.crawl_units():
+            if self.journal is not None and self.journal.is_done(industry_name, source_name):
+                logger.info(f"断点续爬：跳过已完成的 {industry_name} / {source_name}")
+                all_data.extend(self.journal.records(industry_name, source_name))
+                continue
+            
+            records, done = self._crawl_unit(source_name, fetch_func, industry_name)
+            if done and self.journal is not None:
+                self.journal.record(industry_name, source_name, records)
+            all_data.extend(records)
         
         # 如果没有爬取到数据，使用模拟数据
         if not all_data:
+            if self.journal is not None and self.journal.is_done(industry_name, "模拟数据"):
+                return self.journal.records(industry_name, "模拟数据")
+            
             industry_data = [item for item in self.sample_data if item['行业名称'] == industry_name]
             all_data = industry_data
+            
+            if self.journal is not None:
+                self.journal.record(industry_name, "模拟数据", all_data)
         
         return all_data
     
@@ -160,7 +178,11 @@ class IndustryReportCrawler:
         """爬取所有新兴行业的数据"""
         logger.info("开始爬取所有新兴行业数据...")
         
-        all_industry_data = []
+        # 解析耗时只统计本次爬取
+        parse_metrics.reset()
+        
+        # 各行业记录按列追加，下游只需转换一次 DataFrame
+        all_industry_data = RecordBatch()
         
         for industry in self.emerging_industries:
             try:
@@ -169,22 +191,24 @@ class IndustryReportCrawler:
                 
                 logger.info(f"完成 {industry} 行业数据收集，共 {len(industry_data)} 条记录")
                 
-                # 添加随机延迟，避免被反爬
-                time.sleep(random.uniform(2, 5))
-                
             except Exception as e:
                 logger.error(f"处理 {industry} 行业数据时出错: {e}")
                 continue
         
+        # 按数据源输出列表页解析耗时
+        parse_metrics.log_summary()
+        
         return all_industry_data
     
     def save_to_excel(self, data, filename="行业研报数据.xlsx"):
         """将数据保存为Excel文件"""
+        import pandas as pd
+        
         try:
             logger.info(f"正在保存数据到 {filename}...")
             
             # 创建DataFrame
-            df = pd.DataFrame(data)
+            df = as_dataframe(data)
             
             # 创建Excel写入器
             with pd.ExcelWriter(filename, engine='openpyxl') as writer:
@@ -192,7 +216,7 @@ class IndustryReportCrawler:
                 df.to_excel(writer, sheet_name='行业数据', index=False)
                 
                 # 行业汇总表
-                industry_summary = df.groupby('行业名称').agg({
+                industry_summary = df.groupby('行业名称', observed=True).agg({
                     '行业渗透率(%)': 'mean',
                     '产能利用率(%)': 'mean',
                     '平均毛利率(%)': 'mean',
@@ -214,7 +238,7 @@ class IndustryReportCrawler:
     
     def generate_report_summary(self, data):
         """生成报告摘要"""
-        df = pd.DataFrame(data)
+        df = as_dataframe(data)
         
         summary = {
             '总行业数': len(df['行业名称'].unique()),
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫程序 - 异步版本
+基于asyncio和aiohttp，在单个事件循环中并发抓取所有行业×数据源
+"""
+
+import asyncio
+import logging
+from urllib.parse import urlparse
+
+import aiohttp
+
+from config import Config
+from industry_report_crawler_enhanced import IndustryReportCrawlerEnhanced
+from resilience import CircuitOpenError
+from record_batch import RecordBatch
+from html_parser import parse_listing, parse_metrics
+
+# 配置日志
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+class IndustryReportCrawlerAsync(IndustryReportCrawlerEnhanced):
+    """
+    异步爬虫引擎
+
+    对外保持与同步爬虫一致的 crawl_all_industries() / process_industry_data() 接口，
+    内部把每个 行业×数据源 的抓取任务作为协程运行，共享一个连接池，并按主机限制并发数。
+    数据源配置了 listing_url 时按行业抓取并解析列表页，否则与同步爬虫一样使用模拟数据；
+    列表页记录与增强版一样经过 _fetch_reports 抓取研报详情，该步骤为同步下载，
+    在线程中逐个行业执行，不占用事件循环。
+    """
+
+    def __init__(self, industries=None, sources=None):
+        super().__init__()
+
+        settings = Config.CRAWLER_SETTINGS
+
+        # 要爬取的行业和数据源
+        self.emerging_industries = list(industries or self.company_data.keys())
+        self.sources = sources or Config.get_data_sources()
+
+        # 并发限制：全局连接数和每个主机的并发数
+        self.max_connections = settings.get("async_max_connections", 100)
+        self.max_per_host = settings.get("max_concurrent_requests", 5)
+        self.request_timeout = settings.get("request_timeout", 30)
+
+        # 每个主机的信号量和研报详情锁，在每次运行的事件循环内创建
+        self._host_semaphores = {}
+        self._reports_lock = None
+
+    def _reset_loop_state(self):
+        """新的事件循环中重新创建信号量和锁"""
+        self._host_semaphores = {}
+        self._reports_lock = asyncio.Lock()
+
+    def _host_of(self, source_name):
+        """获取数据源对应的主机名"""
+        return urlparse(self.sources[source_name]["base_url"]).netloc
+
+    def _host_semaphore(self, host):
+        """获取主机对应的信号量"""
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_semaphores[host]
+
+    def _create_session(self):
+        """创建共享连接池的aiohttp会话"""
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_per_host,
+            ttl_dns_cache=300
+        )
+        timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers=dict(self.session.headers)
+        )
+
+    async def fetch(self, http_session, source_name, url, params=None):
+        """
+        在主机并发限制内获取页面内容
+
+        Returns:
+            (原始字节, 响应头声明的字符集或 None)；未声明时由解析器按页面的 meta charset 判断
+        """
+        async with self._host_semaphore(self._host_of(source_name)):
+            timeout = aiohttp.ClientTimeout(total=self.sources[source_name].get("timeout", self.request_timeout))
+            async with http_session.get(url, params=params, timeout=timeout) as response:
+                response.raise_for_status()
+                return await response.read(), response.charset
+
+    async def crawl_source(self, http_session, source_name, industry_name):
+        """异步爬取单个数据源的行业数据"""
+        try:
+            base_url = self.sources[source_name]["base_url"] + "/"
+            if self.robots is not None and not self.robots.can_fetch(base_url):
+                if self.robots.unavailable(base_url):
+                    logger.warning(f"{source_name} 的 robots.txt 暂时无法获取，跳过")
+                else:
+                    logger.warning(f"{source_name} 的 robots.txt 禁止抓取，跳过")
+                return []
+
+            logger.info(f"正在爬取{source_name} {industry_name} 行业数据...")
+            return await self.source_guard.call_async(
+                source_name, self._fetch_source, http_session, source_name, industry_name
+            )
+
+        except CircuitOpenError as e:
+            logger.warning(f"跳过{source_name}: {e}")
+            return []
+        except Exception as e:
+            logger.error(f"爬取{source_name}失败: {e}")
+            return []
+
+    async def _fetch_source(self, http_session, source_name, industry_name):
+        """获取单个数据源的行业数据，请求失败时抛出异常以便重试"""
+        # 同一主机的请求按令牌桶限速，等待期间事件循环继续处理其他主机
+        await self.scheduler.wait_async(source_name)
+
+        listing_url = self.sources[source_name].get("listing_url")
+        if listing_url is None:
+            # 由于网站反爬机制，未配置列表页地址的数据源使用模拟数据
+            return []
+        selectors = self.sources[source_name].get("selectors")
+        if not selectors:
+            logger.warning(f"{source_name} 未声明解析选择器，跳过列表页")
+            return []
+        html, encoding = await self.fetch(http_session, source_name, listing_url, params={"industry": industry_name})
+        return parse_listing(source_name, html, rules=selectors, encoding=encoding)
+
+    async def _process_industry(self, http_session, industry_name):
+        """并发抓取单个行业的所有数据源，按数据源顺序合并后抓取研报详情"""
+        logger.info(f"开始处理 {industry_name} 行业数据...")
+
+        results = await asyncio.gather(
+            *(self.crawl_source(http_session, source_name, industry_name) for source_name in self.sources),
+            return_exceptions=True
+        )
+
+        all_data = []
+        for source_name, data in zip(self.sources, results):
+            if isinstance(data, Exception):
+                logger.error(f"数据源 {source_name} 处理失败: {data}")
+                continue
+            all_data.extend(data)
+
+        # 研报URL队列和去重索引不是线程安全的，各行业依次执行
+        async with self._reports_lock:
+            return await asyncio.to_thread(self._fetch_reports, all_data, industry_name)
+
+    async def _warm_robots(self):
+        """在线程池中并发预取各主机的 robots.txt，避免首次查询阻塞事件循环"""
+        if self.robots is None:
+            return
+        await asyncio.gather(*(
+            asyncio.to_thread(self.robots.crawl_delay, config["base_url"])
+            for config in self.sources.values()
+        ))
+
+    async def process_industry_data_async(self, industry_name):
+        """异步处理单个行业的数据"""
+        self._reset_loop_state()
+        await self._warm_robots()
+
+        async with self._create_session() as http_session:
+            return await self._process_industry(http_session, industry_name)
+
+    async def crawl_all_industries_async(self):
+        """异步爬取所有行业的数据"""
+        logger.info(f"开始异步爬取 {len(self.emerging_industries)} 个行业数据...")
+
+        self._reset_loop_state()
+        await self._warm_robots()
+
+        async with self._create_session() as http_session:
+            results = await asyncio.gather(
+                *(self._process_industry(http_session, industry) for industry in self.emerging_industries)
+            )
+
+        # 未抓取到数据的行业使用真实公司数据生成的模拟数据
+        generated = None
+        all_industry_data = RecordBatch()
+        for industry, industry_data in zip(self.emerging_industries, results):
+            if not industry_data:
+                if generated is None:
+                    generated = {}
+                    for item in self._generate_realistic_data():
+                        generated.setdefault(item['行业名称'], []).append(item)
+                industry_data = generated.get(industry, [])
+
+            all_industry_data.extend(industry_data)
+            logger.info(f"完成 {industry} 行业数据收集，共 {len(industry_data)} 条记录")
+
+        return all_industry_data
+
+    def process_industry_data(self, industry_name):
+        """处理单个行业的数据"""
+        return asyncio.run(self.process_industry_data_async(industry_name))
+
+    def crawl_all_industries(self):
+        """爬取所有行业的数据"""
+        # 解析耗时只统计本次爬取
+        parse_metrics.reset()
+        try:
+            data = asyncio.run(self.crawl_all_industries_async())
+        finally:
+            self.close_pdf_extraction()
+        logger.info(f"成功收集 {len(data)} 条行业数据")
+        parse_metrics.log_summary()
+        return data
+
+def main():
+    """主函数"""
+    crawler = IndustryReportCrawlerAsync()
+
+    # 爬取所有行业数据
+    data = crawler.crawl_all_industries()
+
+    if data:
+        # 保存到Excel
+        crawler.save_to_excel(data, "行业研报数据_异步版.xlsx")
+
+        # 生成报告摘要
+        summary = crawler.generate_report_summary(data)
+        print(summary)
+    else:
+        print("没有获取到数据")
+
+if __name__ == "__main__":
+    main()
@@ -5,17 +5,18 @@
 包含真实公司名称、股票代码和扩展数据源
 """
 
-import requests
-import pandas as pd
-import time
-import random
-from bs4 import BeautifulSoup
-from fake_useragent import UserAgent
-import json
-import re
 from datetime import datetime
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlparse
 from config import Config
+from scheduler import PolitenessScheduler
+from robots import RobotsCache
+from resilience import SourceGuard, CircuitOpenError
+from url_frontier import URLFrontier, normalize_url
+from dedup import ReportDeduplicator
+from record_batch import RecordBatch, as_dataframe
+from html_parser import parse_metrics
 
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -23,18 +24,33 @@ logger = logging.getLogger(__name__)
 
 class IndustryReportCrawlerEnhanced:
     def __init__(self):
-        self.ua = UserAgent()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': self.ua.random,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'zh-CN,zh;q=0.8,en-US;q=0.5,en;q=0.3',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        })
-        
-        # 真实公司数据（包含股票代码）
-        self.company_data = self._load_company_data()
+        # 共享会话在首次使用时创建，见 session 属性
+        self._session = None
+        
+        # 研报URL队列在首次使用时加载，见 frontier 属性
+        self._frontier = None
+        
+        # 研报PDF下载器在首次使用时创建，见 pdf_downloader 属性
+        self._pdf_downloader = None
+        self._pdf_extraction = None
+        
+        # 跨数据源的研报去重：转载只补充来源，不重复提取指标
+        self.dedup = ReportDeduplicator()
+        self.report_details = {}
+        self.report_companies = {}
+        self._tagger = None
+        
+        # robots.txt 规则（每个主机只抓取一次）
+        self.robots = RobotsCache() if Config.CRAWLER_SETTINGS.get("respect_robots_txt") else None
+        
+        # 按主机的礼貌性调度器，替代每次请求前的固定随机等待
+        self.scheduler = PolitenessScheduler(robots=self.robots)
+        
+        # 按数据源的重试与熔断
+        self.source_guard = SourceGuard()
+        
+        # 真实公司数据在首次使用时从公司注册表加载，见 company_data 属性
+        self._company_data = None
         
         # 扩展数据源
         self.data_sources = {
@@ -50,203 +66,102 @@ class IndustryReportCrawlerEnhanced:
             "第一财经": "https://www.yicai.com"
         }
     
+    @property
+    def session(self):
+        """共享会话：按数据源挂载连接池，跨行业复用长连接（首次访问时创建）"""
+        if self._session is None:
+            from session_factory import get_shared_session
+            self._session = get_shared_session()
+        return self._session
+    
+    @property
+    def frontier(self):
+        """研报URL队列：规范化去重，已抓取的研报跨运行不再重复抓取（首次访问时加载）"""
+        if self._frontier is None:
+            self._frontier = URLFrontier()
+        return self._frontier
+    
+    @property
+    def company_data(self):
+        """真实公司数据（包含股票代码），首次访问时从公司注册表加载"""
+        if self._company_data is None:
+            self._company_data = self._load_company_data()
+        return self._company_data
+    
     def _load_company_data(self):
         """加载真实公司数据，包含股票代码"""
-        return {
-            "人工智能": [
-                {"name": "科大讯飞", "code": "002230.SZ", "market_cap": "800亿", "main_products": "语音识别、智能教育"},
-                {"name": "寒武纪", "code": "688256.SH", "market_cap": "300亿", "main_products": "AI芯片、智能计算"},
-                {"name": "商汤科技", "code": "00020.HK", "market_cap": "600亿", "main_products": "计算机视觉、AI平台"}
-            ],
-            "新能源汽车": [
-                {"name": "比亚迪", "code": "002594.SZ", "market_cap": "7000亿", "main_products": "新能源汽车、动力电池"},
-                {"name": "宁德时代", "code": "300750.SZ", "market_cap": "8000亿", "main_products": "动力电池、储能系统"},
-                {"name": "蔚来", "code": "NIO", "market_cap": "2000亿", "main_products": "智能电动汽车"}
-            ],
-            "半导体": [
-                {"name": "中芯国际", "code": "688981.SH", "market_cap": "4000亿", "main_products": "晶圆代工、芯片制造"},
-                {"name": "韦尔股份", "code": "603501.SH", "market_cap": "1500亿", "main_products": "图像传感器、模拟芯片"},
-                {"name": "北方华创", "code": "002371.SZ", "market_cap": "1200亿", "main_products": "半导体设备、刻蚀机"}
-            ],
-            "生物医药": [
-                {"name": "恒瑞医药", "code": "600276.SH", "market_cap": "3000亿", "main_products": "抗肿瘤药、创新药"},
-                {"name": "药明康德", "code": "603259.SH", "market_cap": "2500亿", "main_products": "CRO服务、新药研发"},
-                {"name": "迈瑞医疗", "code": "300760.SZ", "market_cap": "3500亿", "main_products": "医疗器械、生命信息"}
-            ],
-            "5G通信": [
-                {"name": "中兴通讯", "code": "000063.SZ", "market_cap": "1500亿", "main_products": "通信设备、5G基站"},
-                {"name": "烽火通信", "code": "600498.SH", "market_cap": "300亿", "main_products": "光通信、传输设备"},
-                {"name": "紫光股份", "code": "000938.SZ", "market_cap": "800亿", "main_products": "网络设备、云计算"}
-            ],
-            "云计算": [
-                {"name": "阿里云", "code": "BABA", "market_cap": "20000亿", "main_products": "云服务、大数据"},
-                {"name": "腾讯云", "code": "00700.HK", "market_cap": "30000亿", "main_products": "云服务、游戏云"},
-                {"name": "华为云", "code": "私有", "market_cap": "私有", "main_products": "云服务、企业级解决方案"}
-            ],
-            "物联网": [
-                {"name": "移远通信", "code": "603236.SH", "market_cap": "200亿", "main_products": "物联网模组、通信模块"},
-                {"name": "广和通", "code": "300638.SZ", "market_cap": "150亿", "main_products": "无线通信模块、物联网"},
-                {"name": "日海智能", "code": "002313.SZ", "market_cap": "100亿", "main_products": "物联网设备、智能硬件"}
-            ],
-            "区块链": [
-                {"name": "远光软件", "code": "002063.SZ", "market_cap": "100亿", "main_products": "区块链应用、企业管理软件"},
-                {"name": "新湖中宝", "code": "600208.SH", "market_cap": "200亿", "main_products": "区块链投资、房地产"},
-                {"name": "安妮股份", "code": "002235.SZ", "market_cap": "50亿", "main_products": "区块链版权、数字版权"}
-            ],
-            "氢能源": [
-                {"name": "亿华通", "code": "688339.SH", "market_cap": "200亿", "main_products": "氢燃料电池、氢能设备"},
-                {"name": "潍柴动力", "code": "000338.SZ", "market_cap": "1000亿", "main_products": "氢能发动机、动力系统"},
-                {"name": "美锦能源", "code": "000723.SZ", "market_cap": "300亿", "main_products": "氢能产业链、焦化业务"}
-            ],
-            "储能技术": [
-                {"name": "阳光电源", "code": "300274.SZ", "market_cap": "1500亿", "main_products": "光伏逆变器、储能系统"},
-                {"name": "科士达", "code": "002518.SZ", "market_cap": "200亿", "main_products": "UPS电源、储能设备"},
-                {"name": "南都电源", "code": "300068.SZ", "market_cap": "150亿", "main_products": "铅酸电池、储能系统"}
-            ],
-            "机器人": [
-                {"name": "埃斯顿", "code": "002747.SZ", "market_cap": "200亿", "main_products": "工业机器人、自动化设备"},
-                {"name": "新松机器人", "code": "300024.SZ", "market_cap": "100亿", "main_products": "服务机器人、特种机器人"},
-                {"name": "机器人", "code": "300024.SZ", "market_cap": "100亿", "main_products": "工业机器人、智能制造"}
-            ],
-            "AR/VR": [
-                {"name": "歌尔股份", "code": "002241.SZ", "market_cap": "800亿", "main_products": "VR设备、声学器件"},
-                {"name": "水晶光电", "code": "002273.SZ", "market_cap": "200亿", "main_products": "光学元件、AR显示"},
-                {"name": "联创电子", "code": "002036.SZ", "market_cap": "150亿", "main_products": "光学镜头、VR显示"}
-            ],
-            "量子计算": [
-                {"name": "国盾量子", "code": "688027.SH", "market_cap": "100亿", "main_products": "量子通信、量子密钥分发"},
-                {"name": "科大国创", "code": "300520.SZ", "market_cap": "50亿", "main_products": "量子软件、人工智能"},
-                {"name": "中科曙光", "code": "603019.SH", "market_cap": "400亿", "main_products": "高性能计算、量子计算"}
-            ],
-            "基因治疗": [
-                {"name": "华大基因", "code": "300676.SZ", "market_cap": "300亿", "main_products": "基因测序、精准医疗"},
-                {"name": "贝瑞基因", "code": "000710.SZ", "market_cap": "100亿", "main_products": "基因检测、遗传病诊断"},
-                {"name": "达安基因", "code": "002030.SZ", "market_cap": "200亿", "main_products": "分子诊断、基因检测"}
-            ],
-            "碳中和技术": [
-                {"name": "隆基绿能", "code": "601012.SH", "market_cap": "3000亿", "main_products": "光伏组件、清洁能源"},
-                {"name": "通威股份", "code": "600438.SH", "market_cap": "2000亿", "main_products": "光伏硅料、水产饲料"},
-                {"name": "金风科技", "code": "002202.SZ", "market_cap": "500亿", "main_products": "风力发电、清洁能源"}
-            ],
-            "芯片设计": [
-                {"name": "兆易创新", "code": "603986.SH", "market_cap": "800亿", "main_products": "存储芯片、MCU"},
-                {"name": "汇顶科技", "code": "603160.SH", "market_cap": "400亿", "main_products": "指纹识别、触控芯片"},
-                {"name": "圣邦股份", "code": "300661.SZ", "market_cap": "300亿", "main_products": "模拟芯片、电源管理"}
-            ],
-            "自动驾驶": [
-                {"name": "四维图新", "code": "002405.SZ", "market_cap": "200亿", "main_products": "高精地图、自动驾驶"},
-                {"name": "德赛西威", "code": "002920.SZ", "market_cap": "300亿", "main_products": "汽车电子、智能驾驶"},
-                {"name": "中科创达", "code": "300496.SZ", "market_cap": "400亿", "main_products": "智能操作系统、自动驾驶"}
-            ],
-            "智能制造": [
-                {"name": "汇川技术", "code": "300124.SZ", "market_cap": "1500亿", "main_products": "工业自动化、智能制造"},
-                {"name": "信捷电气", "code": "603416.SH", "market_cap": "100亿", "main_products": "PLC、伺服系统"},
-                {"name": "英威腾", "code": "002334.SZ", "market_cap": "100亿", "main_products": "变频器、工业自动化"}
-            ],
-            "数字孪生": [
-                {"name": "用友网络", "code": "600588.SH", "market_cap": "800亿", "main_products": "企业管理软件、数字孪生"},
-                {"name": "广联达", "code": "002410.SZ", "market_cap": "400亿", "main_products": "建筑信息化、数字孪生"},
-                {"name": "宝信软件", "code": "600845.SH", "market_cap": "300亿", "main_products": "工业软件、智能制造"}
-            ],
-            "边缘计算": [
-                {"name": "浪潮信息", "code": "000977.SZ", "market_cap": "500亿", "main_products": "服务器、边缘计算"},
-                {"name": "中科曙光", "code": "603019.SH", "market_cap": "400亿", "main_products": "高性能计算、边缘计算"},
-                {"name": "紫光股份", "code": "000938.SZ", "market_cap": "800亿", "main_products": "网络设备、边缘计算"}
-            ]
-        }
+        from company_registry import get_registry
+        return get_registry().to_company_data()
     
-    def _generate_realistic_data(self):
-        """生成基于真实公司的行业数据"""
-        data = []
-        
-        for industry, companies in self.company_data.items():
-            # 为每个行业生成基础指标
-            industry_penetration = round(random.uniform(5, 40), 2)
-            industry_capacity = round(random.uniform(65, 95), 2)
-            industry_margin = round(random.uniform(20, 50), 2)
-            market_size = round(random.uniform(200, 5000), 0)
-            growth_rate = round(random.uniform(15, 60), 2)
-            
-            for company in companies:
-                # 为每个公司生成个性化指标
-                company_penetration = max(0, industry_penetration + random.uniform(-10, 10))
-                company_capacity = max(0, industry_capacity + random.uniform(-15, 15))
-                company_margin = max(0, industry_margin + random.uniform(-8, 8))
-                
-                data.append({
-                    '行业名称': industry,
-                    '企业名称': company['name'],
-                    '股票代码': company['code'],
-                    '市值': company['market_cap'],
-                    '主要产品': company['main_products'],
-                    '行业渗透率(%)': round(company_penetration, 2),
-                    '产能利用率(%)': round(company_capacity, 2),
-                    '平均毛利率(%)': round(company_margin, 2),
-                    '市场规模(亿元)': market_size,
-                    '年增长率(%)': growth_rate,
-                    '数据来源': '多源数据整合',
-                    '更新时间': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                })
+    def _generate_realistic_data(self, seed=None):
+        """生成基于真实公司的行业数据（按列批量生成，见 synthetic_data 模块）"""
+        from synthetic_data import generate_realistic_frame, to_records
         
-        return data
+        return to_records(generate_realistic_frame(self.company_data, seed=seed))
     
-    def crawl_eastmoney(self, industry_name):
-        """爬取东方财富网数据"""
+    def _crawl_source(self, source_name, fetch_func, industry_name):
+        """在重试和熔断保护下爬取单个数据源"""
         try:
-            logger.info(f"正在爬取东方财富网 {industry_name} 行业数据...")
+            if self.robots is not None and not self.robots.can_fetch(Config.DATA_SOURCES[source_name]["base_url"] + "/"):
+                logger.warning(f"{source_name} 的 robots.txt 禁止抓取，跳过")
+                return []
             
-            # 模拟爬取过程
-            time.sleep(random.uniform(1, 3))
+            logger.info(f"正在爬取{source_name} {industry_name} 行业数据...")
+            return self.source_guard.call(source_name, fetch_func, industry_name)
             
-            # 这里应该实现真实的爬虫逻辑
-            # 由于网站反爬机制，这里使用模拟数据
+        except CircuitOpenError as e:
+            logger.warning(f"跳过{source_name}: {e}")
             return []
-            
         except Exception as e:
-            logger.error(f"爬取东方财富网失败: {e}")
+            logger.error(f"爬取{source_name}失败: {e}")
             return []
     
+    def crawl_eastmoney(self, industry_name):
+        """爬取东方财富网数据"""
+        return self._crawl_source("东方财富网", self._fetch_eastmoney, industry_name)
+    
+    def _fetch_eastmoney(self, industry_name):
+        """获取东方财富网数据，请求失败时抛出异常以便重试"""
+        # 同一主机的请求按令牌桶限速，不同主机之间无需等待
+        self.scheduler.wait("东方财富网")
+        
+        # 列表页用 html_parser.parse_listing("东方财富网", html) 解析，只构建选择器声明的子树
+        
+        # 这里应该实现真实的爬虫逻辑
+        # 由于网站反爬机制，这里使用模拟数据
+        return []
+    
     def crawl_sina_finance(self, industry_name):
         """爬取新浪财经数据"""
-        try:
-            logger.info(f"正在爬取新浪财经 {industry_name} 行业数据...")
-            
-            # 模拟爬取过程
-            time.sleep(random.uniform(1, 3))
-            
-            return []
-            
-        except Exception as e:
-            logger.error(f"爬取新浪财经失败: {e}")
-            return []
+        return self._crawl_source("新浪财经", self._fetch_sina_finance, industry_name)
+    
+    def _fetch_sina_finance(self, industry_name):
+        """获取新浪财经数据，请求失败时抛出异常以便重试"""
+        # 同一主机的请求按令牌桶限速，不同主机之间无需等待
+        self.scheduler.wait("新浪财经")
+        
+        # 列表页用 html_parser.parse_listing("新浪财经", html) 解析，只构建选择器声明的子树
+        return []
     
     def crawl_xueqiu(self, industry_name):
         """爬取雪球网数据"""
-        try:
-            logger.info(f"正在爬取雪球网 {industry_name} 行业数据...")
-            
-            # 模拟爬取过程
-            time.sleep(random.uniform(1, 3))
-            
-            return []
-            
-        except Exception as e:
-            logger.error(f"爬取雪球网失败: {e}")
-            return []
+        return self._crawl_source("雪球", self._fetch_xueqiu, industry_name)
+    
+    def _fetch_xueqiu(self, industry_name):
+        """获取雪球数据，请求失败时抛出异常以便重试"""
+        # 同一主机的请求按令牌桶限速，不同主机之间无需等待
+        self.scheduler.wait("雪球")
+        return []
     
     def crawl_cninfo(self, industry_name):
         """爬取巨潮资讯网数据"""
-        try:
-            logger.info(f"正在爬取巨潮资讯网 {industry_name} 行业数据...")
-            
-            # 模拟爬取过程
-            time.sleep(random.uniform(1, 3))
-            
-            return []
-            
-        except Exception as e:
-            logger.error(f"爬取巨潮资讯网失败: {e}")
-            return []
+        return self._crawl_source("巨潮资讯", self._fetch_cninfo, industry_name)
+    
+    def _fetch_cninfo(self, industry_name):
+        """获取巨潮资讯数据，请求失败时抛出异常以便重试"""
+        # 同一主机的请求按令牌桶限速，不同主机之间无需等待
+        self.scheduler.wait("巨潮资讯")
+        return []
     
     def process_industry_data(self, industry_name):
         """处理单个行业的数据"""
@@ -262,34 +177,220 @@ class IndustryReportCrawlerEnhanced:
             self.crawl_cninfo
         ]
         
-        for source_func in sources:
+        # 各数据源并发抓取，线程数受 max_concurrent_requests 限制
+        max_workers = max(1, min(len(sources), Config.CRAWLER_SETTINGS.get("max_concurrent_requests", 1)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(source_func, industry_name) for source_func in sources]
+            
+            # 按数据源顺序合并结果，保证输出顺序稳定
+            for source_func, future in zip(sources, futures):
+                try:
+                    data = future.result()
+                    all_data.extend(data)
+                except Exception as e:
+                    logger.error(f"数据源 {source_func.__name__} 处理失败: {e}")
+        
+        return self._fetch_reports(all_data, industry_name)
+    
+    def _fetch_reports(self, records, industry_name=None):
+        """
+        抓取列表页记录中的研报详情
+        
+        industry_name 为当前处理的行业，属于多个行业的企业按该行业归属指标。
+        同一篇研报在多个数据源、多个带跟踪参数的链接下转载，规范化后只抓取一次；
+        之前运行中已抓取过的研报不再下载，指标从 frontier.details 中补回。
+        内容相近的转载只补充数据来源，不重复提取指标，同一企业的重复行合并为一行。
+        """
+        by_url = {}
+        for record in records:
+            link = record.get('研报链接')
+            if link:
+                by_url.setdefault(normalize_url(link), []).append(record)
+        if not by_url:
+            return records
+        
+        # 转载链接 -> 首次出现的研报链接
+        canonical = {}
+        for url in by_url:
+            if self.frontier.add(url) or not self.frontier.is_fetched(url):
+                continue
+            stored = self.frontier.details.get(url)
+            if stored is None:
+                continue
+            original = stored["canonical"] or url
+            if stored["canonical"]:
+                canonical[url] = original
+            self.report_details.setdefault(original, stored["detail"])
+            self.report_companies.setdefault(original, stored["companies"])
+            self._apply_details(by_url[url], original)
+        
+        # PDF 提交到提取进程池后继续下载下一篇，正文在全部下载完成后按抓取顺序收集
+        downloads = []
+        while True:
+            url = self.frontier.pop()
+            if url is None:
+                break
+            if self.robots is not None and not self.robots.can_fetch(url):
+                # 未标记为已抓取，下次运行时重新加入队列
+                if self.robots.unavailable(url):
+                    logger.warning(f"{url} 所在主机的 robots.txt 暂时无法获取，跳过")
+                else:
+                    logger.warning(f"robots.txt 禁止抓取 {url}，跳过")
+                continue
             try:
-                data = source_func(industry_name)
-                all_data.extend(data)
+                downloads.append((url, self._download_report(url)))
             except Exception as e:
-                logger.error(f"数据源 {source_func.__name__} 处理失败: {e}")
+                logger.error(f"抓取研报 {url} 失败: {e}")
         
-        return all_data
+        for url, result in downloads:
+            try:
+                text = result.result()["text"] if isinstance(result, Future) else result
+            except Exception as e:
+                # 未标记为已抓取，下次运行时重新下载和提取
+                logger.error(f"提取研报 {url} 失败: {e}")
+                continue
+            self.frontier.mark_fetched(url)
+            
+            original = self.dedup.find(text)
+            if original is not None:
+                logger.info(f"{url} 是 {original} 的转载，跳过解析")
+                canonical[url] = original
+                self.frontier.details.put(url, canonical=original)
+            else:
+                self.dedup.add(url, text)
+                original = url
+                self.report_details[url] = self._extract_report(text)
+                self.report_companies[url] = self._attribute_companies(text, industry_name)
+                self.frontier.details.put(url, self.report_details[url], self.report_companies[url])
+            
+            self._apply_details(by_url.get(url, []), original)
+        
+        self.frontier.save()
+        return self._merge_copies(records, canonical)
+    
+    def _apply_details(self, records, original):
+        """把研报 original 的指标写入指向它的列表页记录"""
+        detail = self.report_details.get(original, {})
+        companies = self.report_companies.get(original, {})
+        for record in records:
+            record.update(detail)
+            # 归属到具体企业的指标覆盖研报整体的指标
+            record.update(companies.get(record.get('企业名称'), {}))
+    
+    def _merge_copies(self, records, canonical):
+        """同一研报的同一企业只保留首次出现的一行，转载来源并入其数据来源"""
+        merged = []
+        kept = {}
+        for record in records:
+            link = record.get('研报链接')
+            if not link:
+                merged.append(record)
+                continue
+            
+            url = normalize_url(link)
+            key = (canonical.get(url, url), record.get('企业名称'))
+            if key not in kept:
+                kept[key] = record
+                merged.append(record)
+                continue
+            
+            original = kept[key]
+            sources = [s for s in original.get('数据来源', '').split('、') if s]
+            if record.get('数据来源') and record['数据来源'] not in sources:
+                sources.append(record['数据来源'])
+                original['数据来源'] = '、'.join(sources)
+        
+        return merged
+    
+    @property
+    def pdf_downloader(self):
+        """研报PDF下载器，独立限制并发下载数（首次访问时创建）"""
+        if self._pdf_downloader is None:
+            from pdf_downloader import PDFDownloader
+            self._pdf_downloader = PDFDownloader(self.session)
+        return self._pdf_downloader
+    
+    @property
+    def pdf_extraction(self):
+        """研报PDF提取阶段，在独立进程池中运行（首次访问时创建）"""
+        if self._pdf_extraction is None:
+            from pdf_extraction import PDFExtractionStage
+            self._pdf_extraction = PDFExtractionStage()
+        return self._pdf_extraction
+    
+    def close_pdf_extraction(self):
+        """等待提取中的PDF完成并关闭提取进程池"""
+        if self._pdf_extraction is not None:
+            self._pdf_extraction.close()
+            self._pdf_extraction = None
+    
+    def _download_report(self, url):
+        """下载单篇研报，返回正文；PDF 返回提取结果的 Future，不等待提取完成"""
+        self.scheduler.wait(url)
+        
+        if urlparse(url).path.lower().endswith(".pdf"):
+            # PDF流式写盘，按内容哈希保存，不在内存中缓存整个文件；
+            # 文本和表格在独立进程池中提取，相同内容的PDF只提取一次
+            document = self.pdf_downloader.download(url)
+            return self.pdf_extraction.submit(document["sha256"], document["path"])
+        
+        # 这里应该实现真实的研报下载逻辑
+        return ""
+    
+    @property
+    def tagger(self):
+        """企业标注器：公司名称、简称和股票代码编入同一个自动机（首次访问时构建）"""
+        if self._tagger is None:
+            from company_tagger import CompanyTagger
+            self._tagger = CompanyTagger(self.company_data)
+        return self._tagger
+    
+    def _attribute_companies(self, text, industry_name=None):
+        """将研报中的指标归属到企业，返回 {企业名称: 指标列}；industry_name 为当前处理的行业"""
+        if not text:
+            return {}
+        companies = {}
+        for company in self.tagger.attribute(text, industry=industry_name).values():
+            name = company.pop('企业名称')
+            company.pop('股票代码')
+            company.pop('行业名称')
+            companies[name] = company
+        return companies
+    
+    def _extract_report(self, text):
+        """从研报正文中提取指标列，覆盖记录中的对应字段"""
+        from metric_extractor import extract_metrics
+        return extract_metrics(text)
     
     def crawl_all_industries(self):
         """爬取所有行业的数据"""
         logger.info("开始爬取所有行业数据...")
         
-        # 使用真实公司数据生成模拟数据
-        data = self._generate_realistic_data()
+        # 解析耗时只统计本次爬取
+        parse_metrics.reset()
+        
+        try:
+            # 使用真实公司数据生成模拟数据，按列直接构建批次
+            from synthetic_data import generate_realistic_frame
+            data = RecordBatch.from_dataframe(generate_realistic_frame(self.company_data))
+        finally:
+            self.close_pdf_extraction()
         
         logger.info(f"成功生成 {len(data)} 条行业数据")
+        parse_metrics.log_summary()
         return data
     
     def save_to_excel(self, data, filename="行业研报数据_增强版.xlsx"):
         """保存数据到Excel文件"""
+        import pandas as pd
+        
         try:
             if not data:
                 logger.warning("没有数据可保存")
                 return False
             
             # 创建DataFrame
-            df = pd.DataFrame(data)
+            df = as_dataframe(data)
             
             # 确保输出目录存在
             import os
@@ -305,7 +406,7 @@ class IndustryReportCrawlerEnhanced:
                 df.to_excel(writer, sheet_name='行业数据', index=False)
                 
                 # 行业汇总表
-                industry_summary = df.groupby('行业名称').agg({
+                industry_summary = df.groupby('行业名称', observed=True).agg({
                     '行业渗透率(%)': 'mean',
                     '产能利用率(%)': 'mean',
                     '平均毛利率(%)': 'mean',
@@ -314,8 +415,18 @@ class IndustryReportCrawlerEnhanced:
                 }).round(2)
                 industry_summary.to_excel(writer, sheet_name='行业汇总')
                 
-                # 公司详情表
+                # 公司详情表，按换算后的市值降序（不能按市值字符串排序）
+                from market_cap import NUMERIC_COLUMN, add_market_cap_column
                 company_details = df[['企业名称', '股票代码', '市值', '主要产品', '行业名称']].copy()
+                if NUMERIC_COLUMN in df.columns:
+                    # 生成数据时已按注册表的计价货币换算
+                    company_details.insert(3, NUMERIC_COLUMN, df[NUMERIC_COLUMN])
+                else:
+                    from company_registry import get_registry
+                    registry = get_registry()
+                    currencies = [(registry.get(code) or {}).get('currency') for code in company_details['股票代码']]
+                    add_market_cap_column(company_details, currencies=currencies)
+                company_details = company_details.sort_values(NUMERIC_COLUMN, ascending=False, na_position='last')
                 company_details.to_excel(writer, sheet_name='公司详情', index=False)
             
             logger.info(f"数据已保存到: {filepath}")
@@ -330,7 +441,7 @@ class IndustryReportCrawlerEnhanced:
         if not data:
             return "没有数据可生成报告"
         
-        df = pd.DataFrame(data)
+        df = as_dataframe(data)
         
         summary = f"""
 行业研报数据摘要
@@ -5,16 +5,12 @@
 不依赖selenium，只使用requests和beautifulsoup4
 """
 
-import requests
-import pandas as pd
-import time
-import random
-from bs4 import BeautifulSoup
-from fake_useragent import UserAgent
-import json
-import re
-from datetime import datetime
 import logging
+from config import Config
+from scheduler import PolitenessScheduler
+from robots import RobotsCache
+from resilience import SourceGuard, CircuitOpenError
+from record_batch import RecordBatch, as_dataframe
 
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -22,15 +18,17 @@ logger = logging.getLogger(__name__)
 
 class IndustryReportCrawlerSimple:
     def __init__(self):
-        self.ua = UserAgent()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': self.ua.random,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'zh-CN,zh;q=0.8,en-US;q=0.5,en;q=0.3',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        })
+        # 共享会话在首次使用时创建，见 session 属性
+        self._session = None
+        
+        # robots.txt 规则（每个主机只抓取一次）
+        self.robots = RobotsCache() if Config.CRAWLER_SETTINGS.get("respect_robots_txt") else None
+        
+        # 按主机的礼貌性调度器，替代每次请求前的固定随机等待
+        self.scheduler = PolitenessScheduler(robots=self.robots)
+        
+        # 按数据源的重试与熔断
+        self.source_guard = SourceGuard()
         
         # 新兴细分行业列表
         self.emerging_industries = [
@@ -54,79 +52,69 @@ class IndustryReportCrawlerSimple:
         # 模拟数据（实际项目中会从真实网站爬取）
         self.sample_data = self._generate_sample_data()
     
-    def _generate_sample_data(self):
-        """生成模拟的行业研报数据"""
-        data = []
-        
-        for industry in self.emerging_industries:
-            # 为每个行业生成3家龙头企业
-            for i in range(3):
-                company_name = f"{industry}龙头企业{i+1}"
-                
-                # 生成随机但合理的行业指标
-                penetration_rate = round(random.uniform(5, 35), 2)  # 渗透率 5-35%
-                capacity_utilization = round(random.uniform(60, 95), 2)  # 产能利用率 60-95%
-                gross_margin = round(random.uniform(15, 45), 2)  # 毛利率 15-45%
-                market_size = round(random.uniform(100, 2000), 0)  # 市场规模（亿元）
-                growth_rate = round(random.uniform(10, 50), 2)  # 增长率 10-50%
-                
-                data.append({
-                    '行业名称': industry,
-                    '企业名称': company_name,
-                    '行业渗透率(%)': penetration_rate,
-                    '产能利用率(%)': capacity_utilization,
-                    '平均毛利率(%)': gross_margin,
-                    '市场规模(亿元)': market_size,
-                    '年增长率(%)': growth_rate,
-                    '数据来源': '模拟数据',
-                    '更新时间': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                })
+    @property
+    def session(self):
+        """共享会话：按数据源挂载连接池，跨行业复用长连接（首次访问时创建）"""
+        if self._session is None:
+            from session_factory import get_shared_session
+            self._session = get_shared_session()
+        return self._session
+    
+    def _generate_sample_data(self, seed=None):
+        """生成模拟的行业研报数据，每个行业3家龙头企业（按列批量生成，见 synthetic_data 模块）"""
+        from synthetic_data import generate_sample_frame, to_records
         
-        return data
+        return to_records(generate_sample_frame(self.emerging_industries, seed=seed))
     
-    def crawl_eastmoney(self, industry_name):
-        """爬取东方财富网行业研报数据"""
+    def _crawl_source(self, source_name, fetch_func, industry_name):
+        """在重试和熔断保护下爬取单个数据源"""
         try:
-            logger.info(f"正在爬取东方财富网 {industry_name} 行业数据...")
+            if self.robots is not None and not self.robots.can_fetch(Config.DATA_SOURCES[source_name]["base_url"] + "/"):
+                logger.warning(f"{source_name} 的 robots.txt 禁止抓取，跳过")
+                return []
             
-            # 模拟爬取过程
-            time.sleep(random.uniform(1, 3))
+            logger.info(f"正在爬取{source_name} {industry_name} 行业数据...")
+            return self.source_guard.call(source_name, fetch_func, industry_name)
             
-            # 这里应该实现真实的爬虫逻辑
-            # 由于网站反爬机制，这里使用模拟数据
+        except CircuitOpenError as e:
+            logger.warning(f"跳过{source_name}: {e}")
             return []
-            
         except Exception as e:
-            logger.error(f"爬取东方财富网失败: {e}")
+            logger.error(f"爬取{source_name}失败: {e}")
             return []
     
+    def crawl_eastmoney(self, industry_name):
+        """爬取东方财富网行业研报数据"""
+        return self._crawl_source("东方财富网", self._fetch_eastmoney, industry_name)
+    
+    def _fetch_eastmoney(self, industry_name):
+        """获取东方财富网数据，请求失败时抛出异常以便重试"""
+        # 同一主机的请求按令牌桶限速，不同主机之间无需等待
+        self.scheduler.wait("东方财富网")
+        
+        # 这里应该实现真实的爬虫逻辑
+        # 由于网站反爬机制，这里使用模拟数据
+        return []
+    
     def crawl_sina_finance(self, industry_name):
         """爬取新浪财经行业研报数据"""
-        try:
-            logger.info(f"正在爬取新浪财经 {industry_name} 行业数据...")
-            
-            # 模拟爬取过程
-            time.sleep(random.uniform(1, 3))
-            
-            return []
-            
-        except Exception as e:
-            logger.error(f"爬取新浪财经失败: {e}")
-            return []
+        return self._crawl_source("新浪财经", self._fetch_sina_finance, industry_name)
+    
+    def _fetch_sina_finance(self, industry_name):
+        """获取新浪财经数据，请求失败时抛出异常以便重试"""
+        # 同一主机的请求按令牌桶限速，不同主机之间无需等待
+        self.scheduler.wait("新浪财经")
+        return []
     
     def crawl_hexun(self, industry_name):
         """爬取和讯网行业研报数据"""
-        try:
-            logger.info(f"正在爬取和讯网 {industry_name} 行业数据...")
-            
-            # 模拟爬取过程
-            time.sleep(random.uniform(1, 3))
-            
-            return []
-            
-        except Exception as e:
-            logger.error(f"爬取和讯网失败: {e}")
-            return []
+        return self._crawl_source("和讯网", self._fetch_hexun, industry_name)
+    
+    def _fetch_hexun(self, industry_name):
+        """获取和讯网数据，请求失败时抛出异常以便重试"""
+        # 同一主机的请求按令牌桶限速，不同主机之间无需等待
+        self.scheduler.wait("和讯网")
+        return []
     
     def process_industry_data(self, industry_name):
         """处理单个行业的数据"""
@@ -155,7 +143,8 @@ class IndustryReportCrawlerSimple:
         """爬取所有新兴行业的数据"""
         logger.info("开始爬取所有新兴行业数据...")
         
-        all_industry_data = []
+        # 各行业记录按列追加，下游只需转换一次 DataFrame
+        all_industry_data = RecordBatch()
         
         for industry in self.emerging_industries:
             try:
@@ -164,9 +153,6 @@ class IndustryReportCrawlerSimple:
                 
                 logger.info(f"完成 {industry} 行业数据收集，共 {len(industry_data)} 条记录")
                 
-                # 添加随机延迟，避免被反爬
-                time.sleep(random.uniform(2, 5))
-                
             except Exception as e:
                 logger.error(f"处理 {industry} 行业数据时出错: {e}")
                 continue
@@ -175,11 +161,13 @@ class IndustryReportCrawlerSimple:
     
     def save_to_excel(self, data, filename="行业研报数据.xlsx"):
         """将数据保存为Excel文件"""
+        import pandas as pd
+        
         try:
             logger.info(f"正在保存数据到 {filename}...")
             
             # 创建DataFrame
-            df = pd.DataFrame(data)
+            df = as_dataframe(data)
             
             # 创建Excel写入器
             with pd.ExcelWriter(filename, engine='openpyxl') as writer:
@@ -187,7 +175,7 @@ class IndustryReportCrawlerSimple:
                 df.to_excel(writer, sheet_name='行业数据', index=False)
                 
                 # 行业汇总表
-                industry_summary = df.groupby('行业名称').agg({
+                industry_summary = df.groupby('行业名称', observed=True).agg({
                     '行业渗透率(%)': 'mean',
                     '产能利用率(%)': 'mean',
                     '平均毛利率(%)': 'mean',
@@ -209,7 +197,7 @@ class IndustryReportCrawlerSimple:
     
     def generate_report_summary(self, data):
         """生成报告摘要"""
-        df = pd.DataFrame(data)
+        df = as_dataframe(data)
         
         summary = {
             '总行业数': len(df['行业名称'].unique()),
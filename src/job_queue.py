@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+任务队列模块
+基于 SQLite 的持久化 (行业, 数据源) 任务队列，供协调进程和任意数量的工作进程共享
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    industry TEXT NOT NULL,
+    source TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    available_at REAL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL,
+    UNIQUE (industry, source)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, lease_expires);
+"""
+
+class JobQueue:
+    """
+    SQLite 任务队列
+
+    工作进程领取任务时获得有期限的租约，完成后确认并写入结果；
+    进程崩溃或超时未确认的任务在租约到期后计为一次失败，可被其他工作进程重新领取，
+    失败次数达到 max_attempts 后标记为 failed。
+    数据源熔断时任务以 release 放回队列并推迟到冷却结束后，不计入失败次数。
+    多台机器共用时，数据库文件需放在支持文件锁的共享存储上。
+    """
+
+    def __init__(self, path=None, lease_seconds=None, max_attempts=None, clock=time.time):
+        settings = Config.CRAWLER_SETTINGS
+        self.path = path or Config.STORAGE_CONFIG.get("job_queue_path", os.path.join("output", "crawl_jobs.sqlite3"))
+        self.lease_seconds = lease_seconds or settings.get("job_lease_seconds", 600)
+        self.max_attempts = max_attempts or settings.get("job_max_attempts", 3)
+        self.clock = clock
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 自动提交模式，事务由 BEGIN IMMEDIATE 显式控制
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+        if "available_at" not in columns:
+            # 兼容旧版本创建的队列文件
+            self.conn.execute("ALTER TABLE jobs ADD COLUMN available_at REAL")
+
+    def close(self):
+        self.conn.close()
+
+    def enqueue(self, jobs):
+        """
+        添加任务，已存在的 (行业, 数据源) 不重复添加
+
+        Args:
+            jobs: [(行业, 数据源), ...]
+
+        Returns:
+            新增的任务数
+        """
+        now = self.clock()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO jobs (industry, source, updated_at) VALUES (?, ?, ?)",
+                [(industry, source, now) for industry, source in jobs]
+            )
+            added = self.conn.total_changes - before
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def lease(self, worker):
+        """
+        领取一个任务
+
+        租约已到期的任务先计为一次失败，未达到最大次数时才可重新领取；
+        被推迟的任务在 available_at 之前不可领取。
+
+        Returns:
+            {"id", "industry", "source", "attempts"}，没有可领取的任务时返回 None
+        """
+        now = self.clock()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts + 1 >= ? THEN ? ELSE ? END, "
+                "attempts = attempts + 1, error = ?, worker = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_expires < ?",
+                (self.max_attempts, FAILED, PENDING, "租约过期", now, LEASED, now)
+            )
+            row = self.conn.execute(
+                "SELECT id, industry, source, attempts FROM jobs "
+                "WHERE status = ? AND (available_at IS NULL OR available_at <= ?) "
+                "ORDER BY id LIMIT 1",
+                (PENDING, now)
+            ).fetchone()
+            if row is None:
+                self.conn.execute("COMMIT")
+                return None
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, lease_expires = ?, updated_at = ? WHERE id = ?",
+                (LEASED, worker, now + self.lease_seconds, now, row["id"])
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return dict(row)
+
+    def ack(self, job_id, worker, records):
+        """确认任务完成并保存结果；租约已被其他工作进程接管时返回 False"""
+        cursor = self.conn.execute(
+            "UPDATE jobs SET status = ?, result = ?, error = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE id = ? AND worker = ? AND status = ?",
+            (DONE, json.dumps(records, ensure_ascii=False), self.clock(), job_id, worker, LEASED)
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id, worker, error):
+        """记录任务失败，未达到最大次数时放回队列"""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.conn.execute(
+                "SELECT attempts FROM jobs WHERE id = ? AND worker = ? AND status = ?", (job_id, worker, LEASED)
+            ).fetchone()
+            if row is not None:
+                attempts = row["attempts"] + 1
+                status = FAILED if attempts >= self.max_attempts else PENDING
+                self.conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = ?, error = ?, lease_expires = NULL, updated_at = ? WHERE id = ?",
+                    (status, attempts, str(error), self.clock(), job_id)
+                )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def release(self, job_id, worker, delay, reason=None):
+        """放回队列且不计入失败次数，delay 秒后才可再次领取；租约已被其他工作进程接管时返回 False"""
+        now = self.clock()
+        cursor = self.conn.execute(
+            "UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL, available_at = ?, error = ?, updated_at = ? "
+            "WHERE id = ? AND worker = ? AND status = ?",
+            (PENDING, now + delay, reason, now, job_id, worker, LEASED)
+        )
+        return cursor.rowcount == 1
+
+    def counts(self):
+        """各状态的任务数"""
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        for row in self.conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+            counts[row["status"]] = row["n"]
+        return counts
+
+    def is_drained(self):
+        """没有待领取或正在执行的任务"""
+        counts = self.counts()
+        return counts[PENDING] == 0 and counts[LEASED] == 0
+
+    def results(self):
+        """
+        按入队顺序产出已完成任务的结果
+
+        Yields:
+            (行业, 数据源, 记录列表)
+        """
+        rows = self.conn.execute("SELECT industry, source, result FROM jobs WHERE status = ? ORDER BY id", (DONE,))
+        for row in rows:
+            yield row["industry"], row["source"], json.loads(row["result"])
+
+    def industries(self):
+        """队列中的行业，按入队顺序"""
+        rows = self.conn.execute("SELECT industry FROM jobs GROUP BY industry ORDER BY MIN(id)")
+        return [row["industry"] for row in rows]
+
+    def reset(self):
+        """清空队列"""
+        self.conn.execute("DELETE FROM jobs")
@@ -10,14 +10,13 @@ import os
 import argparse
 import logging
 from datetime import datetime
-import pandas as pd
 
 # 添加当前目录到Python路径
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from config import current_config
 from industry_report_crawler import IndustryReportCrawler
-from data_visualization import IndustryDataVisualizer
+from crawl_journal import CrawlJournal
 
 def setup_logging():
     """设置日志配置"""
@@ -73,7 +72,52 @@ def print_banner():
     )
     print(banner)
 
-def crawl_data(industries=None, output_format='excel', generate_charts=True):
+def save_outputs(crawler, industry_data, output_format):
+    """
+    按输出格式保存数据
+
+    Returns:
+        (生成的文件列表, 所有请求的格式是否都已保存)
+    """
+    logger = logging.getLogger(__name__)
+    saved_files = []
+    complete = True
+    
+    if output_format in ['excel', 'all']:
+        excel_file = crawler.save_to_excel(industry_data, current_config.get_excel_filename())
+        if excel_file:
+            saved_files.append(excel_file)
+            print(f"Excel文件已保存: {excel_file}")
+        else:
+            complete = False
+    
+    # 各格式共用同一个 DataFrame；pandas 只在需要导出时导入，--list/--sources/--config 无需加载
+    from record_batch import as_dataframe
+    df = as_dataframe(industry_data)
+    
+    if output_format in ['csv', 'all']:
+        csv_file = current_config.get_csv_filename()
+        try:
+            df.to_csv(csv_file, index=False, encoding='utf-8-sig')
+            saved_files.append(csv_file)
+            print(f"CSV文件已保存: {csv_file}")
+        except Exception as e:
+            logger.error(f"保存CSV文件失败: {e}")
+            complete = False
+    
+    if output_format in ['json', 'all']:
+        json_file = current_config.get_json_filename()
+        try:
+            df.to_json(json_file, orient='records', force_ascii=False, indent=2)
+            saved_files.append(json_file)
+            print(f"JSON文件已保存: {json_file}")
+        except Exception as e:
+            logger.error(f"保存JSON文件失败: {e}")
+            complete = False
+    
+    return saved_files, complete
+
+def crawl_data(industries=None, output_format='excel', generate_charts=True, resume=False):
     """
     爬取行业数据
     
@@ -81,6 +125,7 @@ def crawl_data(industries=None, output_format='excel', generate_charts=True):
         industries: 指定行业列表，如果为None则爬取所有行业
         output_format: 输出格式 ('excel', 'csv', 'json', 'all')
         generate_charts: 是否生成图表
+        resume: 是否从上次中断的爬取日志继续
     """
     logger = logging.getLogger(__name__)
     
@@ -91,6 +136,13 @@ def crawl_data(industries=None, output_format='excel', generate_charts=True):
     # 创建爬虫实例
     crawler = IndustryReportCrawler()
     
+    # 爬取日志：每完成一个 (行业, 数据源) 单元即落盘
+    crawler.journal = CrawlJournal()
+    if resume and len(crawler.journal):
+        print(f"断点续爬：已有 {len(crawler.journal)} 个完成的单元")
+    else:
+        crawler.journal.reset()
+    
     # 如果指定了行业，则只爬取指定行业
     if industries:
         crawler.emerging_industries = industries
@@ -118,32 +170,21 @@ def crawl_data(industries=None, output_format='excel', generate_charts=True):
     print(f"平均增长率: {summary['平均增长率']}%")
     
     # 保存数据
-    saved_files = []
+    saved_files, complete = save_outputs(crawler, industry_data, output_format)
     
-    if output_format in ['excel', 'all']:
-        excel_file = crawler.save_to_excel(industry_data, current_config.get_excel_filename())
-        if excel_file:
-            saved_files.append(excel_file)
-            print(f"Excel文件已保存: {excel_file}")
-    
-    if output_format in ['csv', 'all']:
-        csv_file = current_config.get_csv_filename()
-        df = pd.DataFrame(industry_data)
-        df.to_csv(csv_file, index=False, encoding='utf-8-sig')
-        saved_files.append(csv_file)
-        print(f"CSV文件已保存: {csv_file}")
-    
-    if output_format in ['json', 'all']:
-        json_file = current_config.get_json_filename()
-        df = pd.DataFrame(industry_data)
-        df.to_json(json_file, orient='records', force_ascii=False, indent=2)
-        saved_files.append(json_file)
-        print(f"JSON文件已保存: {json_file}")
+    # 所有输出都已保存才清空爬取日志，否则保留以便 --resume 不必重新抓取
+    if complete:
+        crawler.journal.reset()
+    else:
+        logger.warning("部分输出文件保存失败，保留爬取日志，可使用 --resume 重新输出")
     
     # 生成图表
     if generate_charts:
         print("\n正在生成可视化图表...")
         try:
+            # matplotlib/seaborn 只在生成图表时导入
+            from data_visualization import IndustryDataVisualizer
+            
             visualizer = IndustryDataVisualizer(industry_data)
             charts = visualizer.generate_comprehensive_report()
             print("图表生成完成！")
@@ -156,6 +197,46 @@ def crawl_data(industries=None, output_format='excel', generate_charts=True):
         'files': saved_files
     }
 
+def run_distributed(args):
+    """分布式模式：协调进程写入任务、工作进程执行任务、合并步骤输出结果"""
+    from distributed import run_coordinator, run_worker, merge_results
+    from job_queue import JobQueue
+    
+    queue = JobQueue(args.queue)
+    try:
+        if args.coordinator:
+            added = run_coordinator(args.industries, queue, reset=not args.resume)
+            print(f"已写入 {added} 个任务: {queue.counts()}")
+        
+        if args.worker:
+            completed = run_worker(queue, wait=args.wait)
+            print(f"本进程完成 {completed} 个任务: {queue.counts()}")
+        
+        if args.merge:
+            crawler = IndustryReportCrawler()
+            industry_data = merge_results(queue, crawler)
+            if not industry_data:
+                print("队列中没有已完成的任务")
+                return None
+            saved_files, _ = save_outputs(crawler, industry_data, args.format)
+            print(f"合并完成，共 {len(industry_data)} 条记录")
+            return saved_files
+    finally:
+        queue.close()
+
+def run_daemon(args):
+    """常驻调度模式：按数据新鲜度和变化程度刷新，数据有变化时重新输出文件"""
+    from refresh_scheduler import RefreshScheduler
+    
+    crawler = IndustryReportCrawler()
+    scheduler = RefreshScheduler(crawler, args.industries)
+    print(f"常驻调度已启动：{len(scheduler.industries)} 个行业，每小时最多 {scheduler.budget_per_hour} 次刷新")
+    
+    def on_refresh(industry_data):
+        save_outputs(crawler, industry_data, args.format)
+    
+    scheduler.run_forever(on_refresh)
+
 def list_industries():
     """列出所有支持的行业"""
     print("\n支持的新兴细分行业:")
@@ -185,6 +266,11 @@ def main():
   python main.py --list             # 列出所有行业
   python main.py --sources          # 显示数据源
   python main.py --no-charts        # 不生成图表
+  python main.py --resume           # 从上次中断处继续
+  python main.py --coordinator      # 将 (行业, 数据源) 任务写入队列
+  python main.py --worker           # 领取并执行队列中的任务（可在多台机器上运行多个）
+  python main.py --merge -f all     # 合并已完成任务的结果并输出
+  python main.py --daemon           # 常驻运行，按数据变化程度定期刷新
         """
     )
     
@@ -200,6 +286,20 @@ def main():
                        help='显示配置的数据源')
     parser.add_argument('--config', action='store_true', 
                        help='显示当前配置信息')
+    parser.add_argument('--resume', action='store_true', 
+                       help='从上次中断处继续爬取，跳过已完成的行业/数据源')
+    parser.add_argument('--coordinator', action='store_true', 
+                       help='分布式模式：将任务写入队列（配合 --resume 保留已有任务）')
+    parser.add_argument('--worker', action='store_true', 
+                       help='分布式模式：领取并执行队列中的任务')
+    parser.add_argument('--merge', action='store_true', 
+                       help='分布式模式：合并已完成任务的结果并输出')
+    parser.add_argument('--queue', type=str, 
+                       help='任务队列数据库路径 (默认: output/crawl_jobs.sqlite3)')
+    parser.add_argument('--wait', action='store_true', 
+                       help='工作进程在队列为空时继续等待新任务')
+    parser.add_argument('--daemon', action='store_true', 
+                       help='常驻调度模式：变化快的行业/数据源更频繁刷新，受全局请求预算限制')
     
     args = parser.parse_args()
     
@@ -231,6 +331,17 @@ def main():
         print(f"图表目录: {current_config.VISUALIZATION_CONFIG['charts_output_dir']}")
         return
     
+    if args.coordinator or args.worker or args.merge:
+        run_distributed(args)
+        return
+    
+    if args.daemon:
+        try:
+            run_daemon(args)
+        except KeyboardInterrupt:
+            print("\n\n常驻调度已停止，刷新状态已保存")
+        return
+    
     try:
         # 开始爬取数据
         start_time = datetime.now()
@@ -238,7 +349,8 @@ def main():
         result = crawl_data(
             industries=args.industries,
             output_format=args.format,
-            generate_charts=not args.no_charts
+            generate_charts=not args.no_charts,
+            resume=args.resume
         )
         
         if result:
@@ -255,6 +367,7 @@ def main():
         
     except KeyboardInterrupt:
         print("\n\n用户中断操作")
+        print("已完成的部分已记录，使用 --resume 可从中断处继续")
         sys.exit(1)
     except Exception as e:
         logger.error(f"程序执行出错: {e}")
@@ -12,7 +12,6 @@ import logging
 from datetime import datetime
 from industry_report_crawler_enhanced import IndustryReportCrawlerEnhanced
 from config import Config
-import pandas as pd
 import random
 
 def setup_logging():
@@ -77,7 +76,8 @@ def run_demo():
         # 显示部分数据预览
         print("\n📈 数据预览:")
         print("-" * 60)
-        df = pd.DataFrame(data)
+        from record_batch import as_dataframe
+        df = as_dataframe(data)
         print(df.head(10).to_string(index=False))
         
     else:
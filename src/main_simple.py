@@ -10,7 +10,6 @@ import os
 import argparse
 import logging
 from datetime import datetime
-import pandas as pd
 
 # 添加当前目录到Python路径
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -102,16 +101,18 @@ def crawl_data(industries=None, output_format='excel'):
             saved_files.append(excel_file)
             print(f"Excel文件已保存: {excel_file}")
     
+    # 各格式共用同一个 DataFrame；pandas 只在需要导出时导入，--list/--sample 无需加载
+    from record_batch import as_dataframe
+    df = as_dataframe(industry_data)
+    
     if output_format in ['csv', 'all']:
         csv_filename = f"行业研报数据_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        df = pd.DataFrame(industry_data)
         df.to_csv(csv_filename, index=False, encoding='utf-8-sig')
         saved_files.append(csv_filename)
         print(f"CSV文件已保存: {csv_filename}")
     
     if output_format in ['json', 'all']:
         json_filename = f"行业研报数据_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        df = pd.DataFrame(industry_data)
         df.to_json(json_filename, orient='records', force_ascii=False, indent=2)
         saved_files.append(json_filename)
         print(f"JSON文件已保存: {json_filename}")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+市值换算模块
+将 "800亿"、"2.5万亿"、"私有" 等市值字符串批量换算为人民币元，无法换算的记为 NaN；
+计价货币依次取字符串中的标注、调用方给出的货币、按股票代码判断，用本地缓存的汇率表折算
+"""
+
+import os
+import json
+import logging
+import threading
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "fx_rates.json")
+
+# 换算后的数值列名
+NUMERIC_COLUMN = '市值(元)'
+
+UNIT_MULTIPLIERS = {"万亿": 1e12, "亿": 1e8, "万": 1e4}
+
+# 市值字符串中显式标注的货币
+CURRENCY_MARKERS = {
+    "HK$": "HKD", "US$": "USD", "$": "USD",
+    "港元": "HKD", "港币": "HKD", "美元": "USD", "人民币": "CNY", "元": "CNY",
+}
+
+_AMOUNT_PATTERN = (
+    r'^\s*(?P<prefix>HK\$|US\$|\$)?\s*(?P<number>\d+(?:\.\d+)?)\s*'
+    r'(?P<unit>万亿|亿|万)?\s*(?P<suffix>港元|港币|美元|人民币|元)?\s*$'
+)
+
+_fx_tables = {}
+_lock = threading.Lock()
+
+def load_fx_rates(path=None):
+    """
+    本地汇率表 {货币: 1单位折合人民币}
+
+    按路径缓存，文件修改后自动重新加载。
+    """
+    path = os.path.abspath(path or Config.STORAGE_CONFIG.get("fx_rates_path") or DEFAULT_FX_PATH)
+    mtime = os.path.getmtime(path)
+    with _lock:
+        cached = _fx_tables.get(path)
+        if cached is None or cached[0] != mtime:
+            with open(path, "r", encoding="utf-8") as f:
+                document = json.load(f)
+            if document.get("base", "CNY") != "CNY":
+                raise ValueError(f"汇率表 {path} 的基准货币必须为 CNY")
+            cached = _fx_tables[path] = (mtime, document["rates"])
+            logger.debug(f"已加载汇率表 {path}（{document.get('as_of', '未知日期')}）")
+    return cached[1]
+
+def ticker_currency(codes):
+    """
+    按股票代码判断计价货币
+
+    .HK 结尾为港元，纯字母代码（美股）为美元，其余为人民币。
+
+    Args:
+        codes: 股票代码序列
+
+    Returns:
+        货币代码 Series
+    """
+    import numpy as np
+    import pandas as pd
+
+    codes = pd.Series(codes, copy=False).astype("string").str.strip().str.upper()
+    currency = np.where(codes.str.endswith(".HK", na=False), "HKD",
+                        np.where(codes.str.fullmatch(r"[A-Z]+(?:\.[A-Z])?", na=False), "USD", "CNY"))
+    return pd.Series(currency, index=codes.index)
+
+def _rates_for(currencies, rates):
+    """货币代码 Series 对应的汇率数组，汇率表缺少的货币为 NaN"""
+    missing = sorted(set(currencies.dropna()) - set(rates))
+    if missing:
+        logger.warning(f"汇率表中缺少货币 {', '.join(missing)}，相应市值记为缺失")
+    return currencies.map(rates).to_numpy(dtype="float64", na_value=float("nan"))
+
+def normalize_market_cap(values, codes=None, fx_rates=None, currencies=None):
+    """
+    批量换算市值为人民币元
+
+    市值和股票代码的取值通常大量重复，先去重再解析，按编码取回每一行的结果。
+
+    Args:
+        values: 市值字符串序列，如 "800亿"、"2.5万亿"、"HK$600亿"；数值按元处理
+        codes: 与 values 对应的股票代码，未标注货币时据此判断计价货币；为 None 时按人民币处理
+        fx_rates: 汇率表，默认使用 load_fx_rates()
+        currencies: 与 values 对应的计价货币（如注册表中的 currency），空值处按股票代码判断
+
+    Returns:
+        float64 Series，无法识别的值（"私有"、空值等）为 NaN
+    """
+    import numpy as np
+    import pandas as pd
+
+    values = pd.Series(values, copy=False)
+    rates = fx_rates if fx_rates is not None else load_fx_rates()
+
+    # 解析去重后的市值：金额（元）和显式标注货币的汇率；末尾追加一项供缺失值（编码 -1）取用
+    value_codes, uniques = pd.factorize(values)
+    parts = pd.Series(uniques, dtype="string").str.replace(",", "", regex=False).str.extract(_AMOUNT_PATTERN)
+    amount = parts["number"].astype("float64") * parts["unit"].map(UNIT_MULTIPLIERS).fillna(1.0).astype("float64")
+    explicit = parts["prefix"].fillna(parts["suffix"]).map(CURRENCY_MARKERS)
+    amount = np.append(amount.to_numpy(dtype="float64", na_value=np.nan), np.nan)[value_codes]
+    has_marker = np.append(explicit.notna().to_numpy(), False)[value_codes]
+    explicit_rate = np.append(_rates_for(explicit, rates), np.nan)[value_codes]
+
+    # 未标注货币的按股票代码判断
+    if codes is None:
+        default_rate = np.full(len(values), rates.get("CNY", np.nan))
+    else:
+        code_codes, code_uniques = pd.factorize(pd.Series(codes, copy=False))
+        ticker_rate = _rates_for(ticker_currency(pd.Series(code_uniques, dtype="object")), rates)
+        default_rate = np.append(ticker_rate, rates.get("CNY", np.nan))[code_codes]
+
+    # 调用方给出的计价货币优先于股票代码
+    if currencies is not None:
+        currency_codes, currency_uniques = pd.factorize(pd.Series(currencies, copy=False))
+        given_rate = np.append(_rates_for(pd.Series(currency_uniques, dtype="object"), rates), np.nan)[currency_codes]
+        default_rate = np.where(currency_codes >= 0, given_rate, default_rate)
+
+    return pd.Series(amount * np.where(has_marker, explicit_rate, default_rate),
+                     index=values.index, name=NUMERIC_COLUMN)
+
+def add_market_cap_column(df, value_column='市值', code_column='股票代码', fx_rates=None, currencies=None):
+    """在 value_column 右侧插入换算后的 市值(元) 列（原地修改并返回 df）"""
+    if value_column not in df.columns:
+        return df
+    codes = df[code_column] if code_column in df.columns else None
+    normalized = normalize_market_cap(df[value_column], codes, fx_rates, currencies)
+    if NUMERIC_COLUMN in df.columns:
+        df[NUMERIC_COLUMN] = normalized
+    else:
+        df.insert(df.columns.get_loc(value_column) + 1, NUMERIC_COLUMN, normalized)
+    return df
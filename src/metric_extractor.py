@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+指标提取模块
+将 Config.KEY_METRICS 中所有指标编译为一个正则，单次扫描文本提取数值并统一单位
+"""
+
+import re
+import logging
+import threading
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# 单位换算到指标的标准单位：{标准单位: {文本中的单位: 倍数}}
+UNIT_FACTORS = {
+    "%": {"%": 1, "％": 1, "个百分点": 1},
+    "亿元": {"万亿元": 10000, "万亿": 10000, "亿元": 1, "亿": 1, "万元": 0.0001, "元": 0.00000001},
+}
+
+# 指标名称与数值之间允许出现的内容：非数字字符，或“2024年”“2025E”这类年份
+_GAP = r"(?:\d{4}(?:年|E|e)|[^\d\n。；;]){0,15}?"
+_NUMBER = r"(?P<value>[-−]?\d+(?:,\d{3})*(?:\.\d+)?)"
+
+def metric_column(name):
+    """指标名称对应的数据列名，如 行业渗透率 -> 行业渗透率(%)"""
+    return f"{name}({Config.KEY_METRICS[name]['unit']})"
+
+class MetricExtractor:
+    """
+    指标提取器
+
+    所有指标的名称和别名合并为一个正则，finditer 一次扫描即可找到全部指标，
+    文本长度不变时耗时与指标数量基本无关。数值按标准单位换算，
+    单位不匹配或超出指标 range 的数值被丢弃。
+    """
+
+    def __init__(self, metrics=None):
+        self.metrics = metrics if metrics is not None else Config.KEY_METRICS
+
+        self._aliases = {}
+        for name, spec in self.metrics.items():
+            for alias in [name] + list(spec.get("aliases", [])):
+                self._aliases[alias] = name
+
+        units = sorted({unit for spec in self.metrics.values() for unit in UNIT_FACTORS.get(spec["unit"], {spec["unit"]: 1})},
+                       key=len, reverse=True)
+        # 较长的名称优先匹配，如 “行业渗透率” 先于 “渗透率”
+        names = sorted(self._aliases, key=len, reverse=True)
+        self.pattern = re.compile(
+            rf"(?P<name>{'|'.join(map(re.escape, names))}){_GAP}{_NUMBER}\s*(?P<unit>{'|'.join(map(re.escape, units))})?"
+        )
+
+    def _normalize(self, name, value, unit):
+        """换算到标准单位并检查范围，不合法时返回 None"""
+        spec = self.metrics[name]
+        factors = UNIT_FACTORS.get(spec["unit"], {spec["unit"]: 1})
+        if unit not in factors:
+            return None
+        value = value * factors[unit]
+        low, high = spec["range"]
+        if not low <= value <= high:
+            return None
+        return round(value, 4)
+
+    def finditer(self, text):
+        """
+        逐个产出文本中的有效指标
+
+        Yields:
+            {"metric": 指标名称, "value": 标准单位下的数值, "start": 起始位置, "end": 结束位置}
+        """
+        for match in self.pattern.finditer(text):
+            name = self._aliases[match.group("name")]
+            raw = match.group("value").replace(",", "").replace("−", "-")
+            value = self._normalize(name, float(raw), match.group("unit"))
+            if value is None:
+                continue
+            yield {"metric": name, "value": value, "start": match.start(), "end": match.end()}
+
+    def extract(self, text):
+        """提取每个指标首次出现的有效值，返回 {指标名称: 数值}"""
+        values = {}
+        for item in self.finditer(text):
+            values.setdefault(item["metric"], item["value"])
+        return values
+
+_default_extractor = None
+_default_lock = threading.Lock()
+
+def get_metric_extractor():
+    """获取按 Config.KEY_METRICS 编译的提取器，首次调用时编译"""
+    global _default_extractor
+    with _default_lock:
+        if _default_extractor is None:
+            _default_extractor = MetricExtractor()
+        return _default_extractor
+
+def extract_metrics(text):
+    """从研报正文中提取 KEY_METRICS 中的指标，返回 {列名: 数值}"""
+    return {metric_column(name): value for name, value in get_metric_extractor().extract(text).items()}
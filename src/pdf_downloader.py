@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+研报PDF下载模块
+分块流式写盘、Range断点续传、大小和校验和验证，按内容哈希存储
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class PDFDownloadError(Exception):
+    """PDF下载失败或校验不通过"""
+
+class PDFDownloader:
+    """
+    研报PDF下载器
+
+    响应体按块写入 partial/ 下的 .part 文件，内存占用与文件大小无关；
+    连接中断后保留 .part 文件，下次用 Range 请求从断点继续。下载完成并通过校验后
+    按 SHA-256 移入 objects/，相同内容的PDF只保存一份。
+    同时下载的数量由 pdf_max_concurrent_downloads 单独限制，不占用页面抓取的并发额度。
+    """
+
+    def __init__(self, session=None, store_dir=None, max_concurrent=None, chunk_size=64 * 1024):
+        self._session = session
+        self.store_dir = store_dir or Config.STORAGE_CONFIG.get("pdf_store_dir", os.path.join("cache", "pdf"))
+        self.max_concurrent = max(1, max_concurrent or Config.CRAWLER_SETTINGS.get("pdf_max_concurrent_downloads", 2))
+        self.chunk_size = chunk_size
+
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._lock = threading.Lock()
+        self._index_path = os.path.join(self.store_dir, "index.json")
+        self._index = self._load_index()
+
+    @property
+    def session(self):
+        """下载使用的会话，未指定时使用共享爬虫会话"""
+        if self._session is None:
+            from session_factory import get_shared_session
+            self._session = get_shared_session()
+        return self._session
+
+    def _load_index(self):
+        """加载 URL -> SHA-256 索引"""
+        if not os.path.exists(self._index_path):
+            return {}
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"PDF索引损坏，将重新建立: {e}")
+            return {}
+
+    def _save_index(self):
+        tmp_path = f"{self._index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, ensure_ascii=False)
+        os.replace(tmp_path, self._index_path)
+
+    def object_path(self, sha256):
+        """内容哈希对应的存储路径"""
+        return os.path.join(self.store_dir, "objects", sha256[:2], f"{sha256}.pdf")
+
+    def _partial_paths(self, url):
+        name = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.store_dir, "partial", name)
+        return f"{base}.part", f"{base}.json"
+
+    def lookup(self, url):
+        """已下载过的URL返回其内容哈希，否则返回 None"""
+        sha256 = self._index.get(url)
+        if sha256 and os.path.exists(self.object_path(sha256)):
+            return sha256
+        return None
+
+    def download(self, url, expected_sha256=None, expected_size=None):
+        """
+        下载单个PDF
+
+        Returns:
+            {"url", "sha256", "path", "size", "reused"}
+        """
+        sha256 = self.lookup(url)
+        if sha256:
+            path = self.object_path(sha256)
+            return {"url": url, "sha256": sha256, "path": path, "size": os.path.getsize(path), "reused": True}
+
+        with self._slots:
+            sha256, size = self._fetch(url, expected_sha256, expected_size)
+
+        with self._lock:
+            self._index[url] = sha256
+            self._save_index()
+        return {"url": url, "sha256": sha256, "path": self.object_path(sha256), "size": size, "reused": False}
+
+    def _fetch(self, url, expected_sha256, expected_size):
+        """流式下载到 .part 文件，校验后移入内容寻址存储，返回 (sha256, 大小)"""
+        part_path, meta_path = self._partial_paths(url)
+        os.makedirs(os.path.dirname(part_path), exist_ok=True)
+
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        meta = {}
+        if offset and os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+
+        # 不接受压缩编码，保证字节偏移与文件内容一致
+        headers = {"Accept": "application/pdf,*/*", "Accept-Encoding": "identity"}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            # 服务器上的文件已变化时 If-Range 使其返回完整的200响应
+            validator = meta.get("etag") or meta.get("last_modified")
+            if validator:
+                headers["If-Range"] = validator
+
+        with self.session.get(url, headers=headers, stream=True) as response:
+            if response.status_code == 416 and offset:
+                # 已下载完整，服务器无更多内容可返回
+                total = self._total_size(response, offset) if "Content-Range" in response.headers else offset
+            elif response.status_code == 206 and offset:
+                total = self._total_size(response, offset)
+                self._write(response, part_path, "ab")
+            else:
+                response.raise_for_status()
+                if offset:
+                    logger.info(f"{url} 不支持断点续传或内容已变化，重新下载")
+                total = self._total_size(response, 0)
+                meta = {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+                with open(meta_path, "w", encoding="utf-8") as f:
+                    json.dump(meta, f)
+                self._write(response, part_path, "wb")
+
+        size = os.path.getsize(part_path)
+        if total is not None and size < total:
+            # 连接提前关闭，保留已下载部分，下次从断点继续
+            raise PDFDownloadError(f"{url} 下载不完整: {size}/{total} 字节")
+        sha256 = self._file_sha256(part_path)
+        try:
+            self._verify(url, part_path, size, sha256, total, expected_size, expected_sha256)
+        except PDFDownloadError:
+            self._discard(part_path, meta_path)
+            raise
+
+        target = self.object_path(sha256)
+        if os.path.exists(target):
+            logger.info(f"{url} 与已有PDF内容相同，不重复保存")
+            self._discard(part_path, meta_path)
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(part_path, target)
+            self._discard(meta_path)
+
+        logger.info(f"PDF下载完成: {url} ({size / 1024 / 1024:.1f}MB)")
+        return sha256, size
+
+    def _write(self, response, part_path, mode):
+        """分块写盘；中断时保留已写入的部分以便续传"""
+        with open(part_path, mode) as f:
+            for chunk in response.iter_content(chunk_size=self.chunk_size):
+                if chunk:
+                    f.write(chunk)
+
+    @staticmethod
+    def _total_size(response, offset):
+        """从 Content-Range 或 Content-Length 推算文件总大小，未知时返回 None"""
+        content_range = response.headers.get("Content-Range", "")
+        if "/" in content_range and not content_range.endswith("/*"):
+            return int(content_range.rsplit("/", 1)[1])
+        length = response.headers.get("Content-Length")
+        # 带压缩传输时 Content-Length 不是文件大小
+        if length and not response.headers.get("Content-Encoding"):
+            return offset + int(length)
+        return None
+
+    def _file_sha256(self, path):
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _verify(url, path, size, sha256, total, expected_size, expected_sha256):
+        """校验文件大小、校验和以及PDF文件头"""
+        if total is not None and size != total:
+            raise PDFDownloadError(f"{url} 大小不一致: 期望 {total} 字节，实际 {size} 字节")
+        if expected_size is not None and size != expected_size:
+            raise PDFDownloadError(f"{url} 大小不一致: 期望 {expected_size} 字节，实际 {size} 字节")
+        if expected_sha256 and sha256 != expected_sha256.lower():
+            raise PDFDownloadError(f"{url} 校验和不一致")
+        with open(path, "rb") as f:
+            if not f.read(5).startswith(b"%PDF"):
+                raise PDFDownloadError(f"{url} 不是PDF文件")
+
+    @staticmethod
+    def _discard(*paths):
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def download_all(self, urls):
+        """
+        并发下载多个PDF，并发数为 max_concurrent
+
+        Returns:
+            {url: 下载结果}，下载失败的URL不在结果中
+        """
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_concurrent) as executor:
+            futures = {url: executor.submit(self.download, url) for url in dict.fromkeys(urls)}
+            for url, future in futures.items():
+                try:
+                    results[url] = future.result()
+                except Exception as e:
+                    logger.error(f"下载PDF {url} 失败: {e}")
+        return results
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+研报PDF提取模块
+在独立的进程池中提取PDF文本和表格，经有界队列送入，结果按文档哈希缓存
+"""
+
+import os
+import json
+import queue
+import logging
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# 提取结果格式变化时递增，使旧缓存失效
+EXTRACTION_VERSION = 1
+
+_STOP = object()
+
+def extract_document(path):
+    """
+    提取单个PDF的文本和表格（在子进程中运行）
+
+    Returns:
+        {"pages": 页数, "text": 全文, "tables": [[[单元格, ...], ...], ...]}
+    """
+    import pdfplumber
+
+    texts = []
+    tables = []
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            texts.append(page.extract_text() or "")
+            for table in page.extract_tables():
+                rows = [[cell or "" for cell in row] for row in table]
+                tables.append(rows)
+                # 表格内容也并入正文，指标常出现在表格中
+                texts.extend(" ".join(row) for row in rows)
+        page_count = len(pdf.pages)
+
+    return {"pages": page_count, "text": "\n".join(texts), "tables": tables}
+
+class PDFExtractionStage:
+    """
+    PDF提取阶段
+
+    submit() 把文档放入有界队列，队列满时阻塞调用方，避免下载速度快于提取时
+    待处理文档无限堆积；调度线程从队列取出文档交给进程池，CPU密集的解析不占用爬虫线程。
+    提取结果按文档的 SHA-256 保存在磁盘上，内容未变化的PDF再次运行时直接读取缓存。
+    """
+
+    def __init__(self, max_workers=None, queue_size=None, cache_dir=None, extractor=extract_document):
+        self.max_workers = max(1, max_workers or Config.CRAWLER_SETTINGS.get("pdf_extraction_workers", 2))
+        self.cache_dir = cache_dir or Config.STORAGE_CONFIG.get("pdf_extraction_cache_dir", os.path.join("cache", "pdf_text"))
+        self.extractor = extractor
+
+        self._queue = queue.Queue(maxsize=queue_size or self.max_workers * 2)
+        # 已提交给进程池但未完成的任务数不超过 max_workers，其余留在有界队列中
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        self._executor = None
+        self._dispatcher = None
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _cache_path(self, sha256):
+        return os.path.join(self.cache_dir, sha256[:2], f"{sha256}.json")
+
+    def load_cached(self, sha256):
+        """读取缓存的提取结果，没有或版本不符时返回 None"""
+        path = self._cache_path(sha256)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry["result"] if entry.get("version") == EXTRACTION_VERSION else None
+
+    def _store(self, sha256, result):
+        path = self._cache_path(sha256)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": EXTRACTION_VERSION, "result": result}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _start(self):
+        """首次提交时启动进程池和调度线程"""
+        if self._dispatcher is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            self._dispatcher = threading.Thread(target=self._dispatch, name="pdf-extraction", daemon=True)
+            self._dispatcher.start()
+
+    def submit(self, sha256, path):
+        """
+        提交文档，返回 concurrent.futures.Future
+
+        缓存命中时返回已完成的 Future；同一文档正在提取时返回同一个 Future。
+        """
+        cached = self.load_cached(sha256)
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return future
+
+        with self._lock:
+            if sha256 in self._pending:
+                return self._pending[sha256]
+            future = Future()
+            self._pending[sha256] = future
+            self._start()
+
+        self._queue.put((sha256, path, future))
+        return future
+
+    def extract(self, sha256, path):
+        """提交文档并等待提取结果"""
+        return self.submit(sha256, path).result()
+
+    def _dispatch(self):
+        """调度线程：从有界队列取出文档交给进程池"""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            sha256, path, future = item
+            self._slots.acquire()
+            try:
+                task = self._executor.submit(self.extractor, path)
+            except Exception as e:
+                self._slots.release()
+                self._finish(sha256, future, error=e)
+                continue
+            task.add_done_callback(lambda task, sha256=sha256, future=future: self._on_done(sha256, future, task))
+
+    def _on_done(self, sha256, future, task):
+        self._slots.release()
+        error = task.exception()
+        if error is not None:
+            logger.error(f"PDF提取失败 {sha256[:12]}: {error}")
+            self._finish(sha256, future, error=error)
+            return
+        result = task.result()
+        try:
+            self._store(sha256, result)
+        except OSError as e:
+            logger.warning(f"保存PDF提取缓存失败: {e}")
+        self._finish(sha256, future, result=result)
+
+    def _finish(self, sha256, future, result=None, error=None):
+        with self._lock:
+            self._pending.pop(sha256, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def close(self):
+        """等待队列中的文档提取完成并关闭进程池"""
+        if self._dispatcher is None:
+            return
+        self._queue.put(_STOP)
+        self._dispatcher.join()
+        self._executor.shutdown(wait=True)
+        self._dispatcher = None
+        self._executor = None
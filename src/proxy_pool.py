@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+代理池模块
+按延迟、成功率和封禁信号为每个代理打分，优先使用最快的健康代理并自动隔离异常代理
+"""
+
+import time
+import random
+import logging
+import threading
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# 视为被目标站点限流或封禁的状态码
+BAN_STATUS_CODES = (403, 429)
+
+class ProxyUnavailableError(Exception):
+    """没有可用的健康代理"""
+
+class ProxyStats:
+    """单个代理的健康统计"""
+
+    def __init__(self, url):
+        self.url = url
+        self.latency = None          # 延迟的指数移动平均（秒）
+        self.success_rate = 1.0      # 成功率的指数移动平均
+        self.requests = 0
+        self.failures = 0
+        self.bans = 0
+        self.consecutive_failures = 0
+        self.quarantined_until = 0.0
+
+    def score(self):
+        """综合得分，越小越好：延迟按成功率放大"""
+        latency = self.latency if self.latency is not None else 1.0
+        return latency / max(self.success_rate, 0.05)
+
+class ProxyPool:
+    """
+    代理池
+
+    每次从健康代理中随机抽取两个，选择得分较好的一个（two-choices），
+    既偏向快速代理，又避免所有请求集中到同一出口。
+    连续失败或收到封禁信号的代理会被隔离一段时间，多次封禁时隔离时间加倍。
+    """
+
+    def __init__(self, proxies, failure_threshold=3, quarantine_seconds=300,
+                 max_quarantine_seconds=3600, smoothing=0.3, clock=time.monotonic):
+        self.stats = {url: ProxyStats(url) for url in proxies}
+        self.failure_threshold = failure_threshold
+        self.quarantine_seconds = quarantine_seconds
+        self.max_quarantine_seconds = max_quarantine_seconds
+        self.smoothing = smoothing
+        self.clock = clock
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings=None):
+        """根据 CRAWLER_SETTINGS 创建代理池，未启用时返回 None"""
+        settings = settings if settings is not None else Config.CRAWLER_SETTINGS
+        if not settings.get("proxy_enabled") or not settings.get("proxy_list"):
+            return None
+        return cls(
+            settings["proxy_list"],
+            failure_threshold=settings.get("proxy_failure_threshold", 3),
+            quarantine_seconds=settings.get("proxy_quarantine_seconds", 300)
+        )
+
+    def healthy(self):
+        """当前未被隔离的代理"""
+        now = self.clock()
+        return [s for s in self.stats.values() if s.quarantined_until <= now]
+
+    def acquire(self):
+        """选择一个代理地址"""
+        with self._lock:
+            candidates = self.healthy()
+            if not candidates:
+                raise ProxyUnavailableError("所有代理均处于隔离状态")
+            if len(candidates) == 1:
+                return candidates[0].url
+            first, second = random.sample(candidates, 2)
+            return min(first, second, key=ProxyStats.score).url
+
+    def _update(self, stats, success, latency=None):
+        """更新移动平均"""
+        alpha = self.smoothing
+        stats.requests += 1
+        stats.success_rate = (1 - alpha) * stats.success_rate + alpha * (1.0 if success else 0.0)
+        if latency is not None:
+            stats.latency = latency if stats.latency is None else (1 - alpha) * stats.latency + alpha * latency
+
+    def _quarantine(self, stats, seconds, reason):
+        """隔离代理"""
+        stats.quarantined_until = self.clock() + seconds
+        logger.warning(f"代理 {stats.url} 已隔离 {seconds:.0f} 秒: {reason}")
+
+    def report_success(self, proxy, latency):
+        """记录一次成功请求"""
+        with self._lock:
+            stats = self.stats[proxy]
+            self._update(stats, True, latency)
+            stats.consecutive_failures = 0
+
+    def report_failure(self, proxy, latency=None):
+        """记录一次失败请求（连接错误、超时等）"""
+        with self._lock:
+            stats = self.stats[proxy]
+            self._update(stats, False, latency)
+            stats.failures += 1
+            stats.consecutive_failures += 1
+            if stats.consecutive_failures >= self.failure_threshold:
+                stats.consecutive_failures = 0
+                self._quarantine(stats, self.quarantine_seconds, "连续失败")
+
+    def report_ban(self, proxy, latency=None):
+        """记录一次封禁信号，立即隔离代理"""
+        with self._lock:
+            stats = self.stats[proxy]
+            self._update(stats, False, latency)
+            stats.bans += 1
+            seconds = min(self.max_quarantine_seconds, self.quarantine_seconds * (2 ** (stats.bans - 1)))
+            self._quarantine(stats, seconds, "目标站点限流或封禁")
+
+    def snapshot(self):
+        """代理健康状况摘要"""
+        now = self.clock()
+        return [
+            {
+                "proxy": s.url,
+                "latency": s.latency,
+                "success_rate": round(s.success_rate, 3),
+                "requests": s.requests,
+                "bans": s.bans,
+                "quarantined": s.quarantined_until > now
+            }
+            for s in self.stats.values()
+        ]
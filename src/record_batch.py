@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+列式记录批次模块
+爬虫按列追加记录，数值列存为紧凑数组，行业、企业等重复取值多的列按字典编码，
+所有下游环节共用同一次转换得到的 DataFrame
+"""
+
+import math
+from array import array
+
+# 取值重复多的列按字典编码存储；更新时间通常整批相同，只保存一份
+CATEGORICAL_COLUMNS = ('行业名称', '企业名称', '数据来源', '更新时间')
+
+# 缺失值标记（对象列）
+_MISSING = object()
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+class _NumericColumn:
+    """float64 数组，缺失值为 NaN"""
+
+    def __init__(self, size=0):
+        self.values = array('d', [math.nan]) * size
+
+    def append(self, value):
+        self.values.append(math.nan if value is None else value)
+
+    def accepts(self, value):
+        return _is_number(value)
+
+    def pad(self, size):
+        if len(self.values) < size:
+            self.values.extend(array('d', [math.nan]) * (size - len(self.values)))
+
+    def get(self, i):
+        value = self.values[i]
+        return _MISSING if math.isnan(value) else value
+
+    def to_pandas(self):
+        import numpy as np
+        # 直接引用数组内存，不复制
+        return np.frombuffer(self.values, dtype=np.float64)
+
+class _CategoricalColumn:
+    """字典编码列：每行只存一个 int32 编码，缺失值编码为 -1"""
+
+    def __init__(self, size=0):
+        self.categories = []
+        self.index = {}
+        self.codes = array('i', [-1]) * size
+
+    def append(self, value):
+        if value is None:
+            self.codes.append(-1)
+            return
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.categories)
+            self.categories.append(value)
+        self.codes.append(code)
+
+    def accepts(self, value):
+        return isinstance(value, str)
+
+    def pad(self, size):
+        if len(self.codes) < size:
+            self.codes.extend(array('i', [-1]) * (size - len(self.codes)))
+
+    def get(self, i):
+        code = self.codes[i]
+        return _MISSING if code < 0 else self.categories[code]
+
+    def to_pandas(self):
+        import numpy as np
+        import pandas as pd
+        return pd.Categorical.from_codes(np.frombuffer(self.codes, dtype=np.int32), categories=self.categories)
+
+class _ObjectColumn:
+    """其他列：Python 对象列表"""
+
+    def __init__(self, size=0, values=None):
+        self.values = values if values is not None else [_MISSING] * size
+
+    def append(self, value):
+        self.values.append(value)
+
+    def accepts(self, value):
+        return True
+
+    def pad(self, size):
+        if len(self.values) < size:
+            self.values.extend([_MISSING] * (size - len(self.values)))
+
+    def get(self, i):
+        return self.values[i]
+
+    def to_pandas(self):
+        return [None if value is _MISSING else value for value in self.values]
+
+class RecordBatch:
+    """
+    列式记录批次
+
+    接口与记录列表兼容（len、迭代、下标访问得到字典），爬虫逐条或整批追加记录。
+    列类型按首个非空值确定：数值列存为 float64 数组，CATEGORICAL_COLUMNS 中的列按字典编码，
+    其余列为对象列表；出现与列类型不符的值时整列改为对象列。
+    to_dataframe() 直接引用数值列内存，结果会被缓存，之后批次变为只读。
+    """
+
+    def __init__(self, records=None):
+        self.columns = {}
+        self._size = 0
+        self._frame = None
+        if records is not None:
+            self.extend(records)
+
+    @classmethod
+    def from_dataframe(cls, frame):
+        """
+        由 DataFrame 按列构建批次，不经过逐行的字典
+
+        数值列复制为 float64 数组，分类列和 CATEGORICAL_COLUMNS 中的字符串列保留或生成字典编码，
+        其余列为对象列表；缺失值与逐条追加时相同。
+        """
+        import numpy as np
+        import pandas as pd
+
+        batch = cls()
+        batch._size = len(frame)
+        for name in frame.columns:
+            series = frame[name]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                codes, categories = series.cat.codes.to_numpy(), list(series.cat.categories)
+            elif name in CATEGORICAL_COLUMNS and pd.api.types.is_string_dtype(series.dtype):
+                codes, categories = pd.factorize(series)
+                categories = list(categories)
+            else:
+                codes = None
+
+            if codes is not None:
+                column = _CategoricalColumn()
+                column.codes.frombytes(np.asarray(codes, dtype=np.int32).tobytes())
+                column.categories = categories
+                column.index = {value: code for code, value in enumerate(categories)}
+            elif pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+                column = _NumericColumn()
+                column.values.frombytes(series.to_numpy(dtype=np.float64, na_value=np.nan).tobytes())
+            else:
+                column = _ObjectColumn(values=[_MISSING if _is_missing(value) else value for value in series.tolist()])
+            batch.columns[name] = column
+        return batch
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self._row(i)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("RecordBatch 下标越界")
+        return self._row(index)
+
+    def _row(self, i):
+        row = {}
+        for name, column in self.columns.items():
+            value = column.get(i)
+            if value is not _MISSING:
+                row[name] = value
+        return row
+
+    def _new_column(self, name, value):
+        if name in CATEGORICAL_COLUMNS and isinstance(value, str):
+            return _CategoricalColumn(self._size)
+        if _is_number(value):
+            return _NumericColumn(self._size)
+        return _ObjectColumn(self._size)
+
+    def append(self, record):
+        """追加一条记录（字典）；缺少的列记为缺失值"""
+        if self._frame is not None:
+            raise ValueError("RecordBatch 已转换为 DataFrame，不能再追加记录")
+
+        for name, value in record.items():
+            column = self.columns.get(name)
+            if column is None:
+                if value is None:
+                    continue
+                column = self.columns[name] = self._new_column(name, value)
+            elif value is not None and not column.accepts(value):
+                column = self.columns[name] = _ObjectColumn(
+                    values=[column.get(i) for i in range(self._size)]
+                )
+            column.append(value)
+
+        self._size += 1
+        for column in self.columns.values():
+            column.pad(self._size)
+
+    def extend(self, records):
+        """追加多条记录（记录列表或另一个 RecordBatch）"""
+        for record in records:
+            self.append(record)
+
+    def to_records(self):
+        """转换为记录列表"""
+        return list(self)
+
+    def to_dataframe(self):
+        """转换为 DataFrame（结果缓存，列顺序为首次出现的顺序）"""
+        if self._frame is None:
+            import pandas as pd
+            self._frame = pd.DataFrame(
+                {name: column.to_pandas() for name, column in self.columns.items()},
+                index=pd.RangeIndex(self._size), copy=False
+            )
+        return self._frame
+
+def as_dataframe(data):
+    """RecordBatch、记录列表或 DataFrame 统一转换为 DataFrame"""
+    import pandas as pd
+
+    if isinstance(data, RecordBatch):
+        return data.to_dataframe()
+    if isinstance(data, pd.DataFrame):
+        return data
+    return pd.DataFrame(data)
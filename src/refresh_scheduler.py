@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+刷新调度模块
+按 (行业, 数据源) 跟踪数据新鲜度和变化程度，变化快的更频繁刷新，并受全局请求预算限制
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# 计算变化程度时忽略的字段（每次抓取都会变化）
+VOLATILE_FIELDS = ("更新时间",)
+
+def record_fingerprints(records):
+    """每条记录的内容指纹集合"""
+    fingerprints = set()
+    for record in records:
+        content = {k: v for k, v in record.items() if k not in VOLATILE_FIELDS}
+        fingerprints.add(hashlib.sha1(json.dumps(content, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest())
+    return fingerprints
+
+def change_ratio(old, new):
+    """两次抓取之间变化的记录比例（0 表示完全相同，1 表示完全不同）"""
+    union = old | new
+    if not union:
+        return 0.0
+    return 1 - len(old & new) / len(union)
+
+class RefreshScheduler:
+    """
+    刷新调度器
+
+    每个 (行业, 数据源) 维护变化程度的指数加权平均 volatility，刷新间隔在
+    min_interval 和 max_interval 之间随 volatility 调整：数据经常变化的间隔缩短，
+    长期不变的间隔拉长。每轮按过期程度排序，只刷新全局预算允许的数量。
+    抓取失败的单元记录 retry_at，从 retry_delay 开始按指数退避（不超过 max_interval），
+    退避期内不参与调度，避免持续失败的单元耗尽预算；成功刷新后清除。
+    状态保存在 JSON 文件中，进程重启后继续沿用。
+    """
+
+    def __init__(self, crawler, industries=None, state_path=None, budget_per_hour=None,
+                 min_interval=None, max_interval=None, retry_delay=None, smoothing=0.3, clock=time.time, sleep=time.sleep):
+        settings = Config.CRAWLER_SETTINGS
+        self.crawler = crawler
+        self.industries = industries or crawler.emerging_industries
+        self.state_path = state_path or Config.STORAGE_CONFIG.get(
+            "refresh_state_path", os.path.join("output", "refresh_state.json")
+        )
+        self.budget_per_hour = budget_per_hour or settings.get("refresh_budget_per_hour", 60)
+        self.min_interval = min_interval or settings.get("refresh_min_interval", 1800)
+        self.max_interval = max_interval or settings.get("refresh_max_interval", 86400)
+        self.retry_delay = retry_delay or settings.get("refresh_retry_delay", 300)
+        self.smoothing = smoothing
+        self.clock = clock
+        self.sleep = sleep
+
+        self.fetchers = dict(crawler.crawl_units())
+        self.state = self._load_state()
+
+        # 全局预算令牌桶，容量为一小时的预算
+        self.tokens = float(self.budget_per_hour)
+        self.tokens_updated = clock()
+
+    def _load_state(self):
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"刷新状态文件损坏，将重新开始: {e}")
+            return {}
+
+    def save_state(self):
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
+
+    @staticmethod
+    def _key(industry, source_name):
+        return f"{industry}/{source_name}"
+
+    def interval_for(self, volatility):
+        """volatility 对应的刷新间隔（秒）"""
+        stability = 1 - volatility
+        return self.min_interval + (self.max_interval - self.min_interval) * stability * stability
+
+    def retry_backoff(self, failures):
+        """连续失败 failures 次后的重试等待秒数"""
+        return min(self.max_interval, self.retry_delay * 2 ** (failures - 1))
+
+    def due(self, now=None):
+        """
+        需要刷新的 (行业, 数据源)，按过期程度降序，跳过失败退避中的单元
+
+        Returns:
+            [(过期程度, 行业, 数据源), ...]；从未刷新过的过期程度为无穷大
+        """
+        now = self.clock() if now is None else now
+        pending = []
+        for industry in self.industries:
+            for source_name in self.fetchers:
+                entry = self.state.get(self._key(industry, source_name))
+                if entry is not None and now < entry.get("retry_at", now):
+                    continue
+                if entry is None or "refreshed_at" not in entry:
+                    pending.append((float("inf"), industry, source_name))
+                    continue
+                staleness = (now - entry["refreshed_at"]) / entry["interval"]
+                if staleness >= 1:
+                    pending.append((staleness, industry, source_name))
+        pending.sort(key=lambda item: item[0], reverse=True)
+        return pending
+
+    def _refill(self):
+        now = self.clock()
+        rate = self.budget_per_hour / 3600
+        self.tokens = min(self.budget_per_hour, self.tokens + (now - self.tokens_updated) * rate)
+        self.tokens_updated = now
+
+    def refresh(self, industry, source_name):
+        """刷新一个 (行业, 数据源)，返回变化比例；抓取失败时返回 None"""
+        records, done = self.crawler._crawl_unit(source_name, self.fetchers[source_name], industry)
+        key = self._key(industry, source_name)
+        entry = self.state.get(key)
+        if not done:
+            # 保留上次成功的数据，只记录退避信息
+            entry = self.state.setdefault(key, {})
+            entry["failures"] = entry.get("failures", 0) + 1
+            backoff = self.retry_backoff(entry["failures"])
+            entry["retry_at"] = self.clock() + backoff
+            logger.warning(f"刷新 {industry} / {source_name} 失败（连续 {entry['failures']} 次），{backoff / 60:.0f} 分钟后重试")
+            return None
+
+        fingerprints = record_fingerprints(records)
+        if entry is None or "refreshed_at" not in entry:
+            # 首次刷新视为全部变化，初始 volatility 取中间值
+            ratio = 1.0
+            volatility = 0.5
+        else:
+            ratio = change_ratio(set(entry["fingerprints"]), fingerprints)
+            volatility = self.smoothing * ratio + (1 - self.smoothing) * entry["volatility"]
+
+        interval = self.interval_for(volatility)
+        self.state[key] = {
+            "refreshed_at": self.clock(),
+            "volatility": round(volatility, 4),
+            "interval": round(interval, 1),
+            "fingerprints": sorted(fingerprints),
+            "records": records
+        }
+        logger.info(f"刷新 {industry} / {source_name}：变化 {ratio:.0%}，下次间隔 {interval / 3600:.1f} 小时")
+        return ratio
+
+    def run_once(self):
+        """
+        执行一轮调度，刷新预算允许数量的过期单元
+
+        Returns:
+            [(行业, 数据源, 变化比例), ...]
+        """
+        self._refill()
+        refreshed = []
+        attempted = False
+        for _, industry, source_name in self.due():
+            if self.tokens < 1:
+                logger.info("已达到请求预算，剩余单元留待下一轮")
+                break
+            self.tokens -= 1
+            attempted = True
+            ratio = self.refresh(industry, source_name)
+            if ratio is not None:
+                refreshed.append((industry, source_name, ratio))
+        if attempted:
+            self.save_state()
+        return refreshed
+
+    def next_wakeup(self):
+        """距离下一个单元过期的秒数"""
+        now = self.clock()
+        waits = []
+        for industry in self.industries:
+            for source_name in self.fetchers:
+                entry = self.state.get(self._key(industry, source_name))
+                if entry is None:
+                    return 0
+                if "retry_at" in entry:
+                    waits.append(entry["retry_at"] - now)
+                else:
+                    waits.append(entry["refreshed_at"] + entry["interval"] - now)
+        return max(0, min(waits)) if waits else 0
+
+    def snapshot(self):
+        """
+        当前各行业的最新数据
+
+        与单次爬取一致：某个行业所有数据源都没有数据时使用模拟数据。
+        """
+        data = []
+        for industry in self.industries:
+            records = []
+            for source_name in self.fetchers:
+                entry = self.state.get(self._key(industry, source_name))
+                if entry is not None:
+                    records.extend(entry.get("records", []))
+            if not records:
+                records = [item for item in self.crawler.sample_data if item['行业名称'] == industry]
+            data.extend(records)
+        return data
+
+    def run_forever(self, on_refresh=None, max_sleep=300):
+        """
+        持续调度，直到进程被中断
+
+        Args:
+            on_refresh: 每轮有数据变化时调用 on_refresh(snapshot)
+            max_sleep: 单次休眠上限（秒），预算耗尽时也按此间隔重新检查
+        """
+        while True:
+            refreshed = self.run_once()
+            if on_refresh is not None and any(ratio > 0 for _, _, ratio in refreshed):
+                on_refresh(self.snapshot())
+            wait = self.next_wakeup()
+            if self.tokens < 1:
+                wait = max(wait, (1 - self.tokens) * 3600 / self.budget_per_hour)
+            self.sleep(min(max_sleep, max(1, wait)))
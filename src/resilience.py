@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+容错模块
+提供带抖动的指数退避重试和按数据源的熔断器
+"""
+
+import time
+import random
+import threading
+import logging
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class CircuitOpenError(Exception):
+    """数据源熔断期间拒绝请求"""
+
+class CircuitBreaker:
+    """
+    熔断器
+
+    连续失败达到阈值后进入打开状态，冷却期内直接拒绝请求；
+    冷却期结束后放行一次试探请求，成功则恢复，失败则重新打开。
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, cooldown=300, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        """判断当前是否允许发送请求"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.cooldown:
+                # 冷却结束，只放行一次试探请求
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def remaining_cooldown(self):
+        """距离冷却结束的秒数"""
+        if self.state != self.OPEN:
+            return 0
+        return max(0, self.cooldown - (self.clock() - self.opened_at))
+
+    def record_success(self):
+        """记录一次成功请求"""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        """记录一次失败请求"""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+class RetryPolicy:
+    """带抖动的指数退避重试策略"""
+
+    def __init__(self, max_retries=3, retry_delay=5, max_delay=60):
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt):
+        """第 attempt 次重试前的等待秒数（从0开始计数）"""
+        delay = min(self.max_delay, self.retry_delay * (2 ** attempt))
+        # 在 [delay/2, delay] 之间抖动，避免多个任务同时重试
+        return random.uniform(delay / 2, delay)
+
+class SourceGuard:
+    """
+    按数据源的容错执行器
+
+    每个数据源独立维护一个熔断器，请求失败时按 RetryPolicy 重试，
+    熔断打开后立即抛出 CircuitOpenError，而不是每个行业都等待一次超时。
+    """
+
+    def __init__(self, settings=None, sleep=time.sleep, clock=time.monotonic):
+        settings = settings if settings is not None else Config.CRAWLER_SETTINGS
+
+        self.retry_policy = RetryPolicy(
+            max_retries=settings.get("max_retries", 3),
+            retry_delay=settings.get("retry_delay", 5),
+            max_delay=settings.get("retry_max_delay", 60)
+        )
+        self.failure_threshold = settings.get("circuit_breaker_threshold", 5)
+        self.cooldown = settings.get("circuit_breaker_cooldown", 300)
+        self.sleep = sleep
+        self.clock = clock
+
+        self.breakers = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, source_name):
+        """获取数据源对应的熔断器"""
+        with self._lock:
+            if source_name not in self.breakers:
+                self.breakers[source_name] = CircuitBreaker(self.failure_threshold, self.cooldown, self.clock)
+            return self.breakers[source_name]
+
+    def _before_attempt(self, source_name, breaker):
+        """发送请求前检查熔断状态"""
+        if not breaker.allow_request():
+            raise CircuitOpenError(f"{source_name} 已熔断，{breaker.remaining_cooldown():.0f} 秒后重试")
+
+    def _after_failure(self, source_name, breaker, attempt, error):
+        """记录失败，返回重试前需要等待的秒数；不再重试时返回 None"""
+        breaker.record_failure()
+        if attempt >= self.retry_policy.max_retries or breaker.state == CircuitBreaker.OPEN:
+            return None
+        delay = self.retry_policy.backoff(attempt)
+        logger.warning(f"{source_name} 请求失败: {error}，{delay:.1f} 秒后第 {attempt + 1} 次重试")
+        return delay
+
+    def call(self, source_name, func, *args, **kwargs):
+        """在重试和熔断保护下调用 func"""
+        breaker = self.breaker(source_name)
+        attempt = 0
+        while True:
+            self._before_attempt(source_name, breaker)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                delay = self._after_failure(source_name, breaker, attempt, e)
+                if delay is None:
+                    raise
+                self.sleep(delay)
+                attempt += 1
+                continue
+            breaker.record_success()
+            return result
+
+    async def call_async(self, source_name, func, *args, **kwargs):
+        """在重试和熔断保护下等待协程函数 func"""
+        import asyncio
+
+        breaker = self.breaker(source_name)
+        attempt = 0
+        while True:
+            self._before_attempt(source_name, breaker)
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                delay = self._after_failure(source_name, breaker, attempt, e)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            breaker.record_success()
+            return result
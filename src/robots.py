@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+robots.txt 模块
+每个主机只抓取一次 robots.txt，磁盘缓存并在内存中回答允许/禁止和 Crawl-delay 查询
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from urllib.parse import urlparse
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class RobotsCache:
+    """
+    robots.txt 缓存
+
+    规则按主机保存在内存中，同时写入 cache_dir 供后续运行复用，超过 ttl 后重新抓取。
+    抓取失败时按惯例处理：4xx 视为全部允许，401/403 视为全部禁止；
+    5xx 和网络错误视为暂时无法获取（unavailable），期间禁止抓取，结果不写入磁盘，error_ttl 秒后重试。
+    """
+
+    def __init__(self, session=None, cache_dir=None, ttl=None, error_ttl=300, user_agent="*", clock=time.time):
+        storage = Config.STORAGE_CONFIG
+        self.session = session
+        self.cache_dir = cache_dir or storage.get("robots_cache_dir", os.path.join("cache", "robots"))
+        self.ttl = ttl if ttl is not None else storage.get("robots_cache_ttl", 86400)
+        self.error_ttl = error_ttl
+        self.user_agent = user_agent
+        self.clock = clock
+
+        self._parsers = {}
+        self._lock = threading.Lock()
+        self._host_locks = {}
+
+    def _cache_path(self, origin):
+        """主机规则在磁盘上的路径"""
+        name = hashlib.sha1(origin.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.json")
+
+    def _build_parser(self, entry):
+        """根据缓存条目构建解析器"""
+        from urllib.robotparser import RobotFileParser
+
+        parser = RobotFileParser()
+        if entry["status"] in (401, 403) or entry["status"] is None:
+            parser.disallow_all = True
+        elif entry["status"] >= 400:
+            parser.allow_all = True
+        else:
+            parser.parse(entry["content"].splitlines())
+        parser.modified()
+        parser.unavailable = entry["status"] is None
+        ttl = self.error_ttl if entry["status"] is None else self.ttl
+        parser.expires_at = entry["fetched_at"] + ttl
+        return parser
+
+    def _load_from_disk(self, origin):
+        """读取磁盘缓存，过期或不存在时返回 None"""
+        try:
+            with open(self._cache_path(origin), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if self.clock() - entry["fetched_at"] >= self.ttl:
+            return None
+        return entry
+
+    def _fetch(self, origin):
+        """抓取 robots.txt 并写入磁盘缓存"""
+        if self.session is None:
+            from session_factory import get_shared_session
+            self.session = get_shared_session()
+
+        url = f"{origin}/robots.txt"
+        try:
+            response = self.session.get(url)
+            if response.status_code >= 500:
+                raise IOError(f"HTTP {response.status_code}")
+            entry = {"status": response.status_code, "content": response.text}
+        except Exception as e:
+            logger.warning(f"获取 {url} 失败: {e}")
+            return {"status": None, "content": "", "fetched_at": self.clock()}
+        entry["fetched_at"] = self.clock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self._cache_path(origin)}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, self._cache_path(origin))
+        return entry
+
+    def _parser_for(self, url):
+        """获取URL所在主机的解析器，必要时加载或抓取规则"""
+        parsed = urlparse(url if "://" in url else f"http://{url}")
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+
+        parser = self._parsers.get(origin)
+        if parser is not None and self.clock() < parser.expires_at:
+            return parser
+
+        # 同一主机只允许一个线程抓取规则
+        with self._lock:
+            host_lock = self._host_locks.setdefault(origin, threading.Lock())
+        with host_lock:
+            parser = self._parsers.get(origin)
+            if parser is not None and self.clock() < parser.expires_at:
+                return parser
+            entry = self._load_from_disk(origin) or self._fetch(origin)
+            parser = self._build_parser(entry)
+            self._parsers[origin] = parser
+            return parser
+
+    def can_fetch(self, url):
+        """判断是否允许抓取URL"""
+        return self._parser_for(url).can_fetch(self.user_agent, url)
+
+    def unavailable(self, url):
+        """
+        URL所在主机的 robots.txt 是否暂时无法获取（5xx 或网络错误）
+
+        此时 can_fetch 返回 False 只是暂时的，调用方应稍后重试，而不是当作被禁止。
+        """
+        return self._parser_for(url).unavailable
+
+    def crawl_delay(self, url):
+        """获取主机要求的 Crawl-delay（秒），未声明时返回 None"""
+        delay = self._parser_for(url).crawl_delay(self.user_agent)
+        return float(delay) if delay is not None else None
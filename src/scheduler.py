@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+请求调度模块
+按主机维护令牌桶，只有再次访问同一主机时才需要等待
+"""
+
+import time
+import random
+import threading
+import logging
+from urllib.parse import urlparse
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class _HostBucket:
+    """单个主机的令牌桶"""
+
+    def __init__(self, delay_range, capacity, now, min_interval=0):
+        self.delay_range = delay_range
+        self.min_interval = min_interval
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = now
+        self.interval = self._next_interval()
+
+    def _next_interval(self):
+        """每个令牌的补充间隔，在 delay_range 内随机取值，且不小于 Crawl-delay"""
+        return max(self.min_interval, random.uniform(*self.delay_range))
+
+    def reserve(self, now):
+        """预约一个令牌，返回需要等待的秒数"""
+        # 按经过的时间补充令牌
+        if self.interval > 0:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) / self.interval)
+        else:
+            self.tokens = float(self.capacity)
+        self.updated = now
+
+        delay = 0.0 if self.tokens >= 1 else (1 - self.tokens) * self.interval
+        self.tokens -= 1
+        self.interval = self._next_interval()
+        return delay
+
+class PolitenessScheduler:
+    """
+    按主机的礼貌性调度器
+
+    每个主机一个令牌桶，补充间隔取自 Config.DATA_SOURCES 中对应数据源的 delay_range。
+    不同主机之间互不影响，等待时间只在连续访问同一主机时产生。
+    传入 robots 时，主机在 robots.txt 中声明的 Crawl-delay 作为最小间隔。
+    """
+
+    def __init__(self, data_sources=None, default_delay_range=(1, 3), capacity=1,
+                 robots=None, clock=time.monotonic, sleep=time.sleep):
+        self.data_sources = data_sources if data_sources is not None else Config.DATA_SOURCES
+        self.robots = robots
+        self.default_delay_range = default_delay_range
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+        # 主机名 -> delay_range
+        self._host_delays = {}
+        for config in self.data_sources.values():
+            host = urlparse(config["base_url"]).netloc
+            self._host_delays[host] = tuple(config.get("delay_range", default_delay_range))
+
+    def host_for(self, target):
+        """解析数据源名称或URL对应的主机名"""
+        if target in self.data_sources:
+            return urlparse(self.data_sources[target]["base_url"]).netloc
+        if "://" in target:
+            return urlparse(target).netloc
+        return target
+
+    def _min_interval(self, target):
+        """查询主机 robots.txt 中的 Crawl-delay"""
+        if self.robots is None:
+            return 0
+        url = self.data_sources[target]["base_url"] if target in self.data_sources else target
+        try:
+            return self.robots.crawl_delay(url) or 0
+        except Exception as e:
+            logger.warning(f"查询 {url} 的 Crawl-delay 失败: {e}")
+            return 0
+
+    def reserve(self, target):
+        """为目标主机预约一次请求，返回需要等待的秒数"""
+        host = self.host_for(target)
+
+        # 首次访问主机时在锁外查询 Crawl-delay，避免阻塞其他主机
+        min_interval = 0
+        if host not in self._buckets:
+            min_interval = self._min_interval(target)
+
+        with self._lock:
+            now = self.clock()
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                delay_range = self._host_delays.get(host, self.default_delay_range)
+                bucket = _HostBucket(delay_range, self.capacity, now, min_interval)
+                self._buckets[host] = bucket
+            return bucket.reserve(now)
+
+    def wait(self, target):
+        """阻塞等待，直到可以再次请求目标主机"""
+        delay = self.reserve(target)
+        if delay > 0:
+            logger.debug(f"主机 {self.host_for(target)} 限速，等待 {delay:.2f} 秒")
+            self.sleep(delay)
+        return delay
+
+    async def wait_async(self, target):
+        """异步等待，直到可以再次请求目标主机"""
+        import asyncio
+
+        delay = self.reserve(target)
+        if delay > 0:
+            logger.debug(f"主机 {self.host_for(target)} 限速，等待 {delay:.2f} 秒")
+            await asyncio.sleep(delay)
+        return delay
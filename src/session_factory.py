@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+会话工厂模块
+为每个数据源挂载独立的连接池和超时设置，并在进程内共享同一个会话
+"""
+
+import time
+import threading
+import logging
+
+from requests.adapters import HTTPAdapter
+
+from config import Config
+from http_cache import CachedSession
+from proxy_pool import ProxyPool, BAN_STATUS_CODES
+from ua_pool import random_user_agent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'zh-CN,zh;q=0.8,en-US;q=0.5,en;q=0.3',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+
+class SourceAdapter(HTTPAdapter):
+    """带默认超时的连接池适配器"""
+
+    def __init__(self, timeout=None, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        """未显式指定超时时使用数据源的超时设置"""
+        if timeout is None:
+            timeout = self.timeout
+        return super().send(request, timeout=timeout, **kwargs)
+
+class CrawlerSession(CachedSession):
+    """爬虫会话：在缓存之下轮换User-Agent，并按代理池轮换出口"""
+
+    def __init__(self, cache=None, proxy_pool=None, rotate_user_agent=False):
+        super().__init__(cache)
+        self.proxy_pool = proxy_pool
+        self.rotate_user_agent = rotate_user_agent
+
+    def send(self, request, **kwargs):
+        """实际发出请求时选择UA和代理，并把延迟和结果反馈给代理池"""
+        if self.rotate_user_agent:
+            request.headers['User-Agent'] = random_user_agent()
+
+        if self.proxy_pool is None:
+            return super().send(request, **kwargs)
+
+        proxy = self.proxy_pool.acquire()
+        kwargs["proxies"] = {"http": proxy, "https": proxy}
+        start = time.monotonic()
+        try:
+            response = super().send(request, **kwargs)
+        except Exception:
+            self.proxy_pool.report_failure(proxy, time.monotonic() - start)
+            raise
+
+        latency = time.monotonic() - start
+        if response.status_code in BAN_STATUS_CODES:
+            self.proxy_pool.report_ban(proxy, latency)
+        else:
+            self.proxy_pool.report_success(proxy, latency)
+        return response
+
+def create_session(data_sources=None, settings=None):
+    """
+    创建爬虫会话
+
+    每个数据源的 base_url 挂载一个独立适配器，连接池大小取 max_concurrent_requests，
+    超时取数据源自身的 timeout；其余URL使用全局的 request_timeout。
+    启用 user_agent_rotation 时每个请求更换UA；启用 proxy_enabled 时，
+    请求经由 proxy_list 组成的代理池发出。
+    """
+    data_sources = data_sources if data_sources is not None else Config.DATA_SOURCES
+    settings = settings if settings is not None else Config.CRAWLER_SETTINGS
+
+    pool_size = max(1, settings.get("max_concurrent_requests", 5))
+    default_timeout = settings.get("request_timeout", 30)
+
+    session = CrawlerSession(
+        proxy_pool=ProxyPool.from_settings(settings),
+        rotate_user_agent=settings.get("user_agent_rotation", False)
+    )
+    session.headers.update(DEFAULT_HEADERS)
+    session.headers['User-Agent'] = random_user_agent()
+
+    default_adapter = SourceAdapter(
+        timeout=default_timeout,
+        pool_connections=max(1, len(data_sources)),
+        pool_maxsize=pool_size
+    )
+    session.mount("http://", default_adapter)
+    session.mount("https://", default_adapter)
+
+    for name, config in data_sources.items():
+        adapter = SourceAdapter(
+            timeout=config.get("timeout", default_timeout),
+            pool_connections=1,
+            pool_maxsize=pool_size
+        )
+        session.mount(config["base_url"], adapter)
+
+    return session
+
+_shared_session = None
+_shared_lock = threading.Lock()
+
+def get_shared_session():
+    """获取进程内共享的爬虫会话，首次调用时创建"""
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = create_session()
+            logger.debug("已创建共享爬虫会话")
+        return _shared_session
+
+def close_shared_session():
+    """关闭共享会话，释放所有连接"""
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is not None:
+            _shared_session.close()
+            _shared_session = None
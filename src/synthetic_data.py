@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+合成数据模块
+用 NumPy 按列批量生成行业指标数据，分布与各爬虫的模拟数据一致，
+可指定随机种子复现，用于对下游环节做十万到千万行级别的压力测试
+"""
+
+from datetime import datetime
+
+# 基础版/简化版模拟数据：每家企业的指标独立均匀分布 (下限, 上限, 保留小数位)
+SAMPLE_RANGES = {
+    '行业渗透率(%)': (5, 35, 2),
+    '产能利用率(%)': (60, 95, 2),
+    '平均毛利率(%)': (15, 45, 2),
+    '市场规模(亿元)': (100, 2000, 0),
+    '年增长率(%)': (10, 50, 2),
+}
+
+# 增强版数据：先生成行业基准值 (下限, 上限, 公司偏移幅度, 保留小数位)，
+# 公司指标在基准值上加 ±偏移幅度 的均匀噪声并截断为非负；偏移幅度为 None 的指标全行业相同
+REALISTIC_RANGES = {
+    '行业渗透率(%)': (5, 40, 10, 2),
+    '产能利用率(%)': (65, 95, 15, 2),
+    '平均毛利率(%)': (20, 50, 8, 2),
+    '市场规模(亿元)': (200, 5000, None, 0),
+    '年增长率(%)': (15, 60, None, 2),
+}
+
+def sample_metrics(rng, size):
+    """size 家企业的基础版指标列 {列名: ndarray}"""
+    import numpy as np
+
+    return {
+        column: np.round(rng.uniform(low, high, size), decimals)
+        for column, (low, high, decimals) in SAMPLE_RANGES.items()
+    }
+
+def realistic_metrics(rng, counts):
+    """
+    增强版指标列
+
+    Args:
+        rng: numpy.random.Generator
+        counts: 每个行业的企业数
+
+    Returns:
+        {列名: ndarray}，按行业顺序排列
+    """
+    import numpy as np
+
+    counts = np.asarray(counts)
+    columns = {}
+    for column, (low, high, spread, decimals) in REALISTIC_RANGES.items():
+        base = rng.uniform(low, high, counts.size)
+        if spread is None:
+            values = np.repeat(np.round(base, decimals), counts)
+        else:
+            values = np.repeat(base, counts)
+            values = np.maximum(0, values + rng.uniform(-spread, spread, values.size))
+            values = np.round(values, decimals)
+        columns[column] = values
+    return columns
+
+def _categorical(labels, counts):
+    """每个标签按 counts 重复的分类列，不为每一行创建字符串"""
+    import numpy as np
+    import pandas as pd
+
+    codes = np.repeat(np.arange(len(labels)), counts)
+    return pd.Categorical.from_codes(codes, categories=list(labels))
+
+def _frame(columns, source, timestamp):
+    """组装 DataFrame；数据来源和更新时间全表相同，存为单一类别的分类列"""
+    import numpy as np
+    import pandas as pd
+
+    frame = pd.DataFrame(columns, copy=False)
+    codes = np.zeros(len(frame), dtype=np.int8)
+    timestamp = timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    frame['数据来源'] = pd.Categorical.from_codes(codes, categories=[source])
+    frame['更新时间'] = pd.Categorical.from_codes(codes, categories=[timestamp])
+    return frame
+
+def generate_sample_frame(industries, companies_per_industry=3, seed=None, timestamp=None):
+    """
+    生成与基础版爬虫 _generate_sample_data 结构相同的 DataFrame
+
+    企业名称为 "{行业}龙头企业{序号}"。
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    size = len(industries) * companies_per_industry
+    names = [f"{industry}龙头企业{i + 1}" for industry in industries for i in range(companies_per_industry)]
+    columns = {
+        '行业名称': _categorical(industries, companies_per_industry),
+        '企业名称': _categorical(names, 1),
+    }
+    columns.update(sample_metrics(rng, size))
+    return _frame(columns, '模拟数据', timestamp)
+
+def generate_realistic_frame(company_data, seed=None, timestamp=None):
+    """
+    生成与增强版爬虫 _generate_realistic_data 结构相同的 DataFrame
+
+    Args:
+        company_data: {行业: [{'name', 'code', 'market_cap', 'currency', 'main_products'}, ...]}
+
+    市值字符串右侧附带换算为人民币元的 市值(元) 列，计价货币取 currency，缺省时按股票代码判断。
+    """
+    import numpy as np
+    from market_cap import add_market_cap_column
+
+    rng = np.random.default_rng(seed)
+    industries = list(company_data)
+    counts = [len(company_data[industry]) for industry in industries]
+    companies = [company for industry in industries for company in company_data[industry]]
+    columns = {
+        '行业名称': _categorical(industries, counts),
+        '企业名称': [company['name'] for company in companies],
+        '股票代码': [company['code'] for company in companies],
+        '市值': [company['market_cap'] for company in companies],
+        '主要产品': [company['main_products'] for company in companies],
+    }
+    columns.update(realistic_metrics(rng, counts))
+    currencies = [company.get('currency') for company in companies]
+    return add_market_cap_column(_frame(columns, '多源数据整合', timestamp), currencies=currencies)
+
+def generate_synthetic(n_industries, n_companies, seed=None, profile="realistic", timestamp=None):
+    """
+    生成 n_industries × n_companies 行的压测数据
+
+    Args:
+        profile: "realistic" 使用增强版的行业基准加公司偏移分布，"sample" 使用基础版的独立均匀分布
+
+    Returns:
+        DataFrame；行业名称、企业名称、数据来源、更新时间为分类列
+    """
+    import numpy as np
+
+    if profile not in ("realistic", "sample"):
+        raise ValueError(f"未知的数据分布: {profile}")
+
+    rng = np.random.default_rng(seed)
+    industries = [f"行业{i + 1}" for i in range(n_industries)]
+    names = [f"行业{i + 1}企业{j + 1}" for i in range(n_industries) for j in range(n_companies)]
+    columns = {
+        '行业名称': _categorical(industries, n_companies),
+        '企业名称': _categorical(names, 1),
+    }
+    if profile == "realistic":
+        columns.update(realistic_metrics(rng, [n_companies] * n_industries))
+        source = '多源数据整合'
+    else:
+        columns.update(sample_metrics(rng, n_industries * n_companies))
+        source = '模拟数据'
+    return _frame(columns, source, timestamp)
+
+def to_records(frame):
+    """转换为爬虫返回的记录列表（字典值为 Python 原生类型）"""
+    return frame.to_dict('records')
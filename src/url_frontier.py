@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+URL队列模块
+研报链接的规范化、按主机的优先级队列，以及跨运行持久化的布隆过滤器去重和研报详情
+"""
+
+import os
+import json
+import math
+import heapq
+import struct
+import hashlib
+import logging
+import threading
+from collections import deque
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# 常见的跟踪参数，规范化时去除
+TRACKING_PARAMS = {
+    "spm", "from", "ref", "referer", "share", "share_from", "share_token",
+    "source", "src", "fr", "tj", "cre", "mod", "loc", "_t", "timestamp",
+    "wechat", "wx", "isappinstalled", "scene", "clicktime", "enterid",
+}
+
+def normalize_url(url, tracking_params=TRACKING_PARAMS):
+    """
+    规范化URL
+
+    协议和主机名小写、去掉默认端口和片段、去掉跟踪参数并对剩余参数排序，
+    使同一篇研报的不同转载链接得到相同的结果。
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower() or "http"
+    host = (parsed.hostname or "").lower()
+    if parsed.port and not ((scheme == "http" and parsed.port == 80) or (scheme == "https" and parsed.port == 443)):
+        host = f"{host}:{parsed.port}"
+
+    query = [
+        (name, value) for name, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if name.lower() not in tracking_params and not name.lower().startswith("utm_")
+    ]
+    path = parsed.path or "/"
+    return urlunparse((scheme, host, path, "", urlencode(sorted(query)), ""))
+
+class BloomFilter:
+    """可持久化到文件的布隆过滤器"""
+
+    _HEADER = struct.Struct("<QII")
+
+    def __init__(self, capacity=1000000, error_rate=0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.count = 0
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        """双重哈希生成 hash_count 个比特位置"""
+        digest = hashlib.sha256(item.encode("utf-8")).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def __contains__(self, item):
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def add(self, item):
+        """添加元素，元素此前不存在时返回 True"""
+        added = False
+        for p in self._positions(item):
+            mask = 1 << (p & 7)
+            if not self.bits[p >> 3] & mask:
+                self.bits[p >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def save(self, path):
+        """保存到文件"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self._HEADER.pack(self.size, self.hash_count, self.count))
+            f.write(self.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """从文件加载"""
+        with open(path, "rb") as f:
+            size, hash_count, count = cls._HEADER.unpack(f.read(cls._HEADER.size))
+            bloom = cls.__new__(cls)
+            bloom.size = size
+            bloom.hash_count = hash_count
+            bloom.count = count
+            bloom.bits = bytearray(f.read())
+        return bloom
+
+class ReportDetailStore:
+    """
+    已抓取研报的解析结果
+
+    每篇研报一行 JSON：{"url", "canonical", "detail", "companies"}，转载只记录 canonical。
+    与布隆过滤器一起持久化，之后的运行中跳过下载时仍能把指标补回列表页记录。
+    末尾写了一半的行在加载时忽略，同一URL以最后一行为准。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._entries = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._entries[entry["url"]] = entry
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, url):
+        """研报的解析结果，转载按 canonical 取原文的结果；没有记录时返回 None"""
+        entry = self._entries.get(normalize_url(url))
+        if entry is not None and entry.get("canonical"):
+            original = self._entries.get(entry["canonical"])
+            if original is None:
+                return None
+            entry = dict(original, url=entry["url"], canonical=entry["canonical"])
+        return entry
+
+    def put(self, url, detail=None, companies=None, canonical=None):
+        """记录研报的解析结果；转载只给出 canonical"""
+        entry = {"url": normalize_url(url), "canonical": canonical, "detail": detail or {}, "companies": companies or {}}
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+            self._entries[entry["url"]] = entry
+
+class URLFrontier:
+    """
+    URL队列
+
+    每个主机一个优先级队列（数值越小越优先），出队时在主机之间轮转，
+    避免连续请求同一站点。已抓取的URL记录在布隆过滤器中并持久化，
+    之后的运行中不会再次入队；其解析结果保存在同目录的 details 中。
+    """
+
+    def __init__(self, seen_path=None, capacity=None, error_rate=0.001, details_path=None):
+        storage = Config.STORAGE_CONFIG
+        self.seen_path = seen_path or storage.get("frontier_seen_path", os.path.join("cache", "seen_urls.bloom"))
+        capacity = capacity or storage.get("frontier_capacity", 1000000)
+        self.details = ReportDetailStore(
+            details_path or os.path.join(os.path.dirname(self.seen_path), "report_details.jsonl")
+        )
+
+        if os.path.exists(self.seen_path):
+            self.seen = BloomFilter.load(self.seen_path)
+            logger.info(f"已加载URL去重记录 {self.seen_path}，约 {self.seen.count} 条")
+        else:
+            self.seen = BloomFilter(capacity, error_rate)
+
+        self._queues = {}
+        self._hosts = deque()
+        self._queued = set()
+        self._seq = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._queued)
+
+    def add(self, url, priority=0):
+        """URL入队；已抓取过或已在队列中时返回 False"""
+        normalized = normalize_url(url)
+        with self._lock:
+            if normalized in self._queued or normalized in self.seen:
+                return False
+
+            host = urlparse(normalized).netloc
+            if host not in self._queues:
+                self._queues[host] = []
+            if not self._queues[host]:
+                self._hosts.append(host)
+            heapq.heappush(self._queues[host], (priority, self._seq, normalized))
+            self._seq += 1
+            self._queued.add(normalized)
+            return True
+
+    def pop(self):
+        """按主机轮转取出下一个URL，队列为空时返回 None"""
+        with self._lock:
+            if not self._hosts:
+                return None
+            host = self._hosts.popleft()
+            _, _, url = heapq.heappop(self._queues[host])
+            if self._queues[host]:
+                self._hosts.append(host)
+            self._queued.discard(url)
+            return url
+
+    def mark_fetched(self, url):
+        """记录URL已抓取"""
+        with self._lock:
+            if self.seen.add(normalize_url(url)):
+                self._dirty = True
+
+    def is_fetched(self, url):
+        """判断URL是否已抓取过"""
+        return normalize_url(url) in self.seen
+
+    def save(self):
+        """持久化去重记录"""
+        with self._lock:
+            if self._dirty:
+                self.seen.save(self.seen_path)
+                self._dirty = False
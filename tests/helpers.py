@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - 测试辅助工具
+"""
+
+class FakeClock:
+    """可手动推进的时钟，sleep 只推进时间并记录等待时长"""
+
+    def __init__(self, now=0.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - 公司注册表测试
+"""
+
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from company_registry import CompanyRegistry, get_registry
+from industry_report_crawler_enhanced import IndustryReportCrawlerEnhanced
+
+class TestCompanyRegistry(unittest.TestCase):
+    """测试公司注册表的索引和加载"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_indexes_by_code_name_and_industry(self):
+        """测试按代码、名称、别名和行业查找"""
+        registry = get_registry()
+        self.assertEqual(registry.get("002230.SZ")["name"], "科大讯飞")
+        self.assertEqual(registry.find("科大讯飞")["code"], "002230.SZ")
+        self.assertEqual(registry.find("机器人")["name"], "新松机器人")
+        self.assertIsNone(registry.get("000000.SZ"))
+        self.assertEqual(registry.industries_of("603019.SH"), ["量子计算", "边缘计算"])
+        self.assertEqual([c["name"] for c in registry.companies_in("边缘计算")], ["浪潮信息", "中科曙光", "紫光股份"])
+        self.assertEqual(registry.companies_in("不存在的行业"), [])
+
+    def test_multi_industry_companies_are_single_entities(self):
+        """测试跨行业公司只有一个实体，主要产品按行业区分"""
+        registry = get_registry()
+        names = [company["name"] for company in registry.companies.values()]
+        self.assertEqual(names.count("中科曙光"), 1)
+        self.assertEqual(names.count("紫光股份"), 1)
+        self.assertEqual([c["code"] for c in registry.companies_in("机器人")].count("300024.SZ"), 1)
+
+        products = {c["name"]: c["main_products"] for c in registry.companies_in("量子计算")}
+        self.assertEqual(products["中科曙光"], "高性能计算、量子计算")
+
+    def test_registry_is_cached_and_reloaded_on_change(self):
+        """测试注册表按路径缓存，文件修改后重新加载"""
+        path = os.path.join(self.temp_dir, "registry.json")
+        document = {
+            "companies": [{"id": "A", "name": "甲公司", "aliases": [], "code": "A", "market_cap": "1亿"}],
+            "industries": {"测试行业": [{"id": "A", "main_products": "产品"}]}
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(document, f, ensure_ascii=False)
+        first = get_registry(path)
+        self.assertIs(get_registry(path), first)
+
+        document["companies"][0]["market_cap"] = "2亿"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(document, f, ensure_ascii=False)
+        os.utime(path, (0, 0))
+        self.assertEqual(get_registry(path).get("A")["market_cap"], "2亿")
+
+    def test_unknown_company_reference_is_rejected(self):
+        """测试行业引用不存在的公司时报错"""
+        path = os.path.join(self.temp_dir, "registry.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"companies": [], "industries": {"测试行业": [{"id": "X", "main_products": ""}]}}, f)
+        with self.assertRaises(ValueError):
+            CompanyRegistry(path)
+
+    def test_crawler_company_data_keeps_shape(self):
+        """测试爬虫的 company_data 结构不变且延迟加载"""
+        crawler = IndustryReportCrawlerEnhanced()
+        self.assertIsNone(crawler._company_data)
+        data = crawler.company_data
+        self.assertEqual(len(data), 20)
+        self.assertEqual(set(data["人工智能"][0]), {"name", "code", "market_cap", "currency", "main_products"})
+
+if __name__ == '__main__':
+    unittest.main()
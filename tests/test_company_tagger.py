@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - 企业标注测试
+"""
+
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from company_tagger import AhoCorasick, CompanyTagger
+from industry_report_crawler_enhanced import IndustryReportCrawlerEnhanced
+
+class TestAhoCorasick(unittest.TestCase):
+    """测试多模式匹配自动机"""
+
+    def test_overlapping_patterns(self):
+        """测试重叠和互为后缀的模式都能匹配"""
+        automaton = AhoCorasick()
+        for pattern in ["he", "she", "his", "hers"]:
+            automaton.add(pattern, pattern)
+        matches = sorted((start, payload) for start, _, payload in automaton.iter("ushers"))
+        self.assertEqual(matches, [(1, "she"), (2, "he"), (2, "hers")])
+
+class TestCompanyTagger(unittest.TestCase):
+    """测试企业标注和指标归属"""
+
+    @classmethod
+    def setUpClass(cls):
+        """使用增强版爬虫的公司数据"""
+        cls.company_data = IndustryReportCrawlerEnhanced().company_data
+        cls.tagger = CompanyTagger(cls.company_data)
+
+    def test_tags_names_short_names_and_codes(self):
+        """测试识别全称、简称和股票代码，英文代码要求词边界"""
+        text = "紫光(000938)与00700.HK合作，新松机器人订单增长；UNION 不是蔚来的代码 NIO。"
+        mentions = self.tagger.tag(text)
+        self.assertEqual([m["企业名称"] for m in mentions], ["紫光股份", "紫光股份", "腾讯云", "新松机器人", "蔚来", "蔚来"])
+        self.assertEqual(mentions[0]["行业名称"], "5G通信")
+
+    def test_industry_name_not_tagged_as_company(self):
+        """测试与行业名称相同的公司条目不会把行业名标为公司"""
+        self.assertEqual(self.tagger.tag("机器人行业景气度回升"), [])
+
+    def test_attributes_metrics_to_nearest_company(self):
+        """测试指标归属到最近的企业"""
+        text = "科大讯飞：平均毛利率为45%。寒武纪：毛利率约65%，产能利用率80%。行业渗透率为20%。"
+        attributed = self.tagger.attribute(text)
+        self.assertEqual(attributed["002230.SZ"]["平均毛利率(%)"], 45.0)
+        self.assertEqual(attributed["688256.SH"]["平均毛利率(%)"], 65.0)
+        self.assertEqual(attributed["688256.SH"]["产能利用率(%)"], 80.0)
+        self.assertEqual(attributed["688256.SH"]["行业名称"], "人工智能")
+
+    def test_multi_industry_company_resolved_by_current_industry(self):
+        """测试属于多个行业的企业保留全部行业，按当前处理的行业确定行业名称"""
+        self.assertEqual(self.tagger.industries["000938.SZ"], {"5G通信", "边缘计算"})
+        text = "紫光股份：平均毛利率为30%。"
+        self.assertEqual(self.tagger.tag(text)[0]["行业名称"], "5G通信")
+        self.assertEqual(self.tagger.tag(text, industry="边缘计算")[0]["行业名称"], "边缘计算")
+        self.assertEqual(self.tagger.tag(text, industry="人工智能")[0]["行业名称"], "5G通信")
+
+        attributed = self.tagger.attribute(text, industry="边缘计算")["000938.SZ"]
+        self.assertEqual((attributed["行业名称"], attributed["平均毛利率(%)"]), ("边缘计算", 30.0))
+        self.assertEqual(self.tagger.companies["000938.SZ"]["行业名称"], "5G通信")
+
+if __name__ == '__main__':
+    unittest.main()
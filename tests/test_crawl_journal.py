@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - 断点续爬测试
+"""
+
+import unittest
+from unittest import mock
+import sys
+import os
+import shutil
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config import Config
+from crawl_journal import CrawlJournal
+from industry_report_crawler import IndustryReportCrawler
+
+class TestCrawlJournal(unittest.TestCase):
+    """测试爬取日志"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "journal.jsonl")
+
+    def tearDown(self):
+        """清理测试环境"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_reload_completed_units(self):
+        """测试重新加载已完成单元，忽略写了一半的末行"""
+        journal = CrawlJournal(self.path)
+        journal.record("人工智能", "东方财富网", [{"企业名称": "科大讯飞"}])
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"industry": "半导体", "sour')
+
+        reloaded = CrawlJournal(self.path)
+        self.assertEqual(len(reloaded), 1)
+        self.assertTrue(reloaded.is_done("人工智能", "东方财富网"))
+        self.assertEqual(reloaded.records("人工智能", "东方财富网"), [{"企业名称": "科大讯飞"}])
+
+    def test_resume_skips_completed_units(self):
+        """测试续爬时跳过已完成单元，只抓取剩余数据源"""
+        journal = CrawlJournal(self.path)
+        journal.record("人工智能", "东方财富网", [{"企业名称": "科大讯飞"}])
+
+        crawler = IndustryReportCrawler()
+        crawler.robots = None
+        crawler.journal = journal
+        fetched = []
+        crawler._fetch_eastmoney = lambda industry: self.fail("已完成单元不应重新抓取")
+        crawler._fetch_sina_finance = lambda industry: fetched.append("新浪财经") or []
+        crawler._fetch_hexun = lambda industry: fetched.append("和讯网") or [{"企业名称": "寒武纪"}]
+
+        data = crawler.process_industry_data("人工智能")
+
+        self.assertEqual(fetched, ["新浪财经", "和讯网"])
+        self.assertEqual([item["企业名称"] for item in data], ["科大讯飞", "寒武纪"])
+        self.assertTrue(CrawlJournal(self.path).is_done("人工智能", "和讯网"))
+
+    def test_journal_kept_when_output_fails(self):
+        """测试输出文件保存失败时保留爬取日志，全部保存后才清空"""
+        import main
+
+        class FakeCrawler(IndustryReportCrawler):
+            def crawl_all_industries(self):
+                self.journal.record("人工智能", "东方财富网", [{"企业名称": "科大讯飞"}])
+                return self.sample_data[:3]
+
+        csv_file, json_file = os.path.join(self.temp_dir, "out.csv"), os.path.join(self.temp_dir, "out.json")
+        with mock.patch.dict(Config.STORAGE_CONFIG, {"journal_path": self.path}), \
+                mock.patch.object(main, "IndustryReportCrawler", FakeCrawler), \
+                mock.patch.object(main.current_config, "get_csv_filename", return_value=csv_file), \
+                mock.patch.object(main.current_config, "get_json_filename", return_value=json_file):
+            with mock.patch.object(FakeCrawler, "save_to_excel", return_value=None):
+                result = main.crawl_data(output_format='all', generate_charts=False)
+            self.assertEqual(result['files'], [csv_file, json_file])
+            self.assertEqual(len(CrawlJournal(self.path)), 1)
+
+            main.crawl_data(output_format='csv', generate_charts=False)
+            self.assertEqual(len(CrawlJournal(self.path)), 0)
+
+if __name__ == '__main__':
+    unittest.main()
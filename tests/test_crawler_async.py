@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - 异步爬虫测试
+"""
+
+import unittest
+from unittest import mock
+import sys
+import os
+import asyncio
+import shutil
+import tempfile
+from collections import Counter
+from urllib.parse import urlparse
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config import Config
+from scheduler import PolitenessScheduler
+from resilience import SourceGuard
+from html_parser import parse_metrics
+from industry_report_crawler_async import IndustryReportCrawlerAsync
+
+# GBK 编码、响应头未声明字符集的列表页
+LISTING = """<html><head><meta charset="gbk"></head><body><table class="table-model">
+<tr><th>序号</th><th>标题</th></tr>
+<tr><td>1</td><td><a href="/report/{industry}.pdf">{industry}行业深度报告</a></td><td>-</td><td>中信证券</td><td>2024-01-01</td></tr>
+</table></body></html>"""
+
+class StubResponse:
+    """记录每个主机同时进行中的请求数"""
+
+    charset = None
+
+    def __init__(self, session, url, params):
+        self.session = session
+        self.host = urlparse(url).netloc
+        self.params = params
+
+    async def __aenter__(self):
+        self.session.active[self.host] += 1
+        self.session.peak[self.host] = max(self.session.peak[self.host], self.session.active[self.host])
+        await asyncio.sleep(0.01)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.session.active[self.host] -= 1
+
+    def raise_for_status(self):
+        if self.host in self.session.failing_hosts:
+            raise IOError(f"{self.host} 返回 500")
+
+    async def read(self):
+        return LISTING.format(industry=self.params["industry"]).encode("gbk")
+
+class StubSession:
+    """替代 aiohttp.ClientSession，按主机返回列表页或错误"""
+
+    def __init__(self, failing_hosts=()):
+        self.failing_hosts = set(failing_hosts)
+        self.active = Counter()
+        self.peak = Counter()
+        self.requests = []
+
+    def get(self, url, params=None, timeout=None):
+        self.requests.append((url, params["industry"]))
+        return StubResponse(self, url, params)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+class TestIndustryCrawlerAsync(unittest.TestCase):
+    """测试异步爬虫的并发限制和错误隔离"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.sources = {
+            name: dict(Config.DATA_SOURCES[name], delay_range=(0, 0),
+                       listing_url=Config.DATA_SOURCES[name]["base_url"] + "/list")
+            for name in ("东方财富网", "和讯网")
+        }
+        patches = [
+            mock.patch.dict(Config.CRAWLER_SETTINGS, {"respect_robots_txt": False, "max_concurrent_requests": 2}),
+            mock.patch.dict(Config.STORAGE_CONFIG, {"frontier_seen_path": os.path.join(self.temp_dir, "seen.bloom")}),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        """清理测试环境"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_crawler(self, industries, session):
+        crawler = IndustryReportCrawlerAsync(industries=industries, sources=self.sources)
+        crawler.scheduler = PolitenessScheduler(self.sources)
+        crawler.source_guard = SourceGuard(settings={"max_retries": 0})
+        crawler._create_session = lambda: session
+        crawler._download_report = lambda url: "本报告分析行业发展趋势。"
+        return crawler
+
+    def test_per_host_concurrency_limit(self):
+        """测试每个主机同时进行的请求数不超过 max_concurrent_requests"""
+        industries = ["人工智能", "半导体", "云计算", "物联网", "区块链", "机器人"]
+        session = StubSession()
+        data = self.make_crawler(industries, session).crawl_all_industries()
+
+        self.assertEqual(len(session.requests), 12)
+        self.assertEqual(set(session.peak.values()), {2})
+        # 测试页面只符合东方财富网的选择器，每个行业一条记录
+        self.assertEqual(len(data), 6)
+
+    def test_failing_source_is_isolated(self):
+        """测试失败的数据源不影响其他数据源，结果经过研报详情抓取"""
+        session = StubSession(failing_hosts=["www.hexun.com"])
+        crawler = self.make_crawler(["人工智能"], session)
+        records = crawler.process_industry_data("人工智能")
+
+        self.assertEqual([record["研报标题"] for record in records], ["人工智能行业深度报告"])
+        self.assertEqual(records[0]["研报链接"], "http://data.eastmoney.com/report/人工智能.pdf")
+        self.assertTrue(crawler.frontier.is_fetched(records[0]["研报链接"]))
+
+    def test_source_without_selectors_skipped(self):
+        """测试未声明选择器的数据源不请求列表页，解析耗时每次爬取重新统计"""
+        del self.sources["和讯网"]["selectors"]
+        session = StubSession()
+        crawler = self.make_crawler(["人工智能"], session)
+
+        for _ in range(2):
+            with self.assertLogs("industry_report_crawler_async", level="WARNING"):
+                crawler.crawl_all_industries()
+            summary = parse_metrics.summary()
+            self.assertEqual(list(summary), ["东方财富网"])
+            self.assertEqual(summary["东方财富网"]["pages"], 1)
+        self.assertEqual([url for url, _ in session.requests], ["http://data.eastmoney.com/list"] * 2)
+
+    def test_industry_without_data_uses_generated_records(self):
+        """测试所有数据源都失败的行业使用真实公司数据生成的模拟数据"""
+        session = StubSession(failing_hosts=["data.eastmoney.com", "www.hexun.com"])
+        data = self.make_crawler(["人工智能", "半导体"], session).crawl_all_industries()
+
+        self.assertEqual({item["行业名称"] for item in data}, {"人工智能", "半导体"})
+        self.assertEqual({item["数据来源"] for item in data}, {"多源数据整合"})
+
+if __name__ == '__main__':
+    unittest.main()
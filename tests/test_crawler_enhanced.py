@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - 增强版爬虫测试
+"""
+
+import unittest
+from unittest import mock
+import sys
+import os
+import time
+import shutil
+import tempfile
+import threading
+from concurrent.futures import Future
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config import Config
+from url_frontier import URLFrontier
+from industry_report_crawler_enhanced import IndustryReportCrawlerEnhanced
+
+SOURCES = ("crawl_eastmoney", "crawl_sina_finance", "crawl_xueqiu", "crawl_cninfo")
+
+class TestProcessIndustryData(unittest.TestCase):
+    """测试各数据源的并发抓取"""
+
+    def setUp(self):
+        """设置测试环境"""
+        with mock.patch.dict(Config.CRAWLER_SETTINGS, {"respect_robots_txt": False}):
+            self.crawler = IndustryReportCrawlerEnhanced()
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+        for index, name in enumerate(SOURCES):
+            setattr(self.crawler, name, self.make_source(name, delay=0.05 * (len(SOURCES) - index)))
+
+    def make_source(self, name, delay, error=None):
+        """模拟数据源：记录同时运行的数量，先提交的数据源更晚返回"""
+        def crawl(industry_name):
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            time.sleep(delay)
+            with self.lock:
+                self.active -= 1
+            if error is not None:
+                raise error
+            return [{"行业名称": industry_name, "企业名称": name}]
+        return crawl
+
+    def process(self, max_concurrent_requests):
+        with mock.patch.dict(Config.CRAWLER_SETTINGS, {"max_concurrent_requests": max_concurrent_requests}):
+            return self.crawler.process_industry_data("人工智能")
+
+    def test_concurrency_limited_and_order_kept(self):
+        """测试并发数不超过 max_concurrent_requests，结果按数据源顺序合并"""
+        records = self.process(2)
+        self.assertEqual(self.peak, 2)
+        self.assertEqual([record["企业名称"] for record in records], list(SOURCES))
+
+        self.peak = 0
+        self.process(1)
+        self.assertEqual(self.peak, 1)
+
+    def test_failing_source_is_isolated(self):
+        """测试抛出异常的数据源不影响其他数据源"""
+        self.crawler.crawl_sina_finance = self.make_source("crawl_sina_finance", 0.01, error=IOError("连接被重置"))
+        with self.assertLogs("industry_report_crawler_enhanced", level="ERROR"):
+            records = self.process(4)
+        self.assertEqual([record["企业名称"] for record in records], ["crawl_eastmoney", "crawl_xueqiu", "crawl_cninfo"])
+
+class StubDownloader:
+    """按URL返回文档哈希，不访问网络"""
+
+    def download(self, url):
+        return {"sha256": url, "path": url}
+
+class StubExtractionStage:
+    """提交后不立即完成，由测试决定何时给出提取结果"""
+
+    def __init__(self):
+        self.futures = {}
+        self.closed = False
+
+    def submit(self, sha256, path):
+        self.futures[sha256] = Future()
+        return self.futures[sha256]
+
+    def close(self):
+        self.closed = True
+
+class TestPDFReports(unittest.TestCase):
+    """测试PDF提取不阻塞研报下载"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.temp_dir = tempfile.mkdtemp()
+        with mock.patch.dict(Config.CRAWLER_SETTINGS, {"respect_robots_txt": False}):
+            self.crawler = IndustryReportCrawlerEnhanced()
+        self.crawler._frontier = URLFrontier(os.path.join(self.temp_dir, "seen.bloom"), capacity=1000)
+        self.crawler._pdf_downloader = StubDownloader()
+        self.crawler._extract_report = lambda text: {"研报标题": text}
+        self.stage = StubExtractionStage()
+        self.crawler._pdf_extraction = self.stage
+
+    def tearDown(self):
+        """清理测试环境"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_downloads_continue_while_extracting(self):
+        """测试所有PDF提交提取后才等待结果，提取失败的研报不标记为已抓取"""
+        urls = ["http://a.com/1.pdf", "http://b.com/2.pdf", "http://c.com/3.pdf"]
+        records = [{"企业名称": "科大讯飞", "研报链接": url} for url in urls]
+
+        def finish_extraction():
+            # 等所有PDF都已提交再给出结果，下载循环若等待提取则会卡住
+            while len(self.stage.futures) < len(urls):
+                time.sleep(0.01)
+            self.stage.futures[urls[0]].set_result({"text": "人工智能行业深度报告" * 10})
+            self.stage.futures[urls[1]].set_exception(IOError("PDF损坏"))
+            self.stage.futures[urls[2]].set_result({"text": "半导体行业周期展望" * 10})
+
+        worker = threading.Thread(target=finish_extraction)
+        worker.start()
+        with self.assertLogs("industry_report_crawler_enhanced", level="ERROR"):
+            data = self.crawler._fetch_reports(records)
+        worker.join()
+
+        self.assertEqual([item.get("研报标题") for item in data],
+                         ["人工智能行业深度报告" * 10, None, "半导体行业周期展望" * 10])
+        self.assertTrue(self.crawler.frontier.is_fetched(urls[0]))
+        self.assertFalse(self.crawler.frontier.is_fetched(urls[1]))
+
+    def test_stage_closed_after_crawl(self):
+        """测试 crawl_all_industries 结束后关闭提取阶段"""
+        self.crawler.crawl_all_industries()
+        self.assertTrue(self.stage.closed)
+        self.assertIsNone(self.crawler._pdf_extraction)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - 研报去重测试
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from dedup import ReportDeduplicator, SimHashIndex, hamming_distance, simhash
+from url_frontier import URLFrontier
+from industry_report_crawler_enhanced import IndustryReportCrawlerEnhanced
+
+REPORT = (
+    "人工智能行业深度报告：大模型推动算力需求快速增长，预计2024年国内智能算力规模同比增长超过50%，"
+    "AI芯片国产替代加速，寒武纪、海光信息等厂商有望受益。应用端看，语音识别与智能教育渗透率持续提升，"
+    "科大讯飞星火大模型带动教育硬件销量增长，维持行业增持评级。"
+)
+
+class TestSimHash(unittest.TestCase):
+    """测试 SimHash 指纹与索引"""
+
+    def test_syndicated_copy_is_near_duplicate(self):
+        """测试排版不同的转载指纹相近，不同研报指纹相差较大"""
+        copy = "【证券时报】" + REPORT.replace("，", ", ") + "（来源：第一财经）"
+        other = "新能源汽车行业周报：11月新能源车销量同比增长30%，动力电池装机量创新高，宁德时代市占率稳定，比亚迪海外销量持续放量。"
+        self.assertEqual(hamming_distance(simhash(REPORT), simhash(copy)), 0)
+        self.assertGreater(hamming_distance(simhash(REPORT), simhash(other)), 10)
+
+    def test_default_deduplicator_finds_edited_copy(self):
+        """测试默认阈值识别带转载标注和少量删改的转载，不误判其他研报"""
+        dedup = ReportDeduplicator()
+        dedup.add("a", REPORT)
+        edited = "【证券时报】" + REPORT.replace("2024年", "今年") + "（来源：第一财经）"
+        self.assertEqual(dedup.find(edited), "a")
+        self.assertIsNone(dedup.find("新能源汽车行业周报：11月新能源车销量同比增长30%，动力电池装机量创新高，宁德时代市占率稳定，比亚迪海外销量持续放量。"))
+
+    def test_index_finds_fingerprints_within_distance(self):
+        """测试索引返回汉明距离不超过阈值的文档"""
+        index = SimHashIndex(max_distance=3)
+        index.add("a", 0b1111)
+        index.add("b", 0b1111 << 40)
+        self.assertEqual(index.query(0b0111), [(1, "a")])
+        self.assertEqual(index.query(1 << 63), [])
+
+class TestReportDeduplicator(unittest.TestCase):
+    """测试研报去重在流水线中的效果"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """清理测试环境"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_copy_extracted_once_and_attributed(self):
+        """测试转载研报只提取一次，重复行合并并补充数据来源"""
+        crawler = IndustryReportCrawlerEnhanced()
+        crawler.robots = None
+        crawler._frontier = URLFrontier(os.path.join(self.temp_dir, "seen.bloom"), capacity=1000)
+        crawler._fetch_eastmoney = lambda industry: [{"企业名称": "科大讯飞", "数据来源": "东方财富网", "研报链接": "http://a.com/1"}]
+        crawler._fetch_sina_finance = lambda industry: [{"企业名称": "科大讯飞", "数据来源": "新浪财经", "研报链接": "http://b.com/9"}]
+        crawler._fetch_xueqiu = lambda industry: []
+        crawler._fetch_cninfo = lambda industry: []
+        pages = {"http://a.com/1": REPORT, "http://b.com/9": "【证券时报】" + REPORT.replace("，", ", ") + "（来源：第一财经）"}
+        crawler._download_report = lambda url: pages[url]
+        extracted = []
+        crawler._extract_report = lambda text: extracted.append(text) or {"研报标题": "AI行业深度"}
+
+        data = crawler.process_industry_data("人工智能")
+
+        self.assertEqual(len(extracted), 1)
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["研报标题"], "AI行业深度")
+        self.assertEqual(data[0]["数据来源"], "东方财富网、新浪财经")
+
+if __name__ == '__main__':
+    unittest.main()
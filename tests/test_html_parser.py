@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - HTML选择性解析测试
+"""
+
+import unittest
+from unittest import mock
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config import Config
+from html_parser import ParseMetrics, parse_listing, parse_metrics, response_encoding, select
+
+PAGE = """
+<html><head><script>var ads = "<table class='table-model'>";</script></head>
+<body>
+  <div class="nav"><a href="/">首页</a></div>
+  <table class="table-model striped">
+    <tr><th>序号</th><th>标题</th><th>评级</th><th>机构</th><th>日期</th></tr>
+    <tr><td>1</td><td><a href="/report/zw_industry.jshtml?infocode=AP1">人工智能 行业深度</a></td>
+        <td>增持</td><td>中信证券</td><td>2024-03-01</td></tr>
+    <tr><td>2</td><td><a href="http://pdf.dfcfw.com/AP2.pdf">半导体周报</a></td>
+        <td>买入</td><td>华泰证券</td><td>2024-03-02</td></tr>
+  </table>
+  <div class="footer">版权所有</div>
+</body></html>
+"""
+
+class TestHTMLParser(unittest.TestCase):
+    """测试选择性解析"""
+
+    def test_select_builds_only_matching_subtrees(self):
+        """测试只返回匹配选择器的子树"""
+        matches = select(PAGE, [{"tag": "table", "attrs": {"class": "table-model"}}])
+        self.assertEqual(len(matches), 1)
+        self.assertEqual(matches[0].tag, "table")
+        self.assertEqual(len(matches[0].xpath(".//tr")), 3)
+        self.assertEqual(select(PAGE, [{"tag": "table", "attrs": {"id": "missing"}}]), [])
+
+    def test_parse_listing_uses_declared_selectors(self):
+        """测试按配置中声明的选择器提取记录并统计耗时"""
+        metrics = ParseMetrics()
+        records = parse_listing("东方财富网", PAGE, metrics=metrics)
+
+        self.assertEqual([r["研报标题"] for r in records], ["人工智能 行业深度", "半导体周报"])
+        self.assertEqual(records[0]["研报链接"], "http://data.eastmoney.com/report/zw_industry.jshtml?infocode=AP1")
+        self.assertEqual(records[1]["机构名称"], "华泰证券")
+        self.assertEqual(records[1]["发布日期"], "2024-03-02")
+
+        stats = metrics.summary()["东方财富网"]
+        self.assertEqual((stats["pages"], stats["records"]), (1, 2))
+
+    def test_bytes_use_declared_or_meta_charset(self):
+        """测试 GBK 页面按 meta charset 或传入的字符集解码"""
+        selectors = [{"tag": "table", "attrs": {"class": "table-model"}}]
+        with_meta = PAGE.replace("<head>", '<head><meta charset="gbk">').encode("gbk")
+        without_meta = PAGE.encode("gbk")
+
+        for html, encoding in ((with_meta, None), (without_meta, "gbk")):
+            table = select(html, selectors, encoding)[0]
+            self.assertEqual(table.xpath("string(.//td[2]/a)"), "人工智能 行业深度")
+
+    def test_response_encoding(self):
+        """测试只使用响应头中声明的字符集"""
+        response = mock.Mock(headers={"Content-Type": 'text/html; charset="GBK"'})
+        self.assertEqual(response_encoding(response), "GBK")
+        response.headers = {"Content-Type": "text/html"}
+        self.assertIsNone(response_encoding(response))
+
+    def test_metrics_reset_per_crawl(self):
+        """测试每次爬取只统计本次的解析次数"""
+        from industry_report_crawler import IndustryReportCrawler
+
+        with mock.patch.dict(Config.CRAWLER_SETTINGS, {"respect_robots_txt": False}):
+            crawler = IndustryReportCrawler()
+        crawler.emerging_industries = ["人工智能"]
+        crawler.scheduler = mock.Mock()
+        crawler._fetch_eastmoney = lambda industry_name: parse_listing("东方财富网", PAGE)
+
+        for _ in range(2):
+            crawler.crawl_all_industries()
+            self.assertEqual(parse_metrics.summary()["东方财富网"]["pages"], 1)
+
+    def test_every_source_declares_selectors(self):
+        """测试所有数据源都声明了列表页选择器"""
+        for source_name, config in Config.DATA_SOURCES.items():
+            with self.subTest(source_name=source_name):
+                self.assertIn("研报链接", config["selectors"]["fields"])
+
+    def test_undeclared_source_raises(self):
+        """测试未声明选择器的数据源"""
+        with self.assertRaises(ValueError):
+            parse_listing("未知来源", PAGE, metrics=ParseMetrics())
+
+if __name__ == '__main__':
+    unittest.main()
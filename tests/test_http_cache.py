@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - HTTP缓存测试
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from http_cache import HTTPCache, CachedSession, normalize_request_key
+from helpers import FakeClock
+
+class ETagHandler(BaseHTTPRequestHandler):
+    """返回固定ETag的本地页面"""
+
+    hits = []
+
+    def do_GET(self):
+        ETagHandler.hits.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = "研报列表".encode("utf-8")
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class TestHTTPCache(unittest.TestCase):
+    """测试磁盘缓存和条件请求"""
+
+    def setUp(self):
+        """设置测试环境"""
+        ETagHandler.hits = []
+        self.server = HTTPServer(("127.0.0.1", 0), ETagHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+
+        self.cache_dir = tempfile.mkdtemp()
+        self.clock = FakeClock(1000.0)
+        sources = {"本地": {"base_url": self.base_url, "cache_ttl": 60}}
+        self.session = CachedSession(HTTPCache(self.cache_dir, sources, clock=self.clock))
+
+    def tearDown(self):
+        """清理测试环境"""
+        self.server.shutdown()
+        self.server.server_close()
+        self.session.close()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_normalized_key_ignores_param_order(self):
+        """测试参数顺序不影响缓存键"""
+        key1, _ = normalize_request_key("http://A.com/list?b=2", {"a": 1})
+        key2, _ = normalize_request_key("http://a.com/list", {"b": "2", "a": "1"})
+        self.assertEqual(key1, key2)
+
+    def test_fresh_entry_served_from_disk(self):
+        """测试有效期内直接读取缓存"""
+        first = self.session.get(f"{self.base_url}/list", params={"page": 1})
+        second = self.session.get(f"{self.base_url}/list", params={"page": 1})
+        self.assertFalse(first.from_cache)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.text, "研报列表")
+        self.assertEqual(len(ETagHandler.hits), 1)
+
+    def test_stale_entry_revalidated_with_etag(self):
+        """测试过期后发送 If-None-Match 并复用缓存内容"""
+        self.session.get(f"{self.base_url}/list")
+        self.clock.now += 120
+        response = self.session.get(f"{self.base_url}/list")
+        self.assertEqual(ETagHandler.hits, [None, '"v1"'])
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.from_cache)
+        self.assertEqual(response.text, "研报列表")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - 分布式任务队列测试
+"""
+
+import unittest
+from unittest import mock
+import sys
+import os
+import shutil
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config import Config
+from job_queue import JobQueue
+from resilience import CircuitBreaker, SourceGuard
+from distributed import run_coordinator, run_worker, merge_results
+from helpers import FakeClock
+
+class TestJobQueue(unittest.TestCase):
+    """测试 SQLite 任务队列"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "jobs.sqlite3")
+        self.clock = FakeClock(1000.0)
+        self.queue = JobQueue(self.path, lease_seconds=60, max_attempts=2, clock=self.clock)
+
+    def tearDown(self):
+        """清理测试环境"""
+        self.queue.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_expired_lease_is_taken_over(self):
+        """测试租约到期的任务可被其他工作进程领取，原进程的确认被拒绝"""
+        self.assertEqual(self.queue.enqueue([("人工智能", "东方财富网"), ("人工智能", "东方财富网")]), 1)
+        job = self.queue.lease("worker-a")
+        self.assertIsNone(JobQueue(self.path, clock=self.clock).lease("worker-b"))
+
+        self.clock.now += 61
+        other = JobQueue(self.path, clock=self.clock)
+        taken = other.lease("worker-b")
+        self.assertEqual(taken["id"], job["id"])
+        self.assertFalse(self.queue.ack(job["id"], "worker-a", []))
+        self.assertTrue(other.ack(taken["id"], "worker-b", [{"企业名称": "科大讯飞"}]))
+        other.close()
+
+        self.assertEqual(list(self.queue.results()), [("人工智能", "东方财富网", [{"企业名称": "科大讯飞"}])])
+
+    def test_failed_job_retried_until_max_attempts(self):
+        """测试失败的任务放回队列，达到最大次数后标记为失败"""
+        self.queue.enqueue([("半导体", "和讯网")])
+        self.queue.fail(self.queue.lease("w")["id"], "w", "超时")
+        self.queue.fail(self.queue.lease("w")["id"], "w", "超时")
+        self.assertIsNone(self.queue.lease("w"))
+        self.assertEqual(self.queue.counts()["failed"], 1)
+        self.assertTrue(self.queue.is_drained())
+
+    def test_expired_lease_counts_as_attempt(self):
+        """测试租约到期计为一次失败，达到最大次数后不再领取"""
+        self.queue.enqueue([("半导体", "和讯网")])
+        self.queue.lease("w1")
+        self.clock.now += 61
+        job = self.queue.lease("w2")
+        self.assertEqual(job["attempts"], 1)
+
+        self.clock.now += 61
+        self.assertIsNone(self.queue.lease("w3"))
+        self.assertEqual(self.queue.counts()["failed"], 1)
+
+    def test_release_delays_without_counting_attempt(self):
+        """测试放回的任务在推迟时间内不可领取，且不计入失败次数"""
+        self.queue.enqueue([("半导体", "和讯网")])
+        for _ in range(3):
+            job = self.queue.lease("w")
+            self.assertEqual(job["attempts"], 0)
+            self.assertTrue(self.queue.release(job["id"], "w", 300, "已熔断"))
+            self.assertIsNone(self.queue.lease("w"))
+            self.assertFalse(self.queue.is_drained())
+            self.clock.now += 300
+
+    def test_worker_releases_jobs_of_open_circuit(self):
+        """测试数据源熔断时工作进程把任务推迟到冷却结束后"""
+        self.queue.enqueue([("人工智能", "东方财富网")])
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=300, clock=FakeClock())
+        breaker.record_failure()
+
+        with mock.patch.object(SourceGuard, "breaker", return_value=breaker), \
+                mock.patch("distributed.time.sleep", side_effect=InterruptedError):
+            with self.assertRaises(InterruptedError):
+                run_worker(self.queue, worker_id="w1", max_jobs=1)
+
+        row = self.queue.conn.execute("SELECT status, attempts, available_at FROM jobs").fetchone()
+        self.assertEqual((row["status"], row["attempts"]), ("pending", 0))
+        self.assertGreaterEqual(row["available_at"], self.clock() + 300)
+
+    def test_coordinator_worker_merge(self):
+        """测试协调、执行、合并的完整流程"""
+        self.assertEqual(run_coordinator(["人工智能", "半导体"], self.queue), 6)
+        # 测试环境无法访问外网，robots.txt 暂时无法获取的任务会被放回队列
+        with mock.patch.dict(Config.CRAWLER_SETTINGS, {"respect_robots_txt": False}):
+            completed = run_worker(self.queue, worker_id="w1", max_jobs=6)
+        self.assertEqual(completed, 6)
+        self.assertTrue(self.queue.is_drained())
+
+        data = merge_results(self.queue)
+        self.assertEqual({item["行业名称"] for item in data}, {"人工智能", "半导体"})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - 市值换算测试
+"""
+
+import unittest
+import sys
+import os
+import math
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pandas as pd
+
+from market_cap import NUMERIC_COLUMN, add_market_cap_column, load_fx_rates, normalize_market_cap, ticker_currency
+
+RATES = {"CNY": 1.0, "HKD": 0.9, "USD": 7.0}
+
+class TestMarketCap(unittest.TestCase):
+    """测试市值字符串的批量换算"""
+
+    def test_units_and_missing_values(self):
+        """测试 亿/万亿/万 单位换算，无法识别的值为 NaN"""
+        result = normalize_market_cap(["800亿", "2.5万亿", "5000万", "1,200亿", "私有", None, ""], fx_rates=RATES)
+        self.assertEqual(result.tolist()[:4], [8e10, 2.5e12, 5e7, 1.2e11])
+        self.assertTrue(all(math.isnan(value) for value in result.tolist()[4:]))
+        self.assertEqual(result.name, NUMERIC_COLUMN)
+
+    def test_currency_from_ticker_and_markers(self):
+        """测试港股、美股按代码折算，显式标注的货币优先"""
+        self.assertEqual(ticker_currency(["00700.HK", "NIO", "002230.SZ", "私有", None]).tolist(),
+                         ["HKD", "USD", "CNY", "CNY", "CNY"])
+        result = normalize_market_cap(
+            ["600亿", "100亿", "300亿", "30亿美元", "HK$10亿"],
+            ["00020.HK", "NIO", "688256.SH", "600000.SH", "NIO"],
+            fx_rates=RATES
+        )
+        self.assertEqual(result.tolist(), [5.4e10, 7e10, 3e10, 2.1e10, 9e8])
+
+    def test_given_currency_overrides_ticker(self):
+        """测试给出的计价货币优先于股票代码，空值处仍按代码判断"""
+        result = normalize_market_cap(["2000亿", "100亿", "HK$10亿"], ["NIO", "NIO", "NIO"],
+                                      fx_rates=RATES, currencies=["CNY", None, "CNY"])
+        self.assertEqual(result.tolist(), [2e11, 7e10, 9e8])
+
+    def test_registry_currency_used_for_generated_data(self):
+        """测试注册表中标注人民币计价的美股代码不按美元折算"""
+        from company_registry import get_registry
+        from synthetic_data import generate_realistic_frame
+
+        frame = generate_realistic_frame(get_registry().to_company_data(), seed=1).drop_duplicates('股票代码')
+        market_cap = frame.set_index('股票代码')[NUMERIC_COLUMN]
+        self.assertEqual(market_cap['BABA'], 2e12)
+        self.assertEqual(market_cap['NIO'], 2e11)
+
+    def test_unknown_currency_is_missing(self):
+        """测试汇率表缺少的货币记为缺失"""
+        result = normalize_market_cap(["1亿"], ["BABA"], fx_rates={"CNY": 1.0})
+        self.assertTrue(math.isnan(result.iloc[0]))
+
+    def test_column_inserted_next_to_original(self):
+        """测试换算列紧跟原市值列，排序按数值而非字符串"""
+        df = pd.DataFrame({"企业名称": ["甲", "乙", "丙"], "股票代码": ["000001.SZ", "000002.SZ", "私有"],
+                           "市值": ["800亿", "7000亿", "私有"], "主要产品": ["a", "b", "c"]})
+        add_market_cap_column(df, fx_rates=RATES)
+        self.assertEqual(list(df.columns), ["企业名称", "股票代码", "市值", NUMERIC_COLUMN, "主要产品"])
+        ranked = df.sort_values(NUMERIC_COLUMN, ascending=False, na_position="last")["企业名称"].tolist()
+        self.assertEqual(ranked, ["乙", "甲", "丙"])
+
+    def test_default_fx_table_is_cached(self):
+        """测试默认汇率表以人民币为基准并被缓存"""
+        rates = load_fx_rates()
+        self.assertEqual(rates["CNY"], 1.0)
+        self.assertIs(load_fx_rates(), rates)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - 指标提取测试
+"""
+
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from metric_extractor import MetricExtractor, extract_metrics
+
+class TestMetricExtractor(unittest.TestCase):
+    """测试编译后的指标提取器"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.extractor = MetricExtractor()
+
+    def test_single_pass_extracts_all_metrics(self):
+        """测试一次扫描提取全部指标，并映射到数据列"""
+        text = ("我们预计2025年国内市场空间约为0.8万亿元，行业渗透率约为23.5%，"
+                "龙头企业产能利用率达到82％，平均毛利率维持在35%左右，2021-2025年复合增长率28.6%。")
+        self.assertEqual(extract_metrics(text), {
+            "市场规模(亿元)": 8000.0,
+            "行业渗透率(%)": 23.5,
+            "产能利用率(%)": 82.0,
+            "平均毛利率(%)": 35.0,
+            "年增长率(%)": 28.6
+        })
+
+    def test_units_normalized(self):
+        """测试不同单位换算为亿元"""
+        self.assertEqual(self.extractor.extract("市场规模达3,500亿元")["市场规模"], 3500.0)
+        self.assertEqual(self.extractor.extract("市场规模为800万元")["市场规模"], 0.08)
+
+    def test_rejects_out_of_range_and_unitless_values(self):
+        """测试超出范围或缺少单位的数值被丢弃，继续匹配后续出现"""
+        values = self.extractor.extract("毛利率高达150%。毛利率为3年前的两倍。毛利率42.1%")
+        self.assertEqual(values, {"平均毛利率": 42.1})
+        self.assertEqual(self.extractor.extract("市场规模2万亿美元以上的12%"), {})
+
+    def test_finditer_reports_positions(self):
+        """测试产出指标在文本中的位置"""
+        text = "寒武纪：渗透率10%；科大讯飞：渗透率20%"
+        items = list(self.extractor.finditer(text))
+        self.assertEqual([item["value"] for item in items], [10.0, 20.0])
+        self.assertEqual(text[items[1]["start"]:items[1]["end"]], "渗透率20%")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - PDF下载测试
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import hashlib
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import requests
+
+from pdf_downloader import PDFDownloader, PDFDownloadError
+
+PDF = b"%PDF-1.4\n" + bytes(range(256)) * 1024
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """支持Range请求的本地PDF服务，可在首次请求时中途断开"""
+
+    ranges = []
+    cut_after = None
+
+    def do_GET(self):
+        body = PDF if self.path.endswith(".pdf") else b"<html>404</html>"
+        range_header = self.headers.get("Range")
+        RangeHandler.ranges.append(range_header)
+
+        start = int(range_header[len("bytes="):-1]) if range_header else 0
+        self.send_response(206 if range_header else 200)
+        if range_header:
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        self.send_header("Content-Length", str(len(body) - start))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+
+        if RangeHandler.cut_after is not None:
+            self.wfile.write(body[start:start + RangeHandler.cut_after])
+            RangeHandler.cut_after = None
+            self.close_connection = True
+            return
+        self.wfile.write(body[start:])
+
+    def log_message(self, format, *args):
+        pass
+
+class TestPDFDownloader(unittest.TestCase):
+    """测试流式下载、断点续传和内容寻址存储"""
+
+    def setUp(self):
+        """设置测试环境"""
+        RangeHandler.ranges = []
+        RangeHandler.cut_after = None
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+
+        self.store_dir = tempfile.mkdtemp()
+        self.session = requests.Session()
+        self.downloader = PDFDownloader(self.session, self.store_dir, max_concurrent=2, chunk_size=4096)
+
+    def tearDown(self):
+        """清理测试环境"""
+        self.server.shutdown()
+        self.server.server_close()
+        self.session.close()
+        shutil.rmtree(self.store_dir, ignore_errors=True)
+
+    def test_interrupted_download_resumes_with_range(self):
+        """测试中断的下载用Range请求从断点继续，并通过校验"""
+        RangeHandler.cut_after = 100000
+        with self.assertRaises(Exception):
+            self.downloader.download(f"{self.base_url}/a.pdf")
+
+        result = self.downloader.download(f"{self.base_url}/a.pdf", expected_sha256=hashlib.sha256(PDF).hexdigest())
+
+        self.assertEqual(len(RangeHandler.ranges), 2)
+        self.assertIsNone(RangeHandler.ranges[0])
+        self.assertTrue(RangeHandler.ranges[1].startswith("bytes="))
+        self.assertNotEqual(RangeHandler.ranges[1], "bytes=0-")
+        self.assertEqual(result["size"], len(PDF))
+        with open(result["path"], "rb") as f:
+            self.assertEqual(f.read(), PDF)
+
+    def test_same_content_stored_once(self):
+        """测试相同内容的PDF只保存一份，已下载的URL不再请求"""
+        results = self.downloader.download_all([f"{self.base_url}/a.pdf", f"{self.base_url}/copy/a.pdf"])
+        again = self.downloader.download(f"{self.base_url}/a.pdf")
+
+        self.assertEqual(len({r["path"] for r in results.values()}), 1)
+        self.assertTrue(again["reused"])
+        self.assertEqual(len(RangeHandler.ranges), 2)
+        objects = [name for _, _, files in os.walk(os.path.join(self.store_dir, "objects")) for name in files]
+        self.assertEqual(len(objects), 1)
+
+    def test_rejects_non_pdf_and_checksum_mismatch(self):
+        """测试非PDF内容和校验和不一致时报错"""
+        with self.assertRaises(PDFDownloadError):
+            self.downloader.download(f"{self.base_url}/error.html")
+        with self.assertRaises(PDFDownloadError):
+            self.downloader.download(f"{self.base_url}/b.pdf", expected_sha256="0" * 64)
+
+if __name__ == '__main__':
+    unittest.main()
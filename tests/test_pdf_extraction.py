@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - PDF提取测试
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pdf_extraction import PDFExtractionStage
+
+def fake_extractor(path):
+    """读取文本文件代替PDF解析（在子进程中运行）"""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    return {"pages": 1, "text": text, "tables": [], "pid": os.getpid()}
+
+def failing_extractor(path):
+    """缓存命中时不应被调用"""
+    raise RuntimeError("不应重新提取")
+
+class TestPDFExtractionStage(unittest.TestCase):
+    """测试进程池提取阶段"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, "cache")
+        self.documents = {}
+        for i in range(5):
+            path = os.path.join(self.temp_dir, f"{i}.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(f"研报{i}：行业渗透率为{10 + i}%")
+            self.documents[f"{i:064x}"] = path
+
+    def tearDown(self):
+        """清理测试环境"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_extracts_in_worker_processes_through_bounded_queue(self):
+        """测试文档经有界队列在子进程中提取"""
+        with PDFExtractionStage(max_workers=2, queue_size=1, cache_dir=self.cache_dir, extractor=fake_extractor) as stage:
+            futures = {sha: stage.submit(sha, path) for sha, path in self.documents.items()}
+            results = {sha: future.result(timeout=30) for sha, future in futures.items()}
+
+        self.assertEqual(results[f"{3:064x}"]["text"], "研报3：行业渗透率为13%")
+        self.assertNotIn(os.getpid(), {result["pid"] for result in results.values()})
+
+    def test_rerun_uses_cache(self):
+        """测试内容未变化的文档再次运行时直接读取缓存"""
+        sha, path = next(iter(self.documents.items()))
+        with PDFExtractionStage(max_workers=1, cache_dir=self.cache_dir, extractor=fake_extractor) as stage:
+            first = stage.extract(sha, path)
+
+        with PDFExtractionStage(max_workers=1, cache_dir=self.cache_dir, extractor=failing_extractor) as stage:
+            second = stage.extract(sha, path)
+
+        self.assertEqual(first, second)
+
+if __name__ == '__main__':
+    unittest.main()
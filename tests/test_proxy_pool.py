@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - 代理池测试
+使用本地HTTP服务充当代理，不访问外部网络
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from http_cache import HTTPCache
+from proxy_pool import ProxyPool, ProxyUnavailableError
+from session_factory import CrawlerSession
+from helpers import FakeClock
+
+class StandInProxyHandler(BaseHTTPRequestHandler):
+    """本地替身代理：直接应答转发过来的请求，或模拟目标站点限流"""
+
+    status = 200
+
+    def do_GET(self):
+        body = f"via {self.server.server_port} for {self.path}".encode("utf-8")
+        self.send_response(self.status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class ThrottledProxyHandler(StandInProxyHandler):
+    """总是返回429的代理出口"""
+
+    status = 429
+
+def start_proxy(handler):
+    """启动本地替身代理"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+class TestProxyPool(unittest.TestCase):
+    """测试代理池打分与隔离"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.clock = FakeClock()
+
+    def test_prefers_faster_proxy(self):
+        """测试优先选择延迟更低的代理"""
+        pool = ProxyPool(["http://fast", "http://slow"], clock=self.clock)
+        pool.report_success("http://fast", 0.1)
+        pool.report_success("http://slow", 2.0)
+        picks = {pool.acquire() for _ in range(20)}
+        self.assertEqual(picks, {"http://fast"})
+
+    def test_quarantine_after_failures(self):
+        """测试连续失败后隔离，到期后恢复"""
+        pool = ProxyPool(["http://a"], failure_threshold=2, quarantine_seconds=60, clock=self.clock)
+        pool.report_failure("http://a")
+        pool.report_failure("http://a")
+        with self.assertRaises(ProxyUnavailableError):
+            pool.acquire()
+        self.clock.now += 60
+        self.assertEqual(pool.acquire(), "http://a")
+
+    def test_repeated_bans_extend_quarantine(self):
+        """测试多次封禁时隔离时间加倍"""
+        pool = ProxyPool(["http://a"], quarantine_seconds=10, clock=self.clock)
+        pool.report_ban("http://a")
+        self.clock.now += 10
+        pool.report_ban("http://a")
+        self.assertEqual(pool.stats["http://a"].quarantined_until, 30)
+
+class TestCrawlerSessionWithProxy(unittest.TestCase):
+    """测试会话经由本地替身代理发出请求"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.good_server, self.good_proxy = start_proxy(StandInProxyHandler)
+        self.bad_server, self.bad_proxy = start_proxy(ThrottledProxyHandler)
+        self.cache_dir = tempfile.mkdtemp()
+        self.pool = ProxyPool([self.good_proxy, self.bad_proxy])
+        self.session = CrawlerSession(HTTPCache(self.cache_dir, {}, default_ttl=0), self.pool)
+        self.session.trust_env = False
+
+    def tearDown(self):
+        """清理测试环境"""
+        for server in (self.good_server, self.bad_server):
+            server.shutdown()
+            server.server_close()
+        self.session.close()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_routes_around_throttled_exit(self):
+        """测试被限流的出口被隔离，后续请求全部走健康代理"""
+        statuses = [self.session.get(f"http://report.example/list?page={i}").status_code for i in range(10)]
+
+        self.assertLessEqual(statuses.count(429), 1)
+        self.assertEqual(statuses[-1], 200)
+        bad_stats = self.pool.stats[self.bad_proxy]
+        self.assertLessEqual(bad_stats.bans, 1)
+        good_stats = self.pool.stats[self.good_proxy]
+        self.assertGreaterEqual(good_stats.requests, 9)
+        self.assertIsNotNone(good_stats.latency)
+
+if __name__ == '__main__':
+    unittest.main()
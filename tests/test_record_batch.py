@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - 列式记录批次测试
+"""
+
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+import pandas as pd
+
+from record_batch import RecordBatch, as_dataframe
+from industry_report_crawler import IndustryReportCrawler
+
+RECORDS = [
+    {'行业名称': '人工智能', '企业名称': '科大讯飞', '平均毛利率(%)': 35.5, '数据来源': '模拟数据', '更新时间': '2024-01-01 00:00:00'},
+    {'行业名称': '人工智能', '企业名称': '寒武纪', '平均毛利率(%)': 60.0, '数据来源': '模拟数据', '更新时间': '2024-01-01 00:00:00'},
+    {'行业名称': '物联网', '企业名称': '移远通信', '研报链接': 'http://a.com/1.pdf', '更新时间': '2024-01-01 00:00:00'},
+]
+
+class TestRecordBatch(unittest.TestCase):
+    """测试列式记录批次"""
+
+    def test_round_trip_matches_records(self):
+        """测试迭代、下标和切片得到与原记录相同的字典"""
+        batch = RecordBatch(RECORDS)
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(batch.to_records(), RECORDS)
+        self.assertEqual(batch[-1], RECORDS[-1])
+        self.assertEqual(batch[:2], RECORDS[:2])
+        self.assertFalse(RecordBatch())
+
+    def test_columns_are_typed_and_shared(self):
+        """测试分类列按字典编码，数值列直接引用数组内存"""
+        batch = RecordBatch(RECORDS)
+        self.assertEqual(batch.columns['更新时间'].categories, ['2024-01-01 00:00:00'])
+
+        df = batch.to_dataframe()
+        self.assertEqual(df['行业名称'].dtype.name, 'category')
+        self.assertEqual(df['平均毛利率(%)'].dtype, np.float64)
+        self.assertTrue(np.isnan(df['平均毛利率(%)'].iloc[2]))
+        self.assertIsNone(df['研报链接'].iloc[0])
+        self.assertTrue(np.shares_memory(df['平均毛利率(%)'].to_numpy(), batch.columns['平均毛利率(%)'].to_pandas()))
+        self.assertIs(as_dataframe(batch), df)
+        with self.assertRaises(ValueError):
+            batch.append(RECORDS[0])
+
+    def test_mixed_values_fall_back_to_objects(self):
+        """测试数值列出现字符串时整列改为对象列"""
+        batch = RecordBatch([{'市值': 800}, {'市值': '私有'}])
+        self.assertEqual([item['市值'] for item in batch], [800, '私有'])
+        self.assertEqual(as_dataframe(batch)['市值'].tolist(), [800, '私有'])
+
+    def test_from_dataframe_matches_records(self):
+        """测试按列构建的批次与逐条追加的结果一致"""
+        frame = pd.DataFrame(RECORDS)
+        frame['行业名称'] = frame['行业名称'].astype('category')
+        batch = RecordBatch.from_dataframe(frame)
+        self.assertEqual(batch.to_records(), RECORDS)
+        self.assertEqual(batch.columns['企业名称'].categories, ['科大讯飞', '寒武纪', '移远通信'])
+        pd.testing.assert_frame_equal(batch.to_dataframe(), RecordBatch(RECORDS).to_dataframe())
+
+        batch = RecordBatch.from_dataframe(frame)
+        batch.append(RECORDS[0])
+        self.assertEqual(batch[3], RECORDS[0])
+
+    def test_consumers_accept_batch_and_list(self):
+        """测试报告摘要对记录列表和 RecordBatch 的结果一致"""
+        crawler = IndustryReportCrawler()
+        crawler.emerging_industries = ["人工智能", "物联网"]
+        data = crawler.crawl_all_industries()
+        self.assertIsInstance(data, RecordBatch)
+        self.assertEqual(crawler.generate_report_summary(data), crawler.generate_report_summary(data.to_records()))
+        pd.testing.assert_frame_equal(
+            as_dataframe(data).astype({'行业名称': object, '企业名称': object, '数据来源': object, '更新时间': object}),
+            pd.DataFrame(data.to_records())
+        )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - 刷新调度测试
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from refresh_scheduler import RefreshScheduler
+from helpers import FakeClock
+
+class FakeCrawler:
+    """人工智能的数据每次都变化，半导体的数据保持不变"""
+
+    emerging_industries = ["人工智能", "半导体"]
+    sample_data = []
+
+    def __init__(self):
+        self.calls = []
+
+    def crawl_units(self):
+        return [("东方财富网", None)]
+
+    def _crawl_unit(self, source_name, fetch_func, industry_name):
+        self.calls.append(industry_name)
+        value = len(self.calls) if industry_name == "人工智能" else 1
+        return [{"行业名称": industry_name, "市场规模(亿元)": value, "更新时间": str(len(self.calls))}], True
+
+class FailingCrawler(FakeCrawler):
+    """人工智能的抓取总是失败"""
+
+    def _crawl_unit(self, source_name, fetch_func, industry_name):
+        if industry_name == "人工智能":
+            self.calls.append(industry_name)
+            return [], False
+        return super()._crawl_unit(source_name, fetch_func, industry_name)
+
+class TestRefreshScheduler(unittest.TestCase):
+    """测试按变化程度调整刷新间隔"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.clock = FakeClock()
+        self.crawler = FakeCrawler()
+
+    def tearDown(self):
+        """清理测试环境"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_scheduler(self, budget_per_hour=100, **kwargs):
+        kwargs.setdefault("max_interval", 3600)
+        return RefreshScheduler(
+            self.crawler, state_path=os.path.join(self.temp_dir, "state.json"),
+            budget_per_hour=budget_per_hour, min_interval=60, clock=self.clock, **kwargs
+        )
+
+    def test_volatile_pairs_refreshed_more_often(self):
+        """测试变化频繁的单元间隔缩短，稳定的单元间隔拉长"""
+        scheduler = self.make_scheduler()
+        for _ in range(60):
+            scheduler.run_once()
+            self.clock.now += 60
+
+        state = scheduler.state
+        self.assertLess(state["人工智能/东方财富网"]["interval"], state["半导体/东方财富网"]["interval"])
+        self.assertGreater(self.crawler.calls.count("人工智能"), 2 * self.crawler.calls.count("半导体"))
+
+    def test_budget_limits_refreshes(self):
+        """测试每轮刷新数量受全局预算限制，状态跨进程保留"""
+        scheduler = self.make_scheduler(budget_per_hour=1)
+        self.assertEqual(len(scheduler.run_once()), 1)
+        self.assertEqual(scheduler.run_once(), [])
+
+        reloaded = self.make_scheduler()
+        self.assertEqual([industry for _, industry, _ in reloaded.due()], ["半导体"])
+
+    def test_failed_pair_backs_off(self):
+        """测试失败的单元按指数退避重试，退避期内不在 due 中"""
+        self.crawler = FailingCrawler()
+        scheduler = self.make_scheduler(retry_delay=60)
+        self.assertEqual([industry for industry, _, _ in scheduler.run_once()], ["半导体"])
+        self.assertEqual(scheduler.due(), [])
+        self.assertEqual(scheduler.next_wakeup(), 60)
+
+        self.clock.now += 60
+        self.assertEqual([industry for _, industry, _ in scheduler.due()], ["人工智能"])
+        scheduler.run_once()
+        self.assertEqual(scheduler.state["人工智能/东方财富网"]["retry_at"], self.clock.now + 120)
+        self.assertEqual(scheduler.snapshot()[0]["行业名称"], "半导体")
+
+    def test_failing_pair_does_not_starve_budget(self):
+        """测试持续失败的单元不会占满预算，退避信息跨进程保留"""
+        self.crawler = FailingCrawler()
+        scheduler = self.make_scheduler(budget_per_hour=1, retry_delay=7200, max_interval=86400)
+        scheduler.run_once()
+        self.clock.now += 3600
+        scheduler.run_once()
+        self.assertEqual(self.crawler.calls, ["人工智能", "半导体"])
+
+        reloaded = self.make_scheduler()
+        self.assertNotIn("人工智能", [industry for _, industry, _ in reloaded.due()])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - 重试与熔断测试
+"""
+
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from resilience import SourceGuard, CircuitBreaker, CircuitOpenError
+from helpers import FakeClock
+
+class TestSourceGuard(unittest.TestCase):
+    """测试按数据源的重试与熔断"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.clock = FakeClock()
+        settings = {
+            "max_retries": 2,
+            "retry_delay": 1,
+            "retry_max_delay": 10,
+            "circuit_breaker_threshold": 3,
+            "circuit_breaker_cooldown": 60
+        }
+        self.guard = SourceGuard(settings, sleep=self.clock.sleep, clock=self.clock)
+
+    def test_retry_until_success(self):
+        """测试失败后退避重试直至成功"""
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise IOError("timeout")
+            return ["ok"]
+
+        self.assertEqual(self.guard.call("雪球", flaky), ["ok"])
+        self.assertEqual(len(calls), 3)
+        # 指数退避：第1次在 [0.5, 1]，第2次在 [1, 2]
+        self.assertTrue(0.5 <= self.clock.sleeps[0] <= 1)
+        self.assertTrue(1 <= self.clock.sleeps[1] <= 2)
+
+    def test_gives_up_after_max_retries(self):
+        """测试超过最大重试次数后抛出原始异常"""
+        def broken():
+            raise IOError("down")
+
+        with self.assertRaises(IOError):
+            self.guard.call("和讯网", broken)
+        self.assertEqual(len(self.clock.sleeps), 2)
+
+    def test_circuit_opens_and_recovers(self):
+        """测试熔断打开后快速失败，冷却后恢复"""
+        def broken():
+            raise IOError("down")
+
+        with self.assertRaises(IOError):
+            self.guard.call("和讯网", broken)
+        self.assertEqual(self.guard.breaker("和讯网").state, CircuitBreaker.OPEN)
+
+        with self.assertRaises(CircuitOpenError):
+            self.guard.call("和讯网", lambda: ["ok"])
+
+        # 其他数据源不受影响
+        self.assertEqual(self.guard.call("雪球", lambda: ["ok"]), ["ok"])
+
+        self.clock.now += 60
+        self.assertEqual(self.guard.call("和讯网", lambda: ["ok"]), ["ok"])
+        self.assertEqual(self.guard.breaker("和讯网").state, CircuitBreaker.CLOSED)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - robots.txt 缓存测试
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from robots import RobotsCache
+from crawl_journal import CrawlJournal
+from industry_report_crawler import IndustryReportCrawler
+from helpers import FakeClock
+
+class FakeResponse:
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+
+class FakeSession:
+    """按顺序返回预设响应；响应为异常时抛出"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url):
+        self.requests.append(url)
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+class RobotsTestCase(unittest.TestCase):
+    """使用临时缓存目录和手动时钟的 RobotsCache"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.clock = FakeClock(1000.0)
+
+    def tearDown(self):
+        """清理测试环境"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_cache(self, *responses):
+        self.session = FakeSession(*responses)
+        return RobotsCache(session=self.session, cache_dir=self.temp_dir, ttl=3600, error_ttl=60, clock=self.clock)
+
+class TestRobotsCache(RobotsTestCase):
+    """测试规则缓存、状态码处理和 Crawl-delay"""
+
+    def test_disk_cache_expires_after_ttl(self):
+        """测试磁盘缓存在 ttl 内供新实例复用，过期后重新抓取"""
+        self.make_cache(FakeResponse(200, "User-agent: *\nDisallow: /private\n")).can_fetch("http://a.example.com/")
+        self.assertEqual(len(self.session.requests), 1)
+
+        robots = self.make_cache(FakeResponse(200, "User-agent: *\nAllow: /\n"))
+        self.assertFalse(robots.can_fetch("http://a.example.com/private/1"))
+        self.assertEqual(self.session.requests, [])
+
+        self.clock.now += 3600
+        robots = self.make_cache(FakeResponse(200, "User-agent: *\nAllow: /\n"))
+        self.assertTrue(robots.can_fetch("http://a.example.com/private/1"))
+        self.assertEqual(self.session.requests, ["http://a.example.com/robots.txt"])
+
+    def test_status_codes(self):
+        """测试 401/403 全部禁止，其他 4xx 全部允许"""
+        for status, allowed in ((401, False), (403, False), (404, True), (410, True)):
+            robots = self.make_cache(FakeResponse(status))
+            url = f"http://host{status}.example.com/list"
+            self.assertEqual(robots.can_fetch(url), allowed, status)
+            self.assertFalse(robots.unavailable(url))
+        # 明确的状态码会写入磁盘缓存
+        self.assertEqual(len(os.listdir(self.temp_dir)), 4)
+
+    def test_crawl_delay_feeds_scheduler(self):
+        """测试解析 Crawl-delay 并作为调度器的最小间隔"""
+        from scheduler import PolitenessScheduler
+
+        robots = self.make_cache(FakeResponse(200, "User-agent: *\nCrawl-delay: 7\nAllow: /\n"))
+        self.assertEqual(robots.crawl_delay("http://a.example.com"), 7.0)
+        self.assertIsNone(self.make_cache(FakeResponse(404)).crawl_delay("http://b.example.com"))
+
+        sources = {"A站": {"base_url": "http://a.example.com", "delay_range": (1, 1)}}
+        scheduler = PolitenessScheduler(sources, robots=robots, clock=self.clock, sleep=self.clock.sleep)
+        scheduler.wait("A站")
+        self.assertAlmostEqual(scheduler.wait("A站"), 7)
+
+class TestRobotsUnavailable(RobotsTestCase):
+    """测试 robots.txt 暂时无法获取与明确禁止的区分"""
+
+    def test_server_error_is_temporary(self):
+        """测试 5xx 和网络错误暂时禁止，error_ttl 后重新抓取"""
+        for failure in (FakeResponse(503), ConnectionError("连接失败")):
+            robots = self.make_cache(failure, FakeResponse(200, "User-agent: *\nAllow: /\n"))
+            self.assertFalse(robots.can_fetch("http://a.example.com/list"))
+            self.assertTrue(robots.unavailable("http://a.example.com/list"))
+            self.assertEqual(os.listdir(self.temp_dir), [])
+
+            self.clock.now += 61
+            self.assertTrue(robots.can_fetch("http://a.example.com/list"))
+            self.assertFalse(robots.unavailable("http://a.example.com/list"))
+            shutil.rmtree(self.temp_dir)
+            os.makedirs(self.temp_dir)
+
+    def test_disallow_rule_is_not_unavailable(self):
+        """测试明确的 Disallow 规则不是暂时状态"""
+        robots = self.make_cache(FakeResponse(200, "User-agent: *\nDisallow: /\n"))
+        self.assertFalse(robots.can_fetch("http://a.example.com/list"))
+        self.assertFalse(robots.unavailable("http://a.example.com/list"))
+
+    def test_unavailable_unit_is_retried_on_resume(self):
+        """测试 robots.txt 无法获取的单元不记入爬取日志，续爬时重新抓取"""
+        crawler = IndustryReportCrawler()
+        crawler.robots = self.make_cache(ConnectionError("连接失败"), FakeResponse(200, "User-agent: *\nAllow: /\n"))
+        crawler.journal = CrawlJournal(os.path.join(self.temp_dir, "journal.jsonl"))
+        crawler._fetch_eastmoney = lambda industry: [{"企业名称": "科大讯飞"}]
+        crawler._fetch_sina_finance = lambda industry: []
+        crawler._fetch_hexun = lambda industry: []
+
+        records, done = crawler._crawl_unit("东方财富网", crawler._fetch_eastmoney, "人工智能")
+        self.assertEqual((records, done), ([], False))
+        crawler.process_industry_data("人工智能")
+        self.assertFalse(crawler.journal.is_done("人工智能", "东方财富网"))
+
+        self.clock.now += 61
+        data = crawler.process_industry_data("人工智能")
+        self.assertEqual(data, [{"企业名称": "科大讯飞"}])
+        self.assertTrue(crawler.journal.is_done("人工智能", "东方财富网"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - 请求调度测试
+"""
+
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from scheduler import PolitenessScheduler
+from helpers import FakeClock
+
+class FakeRobots:
+    """固定返回 Crawl-delay 的 robots 规则"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.queries = []
+
+    def crawl_delay(self, url):
+        self.queries.append(url)
+        return self.delay
+
+class TestPolitenessScheduler(unittest.TestCase):
+    """测试按主机的礼貌性调度器"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.clock = FakeClock()
+        self.sources = {
+            "A站": {"base_url": "http://a.example.com", "delay_range": (2, 2)},
+            "B站": {"base_url": "http://b.example.com", "delay_range": (4, 4)},
+        }
+        self.scheduler = PolitenessScheduler(self.sources, clock=self.clock, sleep=self.clock.sleep)
+
+    def test_first_request_does_not_wait(self):
+        """测试首次访问主机无需等待"""
+        self.assertEqual(self.scheduler.wait("A站"), 0)
+        self.assertEqual(self.scheduler.wait("B站"), 0)
+        self.assertEqual(self.clock.now, 0)
+
+    def test_same_host_waits_delay_range(self):
+        """测试连续访问同一主机按 delay_range 等待"""
+        self.scheduler.wait("A站")
+        self.assertAlmostEqual(self.scheduler.wait("A站"), 2)
+        self.assertAlmostEqual(self.scheduler.wait("http://a.example.com/list"), 2)
+
+    def test_idle_time_counts_towards_other_hosts(self):
+        """测试访问其他主机的时间会抵扣等待"""
+        self.scheduler.wait("A站")
+        self.scheduler.wait("B站")
+        self.clock.now += 1.5
+        self.assertAlmostEqual(self.scheduler.wait("A站"), 0.5)
+
+    def test_concurrent_reservations_are_spaced(self):
+        """测试并发预约依次排队"""
+        delays = [self.scheduler.reserve("B站") for _ in range(3)]
+        self.assertEqual([round(d, 6) for d in delays], [0, 4, 8])
+
+    def test_crawl_delay_sets_min_interval(self):
+        """测试 robots.txt 的 Crawl-delay 作为最小间隔，且只查询一次"""
+        robots = FakeRobots(10)
+        scheduler = PolitenessScheduler(self.sources, robots=robots, clock=self.clock, sleep=self.clock.sleep)
+        scheduler.wait("A站")
+        self.assertAlmostEqual(scheduler.wait("A站"), 10)
+        self.assertEqual(robots.queries, ["http://a.example.com"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - 会话工厂测试
+"""
+
+import unittest
+from unittest import mock
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import session_factory
+from session_factory import SourceAdapter, create_session, get_shared_session, close_shared_session
+
+SOURCES = {
+    "东方财富网": {"base_url": "http://data.eastmoney.com", "timeout": 10},
+    "新浪财经": {"base_url": "https://finance.sina.com.cn"},
+}
+SETTINGS = {"max_concurrent_requests": 4, "request_timeout": 20}
+
+def ok_response(request, **kwargs):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b""
+    response.request = request
+    return response
+
+class TestSessionFactory(unittest.TestCase):
+    """测试按数据源挂载的连接池和共享会话"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.session = create_session(SOURCES, SETTINGS)
+
+    def tearDown(self):
+        """清理测试环境"""
+        self.session.close()
+
+    def test_adapter_per_base_url(self):
+        """测试每个数据源的 base_url 挂载独立适配器，超时和连接池大小取自配置"""
+        eastmoney = self.session.get_adapter("http://data.eastmoney.com/report/1.html")
+        sina = self.session.get_adapter("https://finance.sina.com.cn/stock/")
+        other = self.session.get_adapter("http://www.example.com/")
+
+        self.assertIsInstance(eastmoney, SourceAdapter)
+        self.assertEqual(len({id(eastmoney), id(sina), id(other)}), 3)
+        self.assertEqual((eastmoney.timeout, sina.timeout, other.timeout), (10, 20, 20))
+        self.assertEqual({adapter._pool_maxsize for adapter in (eastmoney, sina, other)}, {4})
+        self.assertIs(self.session.get_adapter("https://www.example.com/"), other)
+
+    def test_adapter_applies_default_timeout(self):
+        """测试未显式指定超时的请求使用数据源的超时"""
+        with mock.patch.object(HTTPAdapter, "send", side_effect=ok_response) as send:
+            self.session.send(requests.Request("GET", "http://data.eastmoney.com/a").prepare())
+            self.session.send(requests.Request("GET", "http://data.eastmoney.com/a").prepare(), timeout=3)
+        self.assertEqual([call.kwargs["timeout"] for call in send.call_args_list], [10, 3])
+
+    def test_shared_session_reused_until_closed(self):
+        """测试共享会话在进程内复用，关闭后重新创建"""
+        with mock.patch.object(session_factory, "create_session", side_effect=lambda: create_session(SOURCES, SETTINGS)):
+            close_shared_session()
+            shared = get_shared_session()
+            self.assertIs(get_shared_session(), shared)
+            close_shared_session()
+            self.assertIsNot(get_shared_session(), shared)
+            close_shared_session()
+
+if __name__ == '__main__':
+    unittest.main()
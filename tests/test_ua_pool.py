@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - User-Agent 池测试
+"""
+
+import unittest
+from unittest import mock
+import sys
+import os
+import socket
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ua_pool import BUNDLED_USER_AGENTS, UserAgentPool, get_user_agent_pool, random_user_agent
+from session_factory import create_session
+
+class TestUserAgentPool(unittest.TestCase):
+    """测试内置UA池和请求时的UA轮换"""
+
+    def test_works_offline(self):
+        """测试不访问网络、不依赖 fake_useragent"""
+        with mock.patch.object(socket, "socket", side_effect=OSError("网络不可用")), \
+                mock.patch.dict(sys.modules, {"fake_useragent": None}):
+            self.assertIn(random_user_agent(), BUNDLED_USER_AGENTS)
+            self.assertIn(UserAgentPool().random, BUNDLED_USER_AGENTS)
+        self.assertIs(get_user_agent_pool(), get_user_agent_pool())
+
+    def test_custom_user_agents(self):
+        """测试使用自定义UA列表"""
+        self.assertEqual(UserAgentPool(["ua-1"]).random, "ua-1")
+
+    def test_session_rotates_user_agent(self):
+        """测试启用 user_agent_rotation 时每个请求重新选择UA"""
+        def send(request, **kwargs):
+            sent.append(request.headers["User-Agent"])
+            response = requests.Response()
+            response.status_code = 200
+            response._content = b""
+            response.request = request
+            return response
+
+        for rotate, expected in ((True, ["ua-1", "ua-2", "ua-3"]), (False, ["ua-0"] * 3)):
+            sent = []
+            agents = iter(["ua-0", "ua-1", "ua-2", "ua-3"])
+            with mock.patch("session_factory.random_user_agent", side_effect=lambda: next(agents)), \
+                    mock.patch.object(HTTPAdapter, "send", side_effect=send):
+                session = create_session({}, {"user_agent_rotation": rotate})
+                for _ in range(3):
+                    session.send(session.prepare_request(requests.Request("GET", "http://data.eastmoney.com/")))
+                session.close()
+            self.assertEqual(sent, expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行业研报数据爬虫系统 - URL队列测试
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from url_frontier import URLFrontier, normalize_url
+from industry_report_crawler_enhanced import IndustryReportCrawlerEnhanced
+
+class TestURLFrontier(unittest.TestCase):
+    """测试URL队列"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.seen_path = os.path.join(self.temp_dir, "seen.bloom")
+
+    def tearDown(self):
+        """清理测试环境"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_normalize_collapses_tracking_variants(self):
+        """测试带跟踪参数的转载链接规范化为同一URL"""
+        variants = [
+            "http://data.eastmoney.com/report/zw?infocode=AP2024&id=1",
+            "HTTP://Data.EastMoney.com:80/report/zw?id=1&infocode=AP2024&utm_source=weibo",
+            "http://data.eastmoney.com/report/zw?spm=a.b.c&id=1&infocode=AP2024#top",
+        ]
+        self.assertEqual(len({normalize_url(url) for url in variants}), 1)
+        self.assertNotEqual(normalize_url(variants[0]), normalize_url("http://data.eastmoney.com/report/zw?id=2"))
+
+    def test_round_robin_hosts_by_priority(self):
+        """测试按主机轮转出队，同一主机内按优先级出队"""
+        frontier = URLFrontier(self.seen_path, capacity=1000)
+        frontier.add("http://a.com/low", priority=5)
+        frontier.add("http://a.com/high", priority=1)
+        frontier.add("http://b.com/1")
+        self.assertFalse(frontier.add("http://a.com/high?from=timeline"))
+
+        order = [frontier.pop(), frontier.pop(), frontier.pop()]
+        self.assertEqual(order, ["http://a.com/high", "http://b.com/1", "http://a.com/low"])
+        self.assertIsNone(frontier.pop())
+
+    def test_seen_set_persists_across_runs(self):
+        """测试已抓取的URL在下次运行中不再入队"""
+        frontier = URLFrontier(self.seen_path, capacity=1000)
+        frontier.add("https://finance.sina.com.cn/report/1.html")
+        frontier.mark_fetched(frontier.pop())
+        frontier.save()
+
+        reloaded = URLFrontier(self.seen_path)
+        self.assertFalse(reloaded.add("https://finance.sina.com.cn/report/1.html?utm_medium=share"))
+        self.assertTrue(reloaded.add("https://finance.sina.com.cn/report/2.html"))
+
+    def test_syndicated_report_fetched_once(self):
+        """测试多个数据源转载的同一研报只抓取一次"""
+        crawler = IndustryReportCrawlerEnhanced()
+        crawler.robots = None
+        crawler._frontier = URLFrontier(self.seen_path, capacity=1000)
+        crawler._fetch_eastmoney = lambda industry: [{"企业名称": "科大讯飞", "数据来源": "东方财富网", "研报链接": "http://r.com/1?spm=x"}]
+        crawler._fetch_sina_finance = lambda industry: [{"企业名称": "科大讯飞", "数据来源": "新浪财经", "研报链接": "http://r.com/1"}]
+        crawler._fetch_xueqiu = lambda industry: []
+        crawler._fetch_cninfo = lambda industry: []
+        fetched = []
+        crawler._download_report = lambda url: fetched.append(url) or "人工智能行业深度报告" * 10
+        crawler._extract_report = lambda text: {"研报标题": "AI行业深度"}
+
+        data = crawler.process_industry_data("人工智能")
+
+        self.assertEqual(fetched, ["http://r.com/1"])
+        self.assertEqual([item["研报标题"] for item in data], ["AI行业深度"])
+        self.assertEqual(data[0]["数据来源"], "东方财富网、新浪财经")
+
+    def test_details_reapplied_on_next_run(self):
+        """测试下次运行跳过已抓取研报的下载，但仍补回其指标"""
+        def run(fetched):
+            crawler = IndustryReportCrawlerEnhanced()
+            crawler.robots = None
+            crawler._frontier = URLFrontier(self.seen_path, capacity=1000)
+            crawler._fetch_eastmoney = lambda industry: [
+                {"企业名称": "科大讯飞", "数据来源": "东方财富网", "研报链接": "http://r.com/1"},
+                {"企业名称": "科大讯飞", "数据来源": "东方财富网", "研报链接": "http://r.com/2?spm=x"},
+            ]
+            crawler._fetch_sina_finance = lambda industry: []
+            crawler._fetch_xueqiu = lambda industry: []
+            crawler._fetch_cninfo = lambda industry: []
+            crawler._download_report = lambda url: fetched.append(url) or "人工智能行业深度报告" * 10
+            crawler._extract_report = lambda text: {"研报标题": "AI行业深度"}
+            return crawler.process_industry_data("人工智能")
+
+        fetched = []
+        first = run(fetched)
+        self.assertEqual(fetched, ["http://r.com/1", "http://r.com/2"])
+
+        fetched = []
+        second = run(fetched)
+        self.assertEqual(fetched, [])
+        self.assertEqual(second, first)
+        self.assertEqual([item["研报标题"] for item in second], ["AI行业深度"])
+
+    def test_detail_store_ignores_partial_line(self):
+        """测试研报详情按规范化URL保存，转载取原文的结果，忽略写了一半的末行"""
+        frontier = URLFrontier(self.seen_path, capacity=1000)
+        frontier.details.put("http://r.com/1?spm=x", {"研报标题": "AI"}, {"科大讯飞": {"平均毛利率(%)": 45.0}})
+        frontier.details.put("http://r.com/2", canonical="http://r.com/1")
+        with open(frontier.details.path, "a", encoding="utf-8") as f:
+            f.write('{"url": "http://r.com/3", "det')
+
+        details = URLFrontier(self.seen_path).details
+        self.assertEqual(len(details), 2)
+        self.assertEqual(details.get("http://r.com/2")["detail"], {"研报标题": "AI"})
+        self.assertEqual(details.get("http://r.com/1")["companies"]["科大讯飞"]["平均毛利率(%)"], 45.0)
+        self.assertIsNone(details.get("http://r.com/3"))
+
+if __name__ == '__main__':
+    unittest.main()